@@ -0,0 +1,96 @@
+"""Benchmark of the time it takes to import pychasing (and to first use its main names) in a
+fresh interpreter.
+
+Besides the timings, it checks that ``import pychasing`` on its own does not import any of the
+heavy dependencies (``requests``, ``aiohttp``, ``rlim``, ...), and exits with status 1 if it
+does (or if ``--max-ms`` is exceeded), so it can guard against regressions in CI:
+
+```
+python benchmarks/import_time.py
+python benchmarks/import_time.py --max-ms 25
+```
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import subprocess
+import argparse
+import json
+import sys
+import os
+
+from typing import (
+    List
+)
+
+
+_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# the statements timed (each after `import pychasing`, which is timed on its own first)
+_STATEMENTS = (
+    "pass",
+    "pychasing.Map",
+    "pychasing.PatreonTier.gold.value",
+    "pychasing.Replay",
+    "pychasing.Client",
+    "pychasing.AsyncClient"
+)
+
+# modules that `import pychasing` on its own must not import
+_DEFERRED = ("requests", "aiohttp", "rlim", "httpprep", "sqlite3", "pychasing.enums",
+             "pychasing.client")
+
+_PROBE = """
+import time, sys, json
+start = time.perf_counter()
+import pychasing
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {deferred!r} if name in sys.modules]]))
+"""
+
+
+def _run(statement: str) -> tuple:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (
+        _SRC, os.environ.get("PYTHONPATH")))))
+    output = subprocess.check_output(
+        [sys.executable, "-c", _PROBE.format(statement=statement, deferred=_DEFERRED)],
+        env=env, text=True)
+    elapsed, imported = json.loads(output)
+    return elapsed, imported
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=7,
+                        help="the number of interpreters started per statement (the fastest "
+                             "run is reported)")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if `import pychasing` takes longer than this")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for statement in _STATEMENTS:
+        runs = [_run(statement) for _ in range(args.repeat)]
+        elapsed = min(elapsed for elapsed, _ in runs) * 1000
+        label = "import pychasing" if statement == "pass" else f"+ {statement}"
+        print(f"{label:<40} {elapsed:8.1f} ms")
+        if statement == "pass":
+            imported = runs[0][1]
+            if imported:
+                print(f"`import pychasing` imported {', '.join(imported)}")
+                failed = True
+            if args.max_ms is not None and elapsed > args.max_ms:
+                print(f"`import pychasing` took longer than {args.max_ms} ms")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
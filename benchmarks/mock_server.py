@@ -0,0 +1,679 @@
+"""A local stand-in for the ballchasing.com API, used to benchmark (and otherwise exercise)
+``Client`` and ``AsyncClient`` without network access or a real API key.
+
+The server reproduces the endpoints used by ``Client`` (ping, replays, uploads, replay files,
+groups and maps) over a deterministic, generated data set, with configurable latency,
+per-token rate limiting (answered with ``429 Too Many Requests`` and ``Retry-After``, like
+ballchasing.com), continuation-based pagination and conditional requests (``GET`` responses
+carry ``ETag`` and ``Last-Modified`` validators, and are answered with ``304 Not Modified`` when
+the client already has them). Point a client at it through ``api_url``:
+
+```py
+with MockServer(latency=0.01, rate=8) as server:
+    client = pychasing.Client("any-token", api_url=server.url)
+```
+
+It can also be run on its own, e.g. ``python benchmarks/mock_server.py --port 8000 --rate 2``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import http.server
+import email.utils
+import urllib.parse
+import collections
+import threading
+import argparse
+import operator
+import functools
+import datetime
+import hashlib
+import random
+import math
+import json
+import time
+import uuid
+import re
+
+from typing import (
+    Callable,
+    Optional,
+    Tuple,
+    Dict,
+    List,
+    Any
+)
+
+
+# the maps returned by `/maps`
+_MAPS = {
+    "stadium_p": "DFH Stadium",
+    "eurostadium_p": "Mannfield",
+    "cs_p": "Champions Field",
+    "utopiastadium_p": "Utopia Coliseum",
+    "beach_p": "Salty Shores",
+    "park_p": "Beckwith Park",
+    "trainstation_p": "Urban Central",
+    "wasteland_s_p": "Wasteland"
+}
+
+_PLAYLISTS = ("ranked-duels", "ranked-doubles", "ranked-standard", "unranked-doubles",
+              "private")
+
+# the first generated replay's date (every following replay is a bit older)
+_EPOCH = datetime.datetime(2023, 6, 1, tzinfo=datetime.timezone.utc)
+
+_routes = (
+    ("ping", re.compile(r"/api/?")),
+    ("upload_replay", re.compile(r"/api/v2/upload")),
+    ("replays", re.compile(r"/api/replays/?")),
+    ("replay_file", re.compile(r"/api/replays/(?P<id>[^/]+)/file")),
+    ("replay", re.compile(r"/api/replays/(?P<id>[^/]+)")),
+    ("groups", re.compile(r"/api/groups/?")),
+    ("group", re.compile(r"/api/groups/(?P<id>[^/]+)")),
+    ("maps", re.compile(r"/api/maps/?"))
+)
+
+
+def _rfc3339(date: datetime.datetime) -> str:
+    return date.isoformat().replace("+00:00", "Z")
+
+
+# cached, as the date filters parse the dates of every replay on every request
+@functools.lru_cache(maxsize=None)
+def _parse_date(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _bounds(query: Dict[str, List[str]]) -> List[Tuple[str, Any, datetime.datetime]]:
+    """Get the `(field, comparison, date)` bounds set by the date filters of `query`.
+
+    """
+    return [(key, compare, _parse_date(query[name][0])) for name, key, compare in (
+        ("created-after", "created", operator.gt),
+        ("created-before", "created", operator.lt),
+        ("replay-date-after", "date", operator.gt),
+        ("replay-date-before", "date", operator.lt)) if name in query]
+
+
+def _player(rng: random.Random, index: int) -> Dict[str, Any]:
+    return {
+        "start_time": 0,
+        "end_time": 300 + rng.randrange(60),
+        "name": f"player{index}",
+        "id": {"platform": "steam", "id": str(76561198000000000 + index)},
+        "car_id": 23,
+        "car_name": "Octane",
+        "camera": {"fov": 110, "height": 100, "pitch": -3, "distance": 270, "stiffness": 0.5,
+                   "swivel_speed": 5, "transition_speed": 1},
+        "steering_sensitivity": 1.5,
+        "score": rng.randrange(1000),
+        "mvp": False,
+        "stats": {
+            "core": {"shots": rng.randrange(8), "goals": rng.randrange(4),
+                     "saves": rng.randrange(5), "assists": rng.randrange(3),
+                     "score": rng.randrange(1000)},
+            "boost": {"bpm": rng.randrange(300, 500), "avg_amount": rng.randrange(30, 60)},
+            "movement": {"avg_speed": rng.randrange(1200, 1700),
+                         "total_distance": rng.randrange(200000, 300000)}
+        }
+    }
+
+
+def _team(rng: random.Random, color: str, size: int, first: int) -> Dict[str, Any]:
+    players = [_player(rng, first + i) for i in range(size)]
+    return {
+        "color": color,
+        "name": color.upper(),
+        "goals": sum(player["stats"]["core"]["goals"] for player in players),
+        "stats": {"core": {"shots": sum(player["stats"]["core"]["shots"]
+                                        for player in players)}},
+        "players": players
+    }
+
+
+class _Data:
+    """The generated replays and groups served by a `MockServer`.
+
+    """
+    def __init__(self, replays: int, groups: int, seed: int) -> None:
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.uploads = {}
+        # the time of the last change to the data set, sent as the `Last-Modified` of every
+        # response (to whole seconds, like the header)
+        self.modified = math.floor(time.time())
+
+        # group i (past the first four) is a subgroup of group i // 4 - 1, making a tree in which
+        # every group has up to four subgroups
+        self.groups = collections.OrderedDict()
+        group_ids = []
+        for i in range(groups):
+            group_id = f"group-{i}-{rng.getrandbits(32):08x}"
+            parent = group_ids[i // 4 - 1] if i >= 4 else None
+            created = _EPOCH - datetime.timedelta(days=i)
+            self.groups[group_id] = {
+                "id": group_id,
+                "name": f"Group {i}",
+                "created": _rfc3339(created),
+                "player_identification": "by-id",
+                "team_identification": "by-distinct-players",
+                "shared": bool(i % 2),
+                "creator": {"steam_id": "76561198000000000", "name": "creator"},
+                "parent": parent,
+                "direct_replays": 0,
+                "indirect_replays": 0
+            }
+            group_ids.append(group_id)
+
+        self.replays = collections.OrderedDict()
+        for i in range(replays):
+            replay_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            size = rng.randint(1, 3)
+            created = _EPOCH - datetime.timedelta(minutes=7 * i)
+            groups = [group_ids[i % len(group_ids)]] if group_ids else []
+            for group_id in groups:
+                self.groups[group_id]["direct_replays"] += 1
+            self.replays[replay_id] = {
+                "id": replay_id,
+                "rocket_league_id": f"{rng.getrandbits(128):032X}",
+                "title": f"Replay {i}",
+                "created": _rfc3339(created),
+                "date": _rfc3339(created - datetime.timedelta(minutes=30)),
+                "date_has_timezone": True,
+                "status": "ok",
+                "visibility": "public",
+                "uploader": {"steam_id": str(76561198000000000 + i % 50),
+                             "name": f"uploader{i % 50}"},
+                "map_code": list(_MAPS)[i % len(_MAPS)],
+                "map_name": list(_MAPS.values())[i % len(_MAPS)],
+                "playlist_id": _PLAYLISTS[i % len(_PLAYLISTS)],
+                "playlist_name": _PLAYLISTS[i % len(_PLAYLISTS)].replace("-", " ").title(),
+                "match_type": "Online",
+                "team_size": size,
+                "duration": 300 + rng.randrange(120),
+                "overtime": False,
+                "season": 8,
+                "season_type": "free2play",
+                "min_rank": {"id": "champion-1", "tier": 16, "division": 1,
+                             "name": "Champion I"},
+                "max_rank": {"id": "champion-3", "tier": 18, "division": 2,
+                             "name": "Champion III"},
+                "groups": [{"id": group_id, "name": self.groups[group_id]["name"]}
+                           for group_id in groups],
+                "blue": _team(rng, "blue", size, 0),
+                "orange": _team(rng, "orange", size, size)
+            }
+
+        self._summaries = {}
+
+        # count each group's replays as replays of its ancestors too
+        for group in list(self.groups.values()):
+            parent = group["parent"]
+            while parent is not None:
+                self.groups[parent]["indirect_replays"] += group["direct_replays"]
+                parent = self.groups[parent]["parent"]
+
+
+    def summary(self, replay: Dict[str, Any]) -> Dict[str, Any]:
+        """Get `replay` as listed by `/replays`.
+
+        """
+        cached = self._summaries.get(replay["id"])
+        if cached is not None and cached[0] is replay:
+            return cached[1]
+        summary = {key: value for key, value in replay.items()
+                   if key not in ("match_type", "team_size", "date_has_timezone")}
+        summary["replay_title"] = summary.pop("title")
+        for color in ("blue", "orange"):
+            summary[color] = {"name": summary[color]["name"], "players": [
+                {key: player[key] for key in ("start_time", "end_time", "name", "id", "score",
+                                              "mvp")}
+                for player in summary[color]["players"]]}
+        self._summaries[replay["id"]] = (replay, summary)
+        return summary
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and body are written separately, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.mock._lock:
+            self.server.mock.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+
+        for route, pattern in _routes:
+            match = pattern.fullmatch(url.path)
+            if match:
+                break
+        else:
+            route = match = None
+
+        if mock.latency or mock.jitter:
+            time.sleep(mock.latency + mock.jitter * mock.rng.random())
+
+        if route is None:
+            status, headers, content = 404, {}, {"error": "not found"}
+        elif not self.headers.get("Authorization") and route != "replay_file":
+            status, headers, content = 401, {}, {"error": "missing API key"}
+        else:
+            retry_after = mock.reserve(self.headers.get("Authorization"), route)
+            if retry_after is not None:
+                status, headers, content = (429, {"Retry-After": str(math.ceil(retry_after))},
+                                            {"error": "rate limit exceeded"})
+            else:
+                handler = getattr(self, f"_{method.lower()}_{route}", None)
+                if handler is None:
+                    status, headers, content = 405, {}, {"error": "method not allowed"}
+                else:
+                    status, headers, content = handler(query, body, **match.groupdict())
+
+        if isinstance(content, bytes):
+            headers.setdefault("Content-Type", "application/octet-stream")
+        else:
+            content = json.dumps(content).encode() if content is not None else b""
+            if content:
+                headers["Content-Type"] = "application/json"
+        if method != "GET" and status < 300:
+            with mock.data.lock:
+                mock.data.modified = max(mock.data.modified, math.ceil(time.time()))
+        elif method == "GET" and status == 200:
+            status, headers, content = self._validate(headers, content)
+        mock.count(route, status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _validate(self, headers: Dict[str, str],
+                  content: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Add the `ETag` and `Last-Modified` validators to a `200 OK` response, answering
+        `304 Not Modified` (without a body) if the request's `If-None-Match` or (if it has none)
+        `If-Modified-Since` shows the client already has it.
+
+        """
+        headers["ETag"] = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        headers["Last-Modified"] = email.utils.formatdate(self.server.mock.data.modified,
+                                                          usegmt=True)
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            modified = headers["ETag"] not in tags and "*" not in tags
+        elif if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                since = None
+            modified = since is None or self.server.mock.data.modified > since
+        else:
+            modified = True
+        if modified:
+            return 200, headers, content
+        return 304, {"ETag": headers["ETag"], "Last-Modified": headers["Last-Modified"]}, b""
+
+    def _page(self, route: str, items: List[Dict[str, Any]], query: Dict[str, List[str]],
+              convert: Callable[..., Any]) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """Serve the page of `items` (each converted through `convert`) selected by the `count`
+        and `after` query values.
+
+        """
+        count = int(query.get("count", ["150"])[0])
+        if not 1 <= count <= self.server.mock.max_count:
+            return 400, {}, {"error": f"count must be between 1 and {self.server.mock.max_count}"}
+        offset = int(query.get("after", ["0"])[0])
+        content = {"count": len(items),
+                   "list": [convert(item) for item in items[offset:offset + count]]}
+        if offset + count < len(items):
+            after = offset + count
+            content["next"] = f"{self.server.mock.url}/{route}?after={after}&count={count}"
+        return 200, {}, content
+
+    def _get_ping(self, query, body):
+        return 200, {}, {"steam_id": "76561198000000000", "name": "mock", "chaser": True,
+                         "type": "regular"}
+
+    def _get_maps(self, query, body):
+        return 200, {}, _MAPS
+
+    def _get_replays(self, query, body):
+        data = self.server.mock.data
+        date_key = "date" if query.get("sort-by", [""])[0] == "replay-date" else "created"
+        bounds = _bounds(query)
+        with data.lock:
+            replays = [replay for replay in data.replays.values()
+                       if ("group" not in query
+                           or any(g["id"] == query["group"][0] for g in replay["groups"]))
+                       and ("uploader" not in query
+                            or replay["uploader"]["steam_id"] == query["uploader"][0])
+                       and ("playlist" not in query or replay["playlist_id"] in query["playlist"])
+                       and ("title" not in query or query["title"][0] in replay["title"])
+                       and all(compare(_parse_date(replay[key]), value)
+                               for key, compare, value in bounds)]
+        # every generated date is an RFC3339 UTC date, so they sort as strings
+        replays.sort(key=lambda replay: replay[date_key],
+                     reverse=query.get("sort-dir", ["desc"])[0] == "desc")
+        return self._page("replays", replays, query, data.summary)
+
+    def _get_replay(self, query, body, id):
+        replay = self.server.mock.data.replays.get(id)
+        if replay is None:
+            return 404, {}, {"error": "replay not found"}
+        return 200, {}, replay
+
+    def _delete_replay(self, query, body, id):
+        data = self.server.mock.data
+        with data.lock:
+            if data.replays.pop(id, None) is None:
+                return 404, {}, {"error": "replay not found"}
+        return 204, {}, None
+
+    def _patch_replay(self, query, body, id):
+        data = self.server.mock.data
+        with data.lock:
+            if id not in data.replays:
+                return 404, {}, {"error": "replay not found"}
+            changes = json.loads(body or b"{}")
+            data.replays[id] = {**data.replays[id], **{key: value for key, value in changes.items()
+                                                       if key in ("title", "visibility")}}
+        return 204, {}, None
+
+    def _get_replay_file(self, query, body, id):
+        if id not in self.server.mock.data.replays:
+            return 404, {}, {"error": "replay not found"}
+        content = self.server.mock.replay_file(id)
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match is None:
+            return 200, {}, content
+        start = int(match.group(1))
+        if start >= len(content):
+            return 416, {"Content-Range": f"bytes */{len(content)}"}, b""
+        return (206, {"Content-Range": f"bytes {start}-{len(content) - 1}/{len(content)}"},
+                content[start:])
+
+    def _post_upload_replay(self, query, body):
+        data = self.server.mock.data
+        # the multipart boundary changes between uploads, so only the file itself is hashed
+        boundary = re.search(r"boundary=\"?([^\";]+)", self.headers.get("Content-Type") or "")
+        if boundary is not None:
+            part = body.split(b"--" + boundary.group(1).encode())[1]
+            body = part.split(b"\r\n\r\n", 1)[-1][:-2]
+        digest = hashlib.sha256(body).hexdigest()
+        with data.lock:
+            if digest in data.uploads:
+                replay_id = data.uploads[digest]
+                return 409, {}, {"error": "duplicate replay", "id": replay_id,
+                                 "location": f"https://ballchasing.com/replay/{replay_id}"}
+            replay_id = str(uuid.UUID(digest[:32], version=4))
+            data.uploads[digest] = replay_id
+            template = next(iter(data.replays.values()), None) or {}
+            created = _rfc3339(datetime.datetime.now(datetime.timezone.utc))
+            data.replays[replay_id] = {**template, "id": replay_id, "created": created,
+                                       "title": f"Upload {len(data.uploads)}",
+                                       "visibility": query.get("visibility", ["public"])[0],
+                                       "groups": [{"id": g, "name": g}
+                                                  for g in query.get("group", ())]}
+            data.replays.move_to_end(replay_id, last=False)
+        return 201, {}, {"id": replay_id,
+                         "location": f"https://ballchasing.com/replay/{replay_id}"}
+
+    def _get_groups(self, query, body):
+        data = self.server.mock.data
+        bounds = _bounds(query)
+        with data.lock:
+            groups = [group for group in data.groups.values()
+                      if ("group" not in query or group["parent"] == query["group"][0])
+                      and ("creator" not in query
+                           or group["creator"]["steam_id"] == query["creator"][0])
+                      and ("name" not in query or query["name"][0] in group["name"])
+                      and all(compare(_parse_date(group[key]), value)
+                              for key, compare, value in bounds)]
+        if query.get("sort-by", [""])[0] == "name":
+            groups.sort(key=lambda group: group["name"],
+                        reverse=query.get("sort-dir", ["asc"])[0] == "desc")
+        return self._page("groups", groups, query,
+                          lambda group: {k: v for k, v in group.items() if k != "parent"})
+
+    def _get_group(self, query, body, id):
+        data = self.server.mock.data
+        group = data.groups.get(id)
+        if group is None:
+            return 404, {}, {"error": "group not found"}
+        return 200, {}, {**group, "status": "ok", "players": [], "teams": []}
+
+    def _post_groups(self, query, body):
+        data = self.server.mock.data
+        payload = json.loads(body or b"{}")
+        with data.lock:
+            group_id = f"{payload.get('name', 'group').lower().replace(' ', '-')}-" \
+                       f"{len(data.groups):08x}"
+            data.groups[group_id] = {
+                "id": group_id,
+                "name": payload.get("name", ""),
+                "created": _rfc3339(datetime.datetime.now(datetime.timezone.utc)),
+                "player_identification": payload.get("player_identification"),
+                "team_identification": payload.get("team_identification"),
+                "shared": False,
+                "creator": {"steam_id": "76561198000000000", "name": "mock"},
+                "parent": payload.get("parent"),
+                "direct_replays": 0,
+                "indirect_replays": 0
+            }
+        return 201, {}, {"id": group_id, "link": f"{self.server.mock.url}/groups/{group_id}"}
+
+    def _delete_group(self, query, body, id):
+        data = self.server.mock.data
+        with data.lock:
+            if data.groups.pop(id, None) is None:
+                return 404, {}, {"error": "group not found"}
+        return 204, {}, None
+
+    def _patch_group(self, query, body, id):
+        data = self.server.mock.data
+        with data.lock:
+            if id not in data.groups:
+                return 404, {}, {"error": "group not found"}
+            data.groups[id].update(json.loads(body or b"{}"))
+        return 204, {}, None
+
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockServer"
+
+
+class MockServer:
+    """A local stand-in for the ballchasing.com API (see the module's documentation).
+
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.0,
+                 jitter: float = 0.0, rate: Optional[float] = None, replays: int = 1000,
+                 groups: int = 64, replay_size: int = 65536, max_count: int = 200,
+                 seed: int = 0) -> None:
+        """
+        Arguments
+        ---------
+        host : str, optional, default="127.0.0.1"
+            The address the server listens on.
+        port : int, optional, default=0
+            The port the server listens on (`0` picks a free port; see `url`).
+        latency : float, optional, default=0.0
+            The number of seconds every response is delayed by.
+        jitter : float, optional, default=0.0
+            The maximum number of seconds randomly added to `latency`.
+        rate : float, optional, default=None
+            If defined, the number of calls per second allowed for each API key and endpoint
+            (over a rolling one second window). Calls past the limit are answered with `429 Too
+            Many Requests` and a `Retry-After` header.
+        replays : int, optional, default=1000
+            The number of generated replays.
+        groups : int, optional, default=64
+            The number of generated groups. Every group past the fourth is a subgroup of an
+            earlier group, and the replays are spread evenly over the groups.
+        replay_size : int, optional, default=65536
+            The size (in bytes) of every replay file.
+        max_count : int, optional, default=200
+            The largest page size (`count`) allowed by `/replays` and `/groups`.
+        seed : int, optional, default=0
+            The seed of the generated data (and latency jitter).
+
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.replay_size = replay_size
+        self.max_count = max_count
+        self.rng = random.Random(seed)
+        self.data = _Data(replays, groups, seed)
+        self._calls = collections.defaultdict(collections.deque)
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+        # the number of connections accepted
+        self.connections = 0
+        self._server = _HTTPServer((host, port), _Handler)
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """The root of the server's API URLs (to be given to `Client` or `AsyncClient` as
+        `api_url`).
+
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "MockServer":
+        """Start serving from a background thread.
+
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve from the current thread until interrupted.
+
+        """
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        """Stop serving and close the server's socket.
+
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def reserve(self, token: Optional[str], route: str) -> Optional[float]:
+        """Record a call to `route` with `token`, returning `None` if it is within the rate
+        limit, or else the number of seconds until the next call would be.
+
+        """
+        if self.rate is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls[token, route]
+            while calls and calls[0] <= now - 1:
+                calls.popleft()
+            if len(calls) >= self.rate:
+                return calls[0] + 1 - now
+            calls.append(now)
+        return None
+
+    def count(self, route: Optional[str], status: int) -> None:
+        with self._lock:
+            self._counts[route, status] += 1
+
+    def counts(self, reset: bool = False) -> Dict[Tuple[Optional[str], int], int]:
+        """Get the number of responses served, by `(route, status code)`.
+
+        Parameters
+        ----------
+        reset : bool, optional, default=False
+            If `True`, the counts are reset afterwards.
+
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            if reset:
+                self._counts.clear()
+        return counts
+
+    def replay_file(self, replay_id: str) -> bytes:
+        """Get the (deterministic) content of a replay's file.
+
+        """
+        seed = hashlib.sha256(replay_id.encode()).digest()
+        return (seed * (self.replay_size // len(seed) + 1))[:self.replay_size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate", type=float, default=None)
+    parser.add_argument("--replays", type=int, default=1000)
+    parser.add_argument("--groups", type=int, default=64)
+    parser.add_argument("--replay-size", type=int, default=65536)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = MockServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                        rate=args.rate, replays=args.replays, groups=args.groups,
+                        replay_size=args.replay_size, seed=args.seed)
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
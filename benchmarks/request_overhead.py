@@ -0,0 +1,146 @@
+"""Microbenchmark of the per-call overhead of building requests (URL, headers and query
+conversion) in ``Client``, excluding the network, rate limiting and caching.
+
+Each case is timed three ways: ``before`` builds the URL and headers through ``httpprep.URL``
+and ``httpprep.Headers`` on every call, as ``Client`` used to; ``after`` builds them the way
+``Client`` now does (from strings prepared once per client, through the helpers in
+``pychasing.urls``); and ``client`` times the whole ``Client`` method with the request itself
+left out. The ``AsyncClient`` path is not measured.
+
+Run with ``python benchmarks/request_overhead.py``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import httpprep
+import timeit
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pychasing
+
+from pychasing import urls
+from pychasing.urls import p
+
+
+_REPLAY_ID = "2b1ef0a8-ed53-4c5e-9a0e-e5bd6c5a5b1c"
+_GROUP_ID = "rlcs-2022-xyz123"
+_CREATOR = "76561198000000000"
+_LIST_REPLAYS = dict(
+    playlists=[pychasing.Playlist.ranked_doubles, pychasing.Playlist.ranked_standard],
+    min_rank=pychasing.Rank.champion_1, season=pychasing.Season.f2p_8, pro=True,
+    sort_by=pychasing.ReplaySortBy.replay_date, sort_dir=pychasing.SortDirection.desc,
+    count=200)
+
+
+class _NullClient(pychasing.Client):
+    """A client whose requests are built but never sent.
+
+    """
+    def _request(self, operation, method, url, headers, *, print_error, **kwargs):
+        return url
+
+
+def _headers(token: str) -> dict:
+    prepped_headers = httpprep.Headers()
+    prepped_headers.Authorization = token
+    return prepped_headers.format_dict()
+
+
+def _before_get(token: str, *path_segments: str):
+    """Build a URL and headers for a request without queries, as `Client` used to.
+
+    """
+    prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
+                               path_segments=["api", *path_segments])
+    return prepped_url.build(), _headers(token)
+
+
+def _before_list_replays(token: str, *, playlists, min_rank, season, pro, sort_by, sort_dir,
+                         count):
+    """Build the URL and headers of `list_replays`, as `Client` used to.
+
+    """
+    prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
+                               path_segments=["api", "replays"])
+    prepped_url.components.queries[
+        "after", "title", "season", "match-result", "min-rank", "max-rank", "pro", "uploader",
+        "group", "map", "created-before", "created-after", "replay-date-before",
+        "replay-date-after", "count", "sort-by", "sort-dir"
+    ] = [..., ..., p(season), ..., p(min_rank), ..., str(pro).lower(), ..., ..., ..., ..., ...,
+         ..., ..., count, p(sort_by), p(sort_dir)]
+    for playlist in playlists:
+        prepped_url.components.queries["playlist"] = p(playlist)
+    return prepped_url.build(query_check=...), _headers(token)
+
+
+def _before_list_groups(token: str, *, creator, count):
+    """Build the URL and headers of `list_groups`, as `Client` used to.
+
+    """
+    prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
+                               path_segments=["api", "groups"])
+    prepped_url.components.queries[
+        "after", "name", "creator", "group", "created-before", "created-after", "count",
+        "sort-by", "sort-dir"
+    ] = [..., ..., creator, ..., ..., ..., count, ..., ...]
+    return prepped_url.build(query_check=...), _headers(token)
+
+
+def _after_list_replays(api_url: str, **filters):
+    return urls._list_replays_url(
+        api_url, next=..., title=..., player_names=..., player_ids=...,
+        match_result=..., max_rank=..., uploader=..., group=..., map=..., created_before=...,
+        created_after=..., replay_date_before=..., replay_date_after=..., **filters)
+
+
+def _after_list_groups(api_url: str, **filters):
+    return urls._list_groups_url(api_url, next=..., name=..., group=..., created_before=...,
+                                 created_after=..., sort_by=..., sort_dir=..., **filters)
+
+
+def _time(case, number: int) -> float:
+    return min(timeit.repeat(case, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 20000) -> None:
+    client = _NullClient("token", auto_rate_limit=False)
+    api_url = client._api_url
+    cases = {
+        "get_replay": (
+            lambda: _before_get("token", "replays", _REPLAY_ID),
+            lambda: (f"{api_url}/replays/{_REPLAY_ID}", client._headers),
+            lambda: client.get_replay(_REPLAY_ID)),
+        "get_group": (
+            lambda: _before_get("token", "groups", _GROUP_ID),
+            lambda: (f"{api_url}/groups/{_GROUP_ID}", client._headers),
+            lambda: client.get_group(_GROUP_ID)),
+        "list_replays": (
+            lambda: _before_list_replays("token", **_LIST_REPLAYS),
+            lambda: (_after_list_replays(api_url, **_LIST_REPLAYS), client._headers),
+            lambda: client.list_replays(**_LIST_REPLAYS)),
+        "list_groups": (
+            lambda: _before_list_groups("token", creator=_CREATOR, count=200),
+            lambda: (_after_list_groups(api_url, creator=_CREATOR, count=200), client._headers),
+            lambda: client.list_groups(creator=_CREATOR, count=200))
+    }
+    for name, (before, after, _) in cases.items():
+        # both paths must build the same URL
+        assert before()[0] == after()[0], name
+    print(f"{'':<14} {'before':>12} {'after':>12} {'client':>12} {'speedup':>8}")
+    for name, (before, after, call) in cases.items():
+        before_us, after_us, call_us = (_time(case, number) for case in (before, after, call))
+        print(f"{name:<14} {before_us:9.2f} us {after_us:9.2f} us {call_us:9.2f} us "
+              f"{before_us / after_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
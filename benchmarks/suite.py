@@ -0,0 +1,263 @@
+"""Offline benchmarks of ``Client`` against the local stand-in server in ``mock_server.py``.
+
+Each scenario reports the calls made per second, the p50 and p99 latency of those calls (as
+seen by the client), the peak memory allocated by the client while running it, and (for the
+rate limited scenarios) the number of ``429 Too Many Requests`` responses and the limiter's
+efficiency (the achieved call rate over the rate allowed by the server). No network access or
+API key is needed, so the suite can run in CI:
+
+```
+python benchmarks/suite.py                # every scenario
+python benchmarks/suite.py --quick        # fewer calls per scenario
+python benchmarks/suite.py --json out.json --only get_replay,iter_replays
+```
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import subprocess
+import tracemalloc
+import itertools
+import tempfile
+import argparse
+import io
+import json
+import time
+import sys
+import os
+
+from typing import (
+    Callable,
+    Optional,
+    Dict,
+    List,
+    Any
+)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pychasing
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class _Server:
+    """A `mock_server.py` process (kept out of the benchmarking process, so that it neither
+    competes for the GIL nor shows up in the memory measurements).
+
+    """
+    def __init__(self, *args: str) -> None:
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.join(_HERE, "mock_server.py"), *args],
+            stdout=subprocess.PIPE, text=True)
+        self.url = self._process.stdout.readline().strip()
+        if not self.url:
+            raise RuntimeError("the mock server failed to start")
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.wait()
+
+
+class _Scenario:
+    """A benchmarked workload. `run(client, n)` makes (about) `n` calls with `client` and
+    returns the number of calls made.
+
+    """
+    def __init__(self, name: str, run: Callable[[pychasing.Client, int], int], calls: int, *,
+                 rate: Optional[float] = None, client: Dict[str, Any] = None,
+                 playback: bool = False) -> None:
+        self.name = name
+        self.run = run
+        self.calls = calls
+        self.rate = rate
+        self.client = client or {"auto_rate_limit": False}
+        self.playback = playback
+
+
+def _replay_ids(client: pychasing.Client, n: int) -> List[str]:
+    ids = [replay["id"] for replay in client.iter_replays(limit=n, prefetch=False)]
+    return list(itertools.islice(itertools.cycle(ids), n))
+
+
+def _get_replay(client: pychasing.Client, n: int) -> int:
+    for replay_id in _replay_ids(client, n):
+        client.get_replay(replay_id).raise_for_status()
+    return n
+
+
+def _get_replays(client: pychasing.Client, n: int) -> int:
+    for _, response in client.get_replays(_replay_ids(client, n), max_concurrency=8):
+        response.raise_for_status()
+    return n
+
+
+def _iter_replays(client: pychasing.Client, n: int) -> int:
+    return sum(1 for _ in client.iter_replays(limit=n))
+
+
+def _scan_replays(client: pychasing.Client, n: int) -> int:
+    return sum(1 for _ in client.scan_replays(created_after="2000-01-01T00:00:00Z", limit=n,
+                                              max_concurrency=8, split_threshold=400))
+
+
+def _download_replays(client: pychasing.Client, n: int) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        for _, response in client.download_replays(_replay_ids(client, n), directory,
+                                                   max_concurrency=4):
+            if isinstance(response, Exception):
+                raise response
+    return n
+
+
+def _upload_replays(client: pychasing.Client, n: int) -> int:
+    for i in range(n):
+        file = io.BytesIO(os.urandom(32) + b"\0" * 65536)
+        file.name = f"{i}.replay"
+        client.upload_replay(file, "private").raise_for_status()
+    return n
+
+
+def _limited(client: pychasing.Client, n: int) -> int:
+    ids = _replay_ids(client, 1)
+    for _, response in client.get_replays(ids * n, max_concurrency=8, print_error=False):
+        if not isinstance(response, Exception) and response.status_code != 429:
+            response.raise_for_status()
+    return n
+
+
+_SCENARIOS = [
+    _Scenario("get_replay", _get_replay, 500),
+    _Scenario("get_replays", _get_replays, 1000),
+    _Scenario("iter_replays", _iter_replays, 5000),
+    _Scenario("scan_replays", _scan_replays, 5000),
+    _Scenario("download_replays", _download_replays, 200),
+    _Scenario("upload_replay", _upload_replays, 200),
+    # recorded from the server first, then played back with no server at all (which leaves
+    # only the client's own overhead)
+    _Scenario("get_replays_playback", _get_replays, 1000, playback=True),
+    _Scenario("iter_replays_playback", _iter_replays, 5000, playback=True),
+    # the tier's rate (8/s) matches the server's
+    _Scenario("rate_limited", _limited, 48, rate=8,
+              client={"patreon_tier": pychasing.PatreonTier.champion}),
+    # the server only allows half of the tier's rate, which the adaptive limiter has to find
+    _Scenario("rate_limited_adaptive", _limited, 48, rate=4,
+              client={"patreon_tier": pychasing.PatreonTier.champion})
+]
+
+
+def _measure(scenario: _Scenario, server: _Server, calls: int,
+             memory: bool) -> Dict[str, Any]:
+    client_arguments = dict(scenario.client)
+    if scenario.playback:
+        with tempfile.TemporaryDirectory() as directory:
+            cassette = os.path.join(directory, "cassette.jsonl")
+            recorder = pychasing.RecordingTransport(cassette)
+            with pychasing.Client("token", api_url=server.url, transport=recorder,
+                                  **client_arguments) as client:
+                _replay_ids(client, 1)
+                scenario.run(client, calls)
+            client_arguments["transport"] = pychasing.PlaybackTransport(cassette)
+
+    collector = pychasing.Metrics()
+    with pychasing.Client("token", api_url=server.url, hooks=[collector],
+                          **client_arguments) as client:
+        # warm up (connections, caches and the replay ids of the data set)
+        _replay_ids(client, 1)
+        collector.reset()
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        scenario.run(client, calls)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+
+    latencies = []
+    requests = rejected = 0
+    for operation, metrics in collector.snapshot().items():
+        requests += metrics["requests"]
+        rejected += metrics["statuses"].get(429, 0)
+        latencies.append((metrics["requests"], metrics["latency"]))
+    weight = max(1, sum(count for count, _ in latencies))
+    result = {
+        "calls": calls,
+        "requests": requests,
+        "seconds": elapsed,
+        "calls_per_second": calls / elapsed,
+        # the percentiles of the operation making most of the requests
+        "p50_ms": max(latencies, key=lambda pair: pair[0])[1]["p50"] * 1000 if latencies
+                  else None,
+        "p99_ms": max(latencies, key=lambda pair: pair[0])[1]["p99"] * 1000 if latencies
+                  else None,
+        "mean_ms": sum(count * latency["mean"] for count, latency in latencies) / weight * 1000,
+        "peak_memory_kib": peak / 1024 if peak is not None else None,
+        "rejected": rejected
+    }
+    if scenario.rate:
+        result["efficiency"] = min(1.0, (requests - rejected) / elapsed / scenario.rate)
+    return result
+
+
+def _format(value: Any, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main(argv: List[str] = None) -> Dict[str, Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="make a tenth of the calls of every scenario (but at least 16)")
+    parser.add_argument("--only", default="",
+                        help="a comma-separated list of the scenarios to run")
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="the server's response delay in seconds (default 0.002)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the (slower) memory measurement runs")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    args = parser.parse_args(argv)
+
+    only = set(filter(None, args.only.split(",")))
+    scenarios = [scenario for scenario in _SCENARIOS if not only or scenario.name in only]
+    servers = {}
+    results = {}
+    print(f"{'scenario':<22} {'calls':>6} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'peak KiB':>9} {'429s':>5} {'efficiency':>10}")
+    try:
+        for scenario in scenarios:
+            if scenario.rate not in servers:
+                rate = ("--rate", str(scenario.rate)) if scenario.rate else ()
+                servers[scenario.rate] = _Server("--latency", str(args.latency), "--replays",
+                                                 "5000", *rate)
+            server = servers[scenario.rate]
+            calls = (max(min(scenario.calls, 16), scenario.calls // 10) if args.quick
+                     else scenario.calls)
+            result = _measure(scenario, server, calls, memory=False)
+            # memory is measured in a separate run, as tracing slows every allocation down
+            if not args.no_memory and not scenario.rate:
+                peak = _measure(scenario, server, calls, memory=True)["peak_memory_kib"]
+                result["peak_memory_kib"] = peak
+            results[scenario.name] = result
+            print(f"{scenario.name:<22} {calls:>6} {result['calls_per_second']:>9.1f} "
+                  f"{_format(result['p50_ms'], '8.2f')} {_format(result['p99_ms'], '8.2f')} "
+                  f"{_format(result['peak_memory_kib'], '9.0f')} {result['rejected']:>5} "
+                  f"{_format(result.get('efficiency'), '10.1%')}")
+    finally:
+        for server in servers.values():
+            server.close()
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,21 @@ __url__ = "https://github.com/tanrbobanr/pychasing"
 __download_url__ = "https://pypi.org/project/pychasing/"
 
 
+import importlib
+
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Any
+)
+
+
 __all__ = (
     "Client",
+    "ClientPool",
+    "AsyncClient",
     "PatreonTier",
+    "Priority",
     "Rank",
     "Playlist",
     "Platform",
@@ -32,24 +44,170 @@ __all__ = (
     "SortDirection",
     "GroupStats",
     "Date",
-    "ReplayBuffer"
+    "ReplayBuffer",
+    "Replay",
+    "ReplaySummary",
+    "ReplayPage",
+    "Team",
+    "Player",
+    "Group",
+    "GroupSummary",
+    "GroupPage",
+    "GroupPlayer",
+    "GroupTeam",
+    "Stats",
+    "CoreStats",
+    "BoostStats",
+    "MovementStats",
+    "PositioningStats",
+    "DemoStats",
+    "BallStats",
+    "AggregateStats",
+    "Cache",
+    "MemoryCache",
+    "SQLiteCache",
+    "RateLimitBackend",
+    "MemoryRateLimitBackend",
+    "SQLiteRateLimitBackend",
+    "RetryPolicy",
+    "Metrics",
+    "RequestEvent",
+    "Transport",
+    "SessionTransport",
+    "RecordingTransport",
+    "PlaybackTransport",
+    "ReplayMirror",
+    "GroupTree",
+    "GroupCrawl"
 )
 
 
-from .client import Client
-from .enums import PatreonTier
-from .enums import Rank
-from .enums import Playlist
-from .enums import Platform
-from .enums import Map
-from .enums import Visibility
-from .enums import Season
-from .enums import PlayerIdentification
-from .enums import TeamIdentification
-from .enums import MatchResult
-from .enums import ReplaySortBy
-from .enums import GroupSortBy
-from .enums import SortDirection
-from .enums import GroupStats
-from .models import Date
-from .models import ReplayBuffer
+# the module each public name is imported from; the modules are only imported once one of their
+# names is first used (PEP 562), so that `import pychasing` does not import `requests`,
+# `aiohttp` or `rlim` (or build the enumerations) until they are needed
+_exports = {
+    "Client": ".client",
+    "ClientPool": ".pool",
+    "AsyncClient": ".aioclient",
+    "PatreonTier": ".enums",
+    "Priority": ".enums",
+    "Rank": ".enums",
+    "Playlist": ".enums",
+    "Platform": ".enums",
+    "Map": ".enums",
+    "Visibility": ".enums",
+    "Season": ".enums",
+    "PlayerIdentification": ".enums",
+    "TeamIdentification": ".enums",
+    "MatchResult": ".enums",
+    "ReplaySortBy": ".enums",
+    "GroupSortBy": ".enums",
+    "SortDirection": ".enums",
+    "GroupStats": ".enums",
+    "Date": ".models",
+    "ReplayBuffer": ".models",
+    "Replay": ".models",
+    "ReplaySummary": ".models",
+    "ReplayPage": ".models",
+    "Team": ".models",
+    "Player": ".models",
+    "Group": ".models",
+    "GroupSummary": ".models",
+    "GroupPage": ".models",
+    "GroupPlayer": ".models",
+    "GroupTeam": ".models",
+    "Stats": ".models",
+    "CoreStats": ".models",
+    "BoostStats": ".models",
+    "MovementStats": ".models",
+    "PositioningStats": ".models",
+    "DemoStats": ".models",
+    "BallStats": ".models",
+    "AggregateStats": ".models",
+    "Cache": ".cache",
+    "MemoryCache": ".cache",
+    "SQLiteCache": ".cache",
+    "RateLimitBackend": ".ratelimit",
+    "MemoryRateLimitBackend": ".ratelimit",
+    "SQLiteRateLimitBackend": ".ratelimit",
+    "RetryPolicy": ".retry",
+    "Metrics": ".metrics",
+    "RequestEvent": ".metrics",
+    "Transport": ".transport",
+    "SessionTransport": ".transport",
+    "RecordingTransport": ".transport",
+    "PlaybackTransport": ".transport",
+    "ReplayMirror": ".mirror",
+    "GroupTree": ".crawl",
+    "GroupCrawl": ".crawl"
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_exports})
+
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .pool import ClientPool
+    from .aioclient import AsyncClient
+    from .enums import PatreonTier
+    from .enums import Priority
+    from .enums import Rank
+    from .enums import Playlist
+    from .enums import Platform
+    from .enums import Map
+    from .enums import Visibility
+    from .enums import Season
+    from .enums import PlayerIdentification
+    from .enums import TeamIdentification
+    from .enums import MatchResult
+    from .enums import ReplaySortBy
+    from .enums import GroupSortBy
+    from .enums import SortDirection
+    from .enums import GroupStats
+    from .models import Date
+    from .models import ReplayBuffer
+    from .models import Replay
+    from .models import ReplaySummary
+    from .models import ReplayPage
+    from .models import Team
+    from .models import Player
+    from .models import Group
+    from .models import GroupSummary
+    from .models import GroupPage
+    from .models import GroupPlayer
+    from .models import GroupTeam
+    from .models import Stats
+    from .models import CoreStats
+    from .models import BoostStats
+    from .models import MovementStats
+    from .models import PositioningStats
+    from .models import DemoStats
+    from .models import BallStats
+    from .models import AggregateStats
+    from .cache import Cache
+    from .cache import MemoryCache
+    from .cache import SQLiteCache
+    from .ratelimit import RateLimitBackend
+    from .ratelimit import MemoryRateLimitBackend
+    from .ratelimit import SQLiteRateLimitBackend
+    from .retry import RetryPolicy
+    from .metrics import Metrics
+    from .metrics import RequestEvent
+    from .transport import Transport
+    from .transport import SessionTransport
+    from .transport import RecordingTransport
+    from .transport import PlaybackTransport
+    from .mirror import ReplayMirror
+    from .crawl import GroupTree
+    from .crawl import GroupCrawl
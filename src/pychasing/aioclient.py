@@ -0,0 +1,488 @@
+"""An asynchronous counterpart to ``client``, built on ``aiohttp``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+from . import models
+from . import enums
+from . import ratelimit
+from .urls import p
+from .urls import _API_URL
+from .urls import _with_query
+from .urls import _list_replays_url
+from .urls import _list_groups_url
+import httpprep
+import asyncio
+import io
+import os
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from typing import (
+    Union,
+    Tuple,
+    Iterable,
+    AsyncIterator,
+    Callable,
+    Awaitable,
+    Dict,
+    Any
+)
+
+
+async def _print_error(response: "aiohttp.ClientResponse") -> None:
+    """Print out an error code from an `aiohttp.ClientResponse` if an HTTP error is encountered.
+
+    """
+    error_side = ("Client" if 400 <= response.status < 500 else "Server"
+                  if 500 <= response.status < 600 else None)
+    if error_side:
+        try:
+            response_json = await response.json(content_type=None)
+        except (ValueError, aiohttp.ClientError):
+            response_json = None
+        error_description = ""
+        if isinstance(response_json, dict) and "error" in response_json:
+            error_description = "(" + response_json["error"] + ") "
+
+        print(f"\033[93m{response.status} {error_side} Error: {response.reason} "
+              f"{error_description}for url: {response.url}\033[0m")
+
+
+class AsyncClient:
+    """The asynchronous counterpart to `Client`. Every method is a coroutine that mirrors the
+    `Client` method of the same name, and rate limiting (if enabled) is awaited rather than
+    slept.
+
+    Requires `aiohttp` (`pip install pychasing[async]`).
+
+    """
+    def __init__(self, token: str, auto_rate_limit: bool = True,
+                 patreon_tier: Union[str, enums.PatreonTier] = enums.PatreonTier.none,
+                 rate_limit_safe_start: bool = False, *, connection_limit: int = 100,
+                 connection_limit_per_host: int = 0, keep_alive: bool = True,
+                 adaptive_rate_limit: bool = True, api_url: str = ...) -> None:
+        """
+        Arguments
+        ---------
+        token : str
+            A ballchasing API key (acquirable from https://ballchasing.com/upload).
+        auto_rate_limit : bool
+            If `True`, the client will automatically limit API calls according to the given Patreon
+            tier.
+        patreon_tier : enums.PatreonTier or str, optional, default=PatreonTier.none
+            The token-holder's Ballchasing Patreon tier.
+        rate_limit_safe_start : bool, optional, default=False
+            If `True`, the rate limiter will start out as fully maxed out on API calls.
+        connection_limit : int, optional, default=100
+            The maximum number of simultaneously open connections (`0` for no limit).
+        connection_limit_per_host : int, optional, default=0
+            The maximum number of simultaneously open connections to a single host (`0` for no
+            limit).
+        keep_alive : bool, optional, default=True
+            If `False`, connections are closed after every request instead of being reused.
+        adaptive_rate_limit : bool, optional, default=True
+            See `Client`.
+        api_url : str, optional, default="https://ballchasing.com/api"
+            See `Client`.
+
+        Raises
+        ------
+        ImportError
+            If `aiohttp` is not installed.
+
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncClient requires aiohttp (pip install pychasing[async])")
+
+        self._token = token
+        # built once here rather than for every request
+        self._api_url = _API_URL if api_url == ... else api_url.rstrip("/")
+        self._headers = {"Authorization": token}
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+        self._keep_alive = keep_alive
+        self._session = None
+        if isinstance(patreon_tier, str):
+            try:
+                patreon_tier = enums.PatreonTier[patreon_tier]
+            except KeyError as exc:
+                raise ValueError(f"{patreon_tier!r} is not a valid PatreonTier") from exc
+
+        self._rate_limiters = {}
+        if auto_rate_limit:
+            limiter_type = (ratelimit.AdaptiveRateLimiter if adaptive_rate_limit
+                            else ratelimit.RateLimiter)
+            for k, v in patreon_tier.value.items():
+                self._rate_limiters[k] = limiter_type(*v, safestart=rate_limit_safe_start)
+
+    async def close(self) -> None:
+        """Close the client's session, along with all of its pooled connections.
+
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the client's session, creating it if it does not exist yet (sessions must be
+        created from within a running event loop).
+
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._connection_limit,
+                                             limit_per_host=self._connection_limit_per_host,
+                                             force_close=not self._keep_alive)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _request(self, operation: enums.Operation, method: str, url: str, *,
+                       print_error: bool, stream: bool = False,
+                       **kwargs) -> "aiohttp.ClientResponse":
+        """Send a request for `operation` through the client's session (awaiting the
+        operation's rate limiter, if any), printing the error (if any) if `print_error` is
+        `True`. Unless `stream` is `True`, the body is read (and the connection released) before
+        the response is returned.
+
+        """
+        rate_limiter = self._rate_limiters.get(operation)
+        if rate_limiter:
+            await rate_limiter.acquire_async()
+        response = await self._get_session().request(method, url, headers=self._headers,
+                                                     **kwargs)
+        if rate_limiter:
+            rate_limiter.feedback(response.status, response.headers)
+        if not stream:
+            await response.read()
+        if print_error:
+            await _print_error(response)
+        return response
+
+    async def _paginate(self, list_method: Callable[..., Awaitable["aiohttp.ClientResponse"]],
+                        limit: int, prefetch: bool,
+                        filters: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Walk the continuation chain of `list_method` (`list_replays` or `list_groups`),
+        yielding each listed item. See `Client._paginate`.
+
+        """
+        if limit != ... and limit < 1:
+            return
+        filters.setdefault("count", 200 if limit == ... else min(limit, 200))
+
+        async def fetch(next: str) -> Dict[str, Any]:
+            response = await list_method(next=next, **filters)
+            response.raise_for_status()
+            return await response.json()
+
+        task = None
+        try:
+            remaining = limit
+            page = await fetch(...)
+            while True:
+                next = page.get("next")
+                items = page.get("list") or []
+                if remaining != ...:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                more = bool(next and items and (remaining == ... or remaining > 0))
+                task = asyncio.ensure_future(fetch(next)) if more and prefetch else None
+                page = None
+                for item in items:
+                    yield item
+                if not more:
+                    return
+                page = await task if task else await fetch(next)
+                task = None
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def ping(self, *, print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Ping the https://ballchasing.com servers. See `Client.ping`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        return await self._request(enums.Operation.ping, "GET", self._api_url,
+                                   print_error=print_error)
+
+    async def upload_replay(self, file: io.BufferedReader,
+                            visibility: Union[str, enums.Visibility], *, group: str = ...,
+                            print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Upload a replay to https://ballchasing.com. See `Client.upload_replay`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = _with_query(f"{self._api_url}/v2/upload",
+                          (("visibility", p(visibility)), ("group", group)))
+
+        data = aiohttp.FormData()
+        data.add_field("file", file, filename=os.path.basename(file.name))
+        return await self._request(enums.Operation.upload_replay, "POST", url,
+                                   print_error=print_error, data=data)
+
+    async def list_replays(self, *, next: str = ..., title: str = ...,
+                           player_names: Iterable[str] = ...,
+                           player_ids: Iterable[Tuple[Union[enums.Platform, str],
+                                                      Union[int, str]]] = ...,
+                           playlists: Iterable[Union[enums.Playlist, str]] = ...,
+                           season: Union[str, enums.Season] = ...,
+                           match_result: Union[str, enums.MatchResult] = ...,
+                           min_rank: Union[str, enums.Rank] = ...,
+                           max_rank: Union[str, enums.Rank] = ..., pro: bool = ...,
+                           uploader: Union[Literal["me"], str, int] = ..., group: str = ...,
+                           map: Union[str, enums.Map] = ...,
+                           created_before: Union[models.Date, str] = ...,
+                           created_after: Union[models.Date, str] = ...,
+                           replay_date_before: Union[models.Date, str] = ...,
+                           replay_date_after: Union[models.Date, str] = ..., count: int = ...,
+                           sort_by: Union[str, enums.ReplaySortBy] = ...,
+                           sort_dir: Union[str, enums.SortDirection] = ...,
+                           print_error: bool = True) -> "aiohttp.ClientResponse":
+        """List replays filtered by various criteria. See `Client.list_replays`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = _list_replays_url(self._api_url, next=next, title=title, player_names=player_names,
+                                player_ids=player_ids, playlists=playlists, season=season,
+                                match_result=match_result, min_rank=min_rank, max_rank=max_rank,
+                                pro=pro, uploader=uploader, group=group, map=map,
+                                created_before=created_before, created_after=created_after,
+                                replay_date_before=replay_date_before,
+                                replay_date_after=replay_date_after, count=count,
+                                sort_by=sort_by, sort_dir=sort_dir)
+        return await self._request(enums.Operation.list_replays, "GET", url,
+                                   print_error=print_error)
+
+    def iter_replays(self, *, limit: int = ..., prefetch: bool = True, print_error: bool = True,
+                     **filters: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Lazily iterate (`async for`) over every replay matching the given filters. See
+        `Client.iter_replays`.
+
+        """
+        return self._paginate(self.list_replays, limit, prefetch,
+                              {**filters, "print_error": print_error})
+
+    async def get_replay(self, replay_id: str, *,
+                         print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Get more in-depth information for a specific replay. See `Client.get_replay`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/replays/{replay_id}"
+        return await self._request(enums.Operation.get_replay, "GET", url,
+                                   print_error=print_error)
+
+    async def delete_replay(self, replay_id: str, *,
+                            print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Delete the given replay from https://ballchasing.com. See `Client.delete_replay`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/replays/{replay_id}"
+        return await self._request(enums.Operation.delete_replay, "DELETE", url,
+                                   print_error=print_error)
+
+    async def patch_replay(self, replay_id: str, *, title: str = ...,
+                           visibility: Union[str, enums.Visibility] = ..., group: str = ...,
+                           print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Patch the title, visibility, and/or group of a replay. See `Client.patch_replay`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/replays/{replay_id}"
+
+        payload = httpprep.OverloadDict()
+        payload["title", "visibility", "group"] = [title, p(visibility), group]
+
+        return await self._request(enums.Operation.patch_replay, "PATCH", url,
+                                   print_error=print_error,
+                                   json=payload.remove_values(...).to_dict())
+
+    async def download_replay(self, replay_id: str, *,
+                              print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Download a replay from https://ballchasing.com. See `Client.download_replay`.
+
+        Warnings
+        --------
+        The body of the returned response is not read. It should be read in chunks (e.g. through
+        `response.content.iter_chunked`), and the response should be released once done, e.g.:
+        ```
+        async with await client.download_replay(...) as response:
+            async for chunk in response.content.iter_chunked(4096):
+                ...
+        ```
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/replays/{replay_id}/file"
+        return await self._request(enums.Operation.download_replay, "GET", url,
+                                   print_error=print_error, stream=True)
+
+    async def create_group(self, name: str,
+                           player_identification: Union[str, enums.PlayerIdentification],
+                           team_identification: Union[str, enums.TeamIdentification], *,
+                           parent: str = ...,
+                           print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Create a replay group on https://ballchasing.com. See `Client.create_group`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/groups"
+
+        payload = httpprep.OverloadDict()
+        payload[
+            "name", "player_identification", "team_identification", "parent"
+        ] = [
+            name, p(player_identification), p(team_identification), parent]
+
+        return await self._request(enums.Operation.create_group, "POST", url,
+                                   print_error=print_error,
+                                   json=payload.remove_values(...).to_dict())
+
+    async def list_groups(self, *, next: str = ..., name: str = ...,
+                          creator: Union[str, int] = ..., group: str = ...,
+                          created_before: Union[models.Date, str] = ...,
+                          created_after: Union[models.Date, str] = ..., count: int = ...,
+                          sort_by: Union[str, enums.GroupSortBy] = ...,
+                          sort_dir: Union[str, enums.SortDirection] = ...,
+                          print_error: bool = True) -> "aiohttp.ClientResponse":
+        """List replay groups filtered by various criteria. See `Client.list_groups`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = _list_groups_url(self._api_url, next=next, name=name, creator=creator,
+                               group=group, created_before=created_before,
+                               created_after=created_after, count=count, sort_by=sort_by,
+                               sort_dir=sort_dir)
+        return await self._request(enums.Operation.list_groups, "GET", url, print_error=print_error)
+
+    def iter_groups(self, *, limit: int = ..., prefetch: bool = True, print_error: bool = True,
+                    **filters: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Lazily iterate (`async for`) over every group matching the given filters. See
+        `Client.iter_groups`.
+
+        """
+        return self._paginate(self.list_groups, limit, prefetch,
+                              {**filters, "print_error": print_error})
+
+    async def get_group(self, group_id: str, *,
+                        print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Get information on a specific replay group. See `Client.get_group`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/groups/{group_id}"
+        return await self._request(enums.Operation.get_group, "GET", url,
+                                   print_error=print_error)
+
+    async def delete_group(self, group_id: str, *,
+                           print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Delete a specific group (and all children groups). See `Client.delete_group`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/groups/{group_id}"
+        return await self._request(enums.Operation.delete_group, "DELETE", url,
+                                   print_error=print_error)
+
+    async def patch_group(self, group_id: str, *,
+                          player_identification: Union[str, enums.PlayerIdentification] = ...,
+                          team_identification: Union[str, enums.TeamIdentification] = ...,
+                          parent: str = ..., shared: bool = ...,
+                          print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Patch a specific replay group. See `Client.patch_group`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/groups/{group_id}"
+
+        payload = httpprep.OverloadDict()
+        payload[
+            "player_identification", "team_identification", "parent", "shared"
+        ] = [
+            p(player_identification), p(team_identification), parent, shared]
+
+        return await self._request(enums.Operation.patch_group, "PATCH", url,
+                                   print_error=print_error,
+                                   json=payload.remove_values(...).to_dict())
+
+    async def maps(self, *, print_error: bool = True) -> "aiohttp.ClientResponse":
+        """Get a list of current maps. See `Client.maps`.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The `aiohttp.ClientResponse` object returned from the HTTP request.
+
+        """
+        url = f"{self._api_url}/maps"
+        return await self._request(enums.Operation.maps, "GET", url,
+                                   print_error=print_error)
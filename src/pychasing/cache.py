@@ -0,0 +1,261 @@
+"""Response caches used by ``client``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import collections
+import threading
+import sqlite3
+import json
+import time
+import os
+import requests
+
+from typing import (
+    NamedTuple,
+    Optional,
+    Union,
+    Dict
+)
+
+
+class CachedResponse(NamedTuple):
+    """The parts of a `requests.Response` that are kept in a cache.
+
+    """
+    status_code: int
+    reason: str
+    url: str
+    headers: Dict[str, str]
+    content: bytes
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> "CachedResponse":
+        return cls(response.status_code, response.reason, response.url, dict(response.headers),
+                   response.content)
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a `requests.Response` from the cached parts. The rebuilt response has its
+        `from_cache` attribute set to `True`.
+
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.url
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+class Cache:
+    """The interface implemented by every response cache. Caches must be safe to use from
+    multiple threads.
+
+    """
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get the (unexpired) entry stored under `key`, or `None` if there is none.
+
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        """Store `value` under `key` for `ttl` seconds.
+
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under `key` (if any).
+
+        """
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every entry whose key starts with `prefix`.
+
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every entry.
+
+        """
+        self.delete_prefix("")
+
+
+class MemoryCache(Cache):
+    """An in-memory cache that evicts the least recently used entry once `maxsize` entries are
+    stored.
+
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Arguments
+        ---------
+        maxsize : int, optional, default=1024
+            The maximum number of entries kept in the cache.
+
+        """
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+
+class SQLiteCache(Cache):
+    """An on-disk cache backed by a SQLite database, which evicts the least recently used entries
+    once more than `maxsize` entries are stored. The cache persists across processes and
+    restarts.
+
+    Cache hits do not write to the database: the time each entry was last read is kept in memory
+    and written in batches of `access_batch` (as well as before evicting and on `close`), so the
+    recency of entries read by other processes is only approximate.
+
+    """
+    def __init__(self, path: Union[str, os.PathLike], maxsize: int = 65536,
+                 access_batch: int = 256) -> None:
+        """
+        Arguments
+        ---------
+        path : str or PathLike
+            The path of the database file (created if it does not exist).
+        maxsize : int, optional, default=65536
+            The maximum number of entries kept in the cache.
+        access_batch : int, optional, default=256
+            The number of cache hits whose access times are written to the database at once.
+
+        """
+        self._maxsize = maxsize
+        self._access_batch = access_batch
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status_code INTEGER,"
+            " reason TEXT, url TEXT, headers TEXT, content BLOB, expires REAL, accessed REAL)")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        # access times not written yet, by key
+        self._accessed = {}
+        # an upper bound on the number of entries, so that they are only counted (and evicted)
+        # once it exceeds `maxsize`
+        self._size = self._count()
+
+    def _count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _flush(self) -> None:
+        """Write the pending access times to the database (the lock must be held).
+
+        """
+        if not self._accessed:
+            return
+        self._connection.execute("BEGIN")
+        try:
+            self._connection.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()])
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+        self._accessed.clear()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond `maxsize` (the lock must be held).
+
+        """
+        self._flush()
+        size = self._count()
+        if size > self._maxsize:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed"
+                " LIMIT ?)", (size - self._maxsize,))
+        self._size = min(size, self._maxsize)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, reason, url, headers, content, expires FROM responses"
+                " WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[5] <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._accessed.pop(key, None)
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self._access_batch:
+                self._flush()
+        return CachedResponse(row[0], row[1], row[2], json.loads(row[3]), row[4])
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, value.status_code, value.reason, value.url, json.dumps(value.headers),
+                 value.content, now + ttl, now))
+            self._accessed.pop(key, None)
+            self._size += 1
+            if self._size > self._maxsize:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._accessed.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key LIKE ? ESCAPE '\\'",
+                                     (escaped + "%",))
+            for key in [key for key in self._accessed if key.startswith(prefix)]:
+                del self._accessed[key]
+
+    def close(self) -> None:
+        """Write the pending access times and close the connection to the database.
+
+        """
+        with self._lock:
+            self._flush()
+            self._connection.close()
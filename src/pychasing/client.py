@@ -11,12 +11,39 @@ __copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
 
 from . import models
 from . import enums
+from . import ratelimit
+from . import metrics
+from .retry import RetryPolicy
+from .cache import Cache
+from .cache import CachedResponse
+from .cache import MemoryCache
+from .transport import Transport
+from .transport import SessionTransport
+from .crawl import GroupTree
+from .crawl import GroupCrawl
+from .urls import p
+from .urls import _API_URL
+from .urls import _with_query
+from .urls import _list_replays_url
+from .urls import _list_groups_url
 import requests
 import httpprep
 import urllib.parse
 import rlim
+import concurrent.futures
+import collections
+import itertools
+import contextlib
+import contextvars
+import threading
+import hashlib
+import time
+import weakref
+import math
+import json
+import glob
 import io
-import re
+import os
 
 try:
     from typing import Literal
@@ -26,11 +53,64 @@ except ImportError:
 from typing import (
     Union,
     Tuple,
-    Iterable
+    Iterable,
+    Iterator,
+    Callable,
+    Dict,
+    Any,
+    BinaryIO,
+    Optional
 )
 
 
-cont_pat = re.compile(r"(?<=\after=)[^\&]*")
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        _json_loads = ujson.loads
+    except ImportError:
+        _json_loads = json.loads
+
+
+# the priority of the requests made in the current context (see `Client.priority`)
+_priority = contextvars.ContextVar("priority", default=None)
+
+# the default number of seconds the responses of each cached operation are kept for
+_CACHE_TTLS = {
+    enums.Operation.get_replay: 86400,
+    enums.Operation.get_group: 300,
+    enums.Operation.list_replays: 60,
+    enums.Operation.list_groups: 60,
+    enums.Operation.maps: 3600
+}
+
+# the cache entries invalidated by each write operation, as (the detail operations whose entry
+# for the same URL is removed, the list operations whose entries are all removed)
+_CACHE_INVALIDATIONS = {
+    enums.Operation.upload_replay: ((), (enums.Operation.list_replays,)),
+    enums.Operation.delete_replay: ((enums.Operation.get_replay,),
+                                    (enums.Operation.list_replays,)),
+    enums.Operation.patch_replay: ((enums.Operation.get_replay,),
+                                   (enums.Operation.list_replays,)),
+    enums.Operation.create_group: ((), (enums.Operation.list_groups,)),
+    enums.Operation.delete_group: ((enums.Operation.get_group,),
+                                   (enums.Operation.list_groups,)),
+    enums.Operation.patch_group: ((enums.Operation.get_group,),
+                                  (enums.Operation.list_groups,))
+}
+
+# the date filters bounding the windows of `Client.scan_replays` for each sort key, along with
+# the field of a replay summary holding the date filtered on
+_SCAN_FIELDS = {
+    enums.ReplaySortBy.upload_date: ("created_after", "created_before", "created"),
+    enums.ReplaySortBy.replay_date: ("replay_date_after", "replay_date_before", "date")
+}
+
+# the seconds by which adjacent windows of `Client.scan_replays` overlap, so that a replay dated
+# on a boundary is listed whatever the precision (or inclusiveness) of the API's date filters
+_SCAN_OVERLAP = 1.0
 
 
 def _print_error(response: requests.Response) -> None:
@@ -60,11 +140,143 @@ def _print_error(response: requests.Response) -> None:
               f"{error_description}for url: {response.url}\033[0m")
 
 
-def p(v):
-    """Return `v` if `v` is `...` or a `str`, else return `v.value`.
-    
+def _bind_json(response: requests.Response, decoder: Callable[[bytes], Any]) -> None:
+    """Replace `response.json` with a version that decodes the body through `decoder` the first
+    time it is called, and returns the same (decoded) object on every later call. Calls with
+    keyword arguments are passed on to `requests.Response.json`.
+
+    """
+    fallback = response.json
+    decoded = []
+
+    def decode(**kwargs) -> Any:
+        if kwargs:
+            return fallback(**kwargs)
+        if not decoded:
+            try:
+                decoded.append(decoder(response.content))
+            except ValueError as exc:
+                raise requests.JSONDecodeError(str(exc), response.text, 0) from exc
+        return decoded[0]
+
+    response.json = decode
+
+
+def _stream_to(response: requests.Response, file: BinaryIO, buffer_size: int) -> None:
+    """Stream the body of `response` into `file` through a single reusable buffer.
+
+    """
+    response.raw.decode_content = True
+    buffer = memoryview(bytearray(buffer_size))
+    read = response.raw.readinto(buffer)
+    while read:
+        file.write(buffer[:read])
+        read = response.raw.readinto(buffer)
+
+
+class _MultipartFile:
+    """A `multipart/form-data` request body that contains a single file field. The file is read
+    lazily (block by block) as the body is sent, so it never has to be loaded into memory as a
+    whole.
+
+    """
+    def __init__(self, field: str, file: BinaryIO) -> None:
+        boundary = os.urandom(16).hex()
+        filename = os.path.basename(getattr(file, "name", field))
+        head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; "
+                f"filename=\"{filename}\"\r\nContent-Type: application/octet-stream\r\n\r\n")
+        tail = f"\r\n--{boundary}--\r\n"
+        start = file.tell()
+        size = file.seek(0, io.SEEK_END) - start
+        file.seek(start)
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._head = head.encode()
+        self._tail = tail.encode()
+        self._file = file
+        self._start = start
+        self._length = len(head) + size + len(tail)
+        self.seek(0)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Rewind the body to its start (e.g. to send it again). Seeking anywhere else is not
+        supported.
+
+        """
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("multipart bodies can only be rewound to the start")
+        self._file.seek(self._start)
+        self._parts = collections.deque([io.BytesIO(self._head), self._file,
+                                         io.BytesIO(self._tail)])
+        self._position = 0
+        return 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.popleft()
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        data = b"".join(chunks)
+        self._position += len(data)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunk = self.read(65536)
+        while chunk:
+            yield chunk
+            chunk = self.read(65536)
+
+
+def _processed(operation: enums.Operation, response: requests.Response) -> bool:
+    """Return `False` if `response` is that of a replay which has not finished processing (and
+    can therefore still change), else `True`.
+
     """
-    return v if v == ... or isinstance(v, str) else v.value
+    if operation is not enums.Operation.get_replay:
+        return True
+    try:
+        return response.json().get("status") == "ok"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _request_event(operation: enums.Operation, method: str, url: str, attempt: int,
+                   response: Optional[requests.Response], exception: Optional[BaseException],
+                   latency: float, rate_limit_wait: float,
+                   kwargs: Dict[str, Any]) -> metrics.RequestEvent:
+    """Describe an attempt at a request as a `metrics.RequestEvent`.
+
+    """
+    bytes_sent = bytes_received = 0
+    if response is not None:
+        body = response.request.body if response.request is not None else None
+        bytes_sent = len(body) if body is not None and hasattr(body, "__len__") else 0
+        if kwargs.get("stream"):
+            bytes_received = int(response.headers.get("Content-Length") or 0)
+        else:
+            bytes_received = len(response.content or b"")
+    return metrics.RequestEvent(operation, method, url, attempt,
+                                None if response is None else response.status_code, exception,
+                                latency, rate_limit_wait, bytes_sent, bytes_received)
+
+
+def _model(model: type, response: requests.Response) -> Any:
+    """Build `model` from the JSON body of `response`, raising `requests.HTTPError` if the request
+    resulted in an HTTP error.
+
+    """
+    response.raise_for_status()
+    return model(response.json())
 
 
 class Client:
@@ -73,7 +285,18 @@ class Client:
     """
     def __init__(self, token: str, auto_rate_limit: bool = True,
                  patreon_tier: Union[str, enums.PatreonTier] = enums.PatreonTier.none,
-                 rate_limit_safe_start: bool = False) -> None:
+                 rate_limit_safe_start: bool = False, *, pool_connections: int = 10,
+                 pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True,
+                 cache: Optional[Cache] = None,
+                 cache_ttls: Dict[enums.Operation, float] = ...,
+                 conditional_requests: Union[bool, Cache] = False,
+                 json_decoder: Callable[[bytes], Any] = ...,
+                 adaptive_rate_limit: bool = True,
+                 rate_limit_state: Union[str, os.PathLike] = ...,
+                 rate_limit_backend: ratelimit.RateLimitBackend = ...,
+                 retry: Optional[RetryPolicy] = None,
+                 hooks: Iterable[Callable[[metrics.RequestEvent], None]] = (),
+                 api_url: str = ..., transport: Transport = ...) -> None:
         """
         Arguments
         ---------
@@ -86,21 +309,534 @@ class Client:
             The token-holder's Ballchasing Patreon tier.
         rate_limit_safe_start : bool, optional, default=False
             If `True`, the rate limiter will start out as fully maxed out on API calls.
+        pool_connections : int, optional, default=10
+            The number of per-host connection pools kept by the client's session.
+        pool_maxsize : int, optional, default=10
+            The maximum number of connections kept open to a single host.
+        pool_block : bool, optional, default=False
+            If `True`, requests will block until a pooled connection is free instead of opening
+            a new (non-pooled) connection once `pool_maxsize` connections are in use.
+        keep_alive : bool, optional, default=True
+            If `False`, every request is sent with `Connection: close`, so connections are not
+            reused between requests.
+        cache : Cache, optional, default=None
+            If defined, successful responses of `get_replay`, `get_group`, `list_replays`,
+            `list_groups` and `maps` are stored in (and served from) the given cache. Cache hits
+            do not count against the rate limit, and writes (e.g. `patch_replay`) invalidate the
+            affected entries. Replays that have not finished processing are not cached.
+        cache_ttls : dict of Operation to float, optional
+            The number of seconds the responses of each operation are cached for, overriding the
+            defaults (one day for `get_replay`, five minutes for `get_group`, one minute for
+            `list_replays` and `list_groups`, and one hour for `maps`). A TTL of `0` disables
+            caching for that operation.
+        conditional_requests : bool or Cache, optional, default=False
+            If `True` (or a cache in which to keep the validators, e.g. a `SQLiteCache` to keep
+            them across restarts), the `ETag` and `Last-Modified` validators of `GET` responses
+            are stored, and sent back (as `If-None-Match` and `If-Modified-Since`) when the same
+            request is repeated. If the server responds with `304 Not Modified`, the previously
+            stored response is returned with its `not_modified` attribute set to `True`.
+        json_decoder : callable, optional
+            The function used to decode JSON bodies (e.g. `orjson.loads`), which is given the
+            body as `bytes`. Defaults to `orjson.loads` or `ujson.loads` if either is installed,
+            else `json.loads`. The `json` method of returned responses decodes the body at most
+            once and returns the same object on every call.
+        adaptive_rate_limit : bool, optional, default=True
+            If `True` (and `auto_rate_limit` is `True`), the rate limiters also adapt to the
+            server's feedback (see `ratelimit.AdaptiveRateLimiter`): after a `429 Too Many
+            Requests` response, calls wait out its `Retry-After` period and the operation's rate
+            is temporarily lowered, then ramped back up as calls succeed.
+        rate_limit_state : str or PathLike, optional
+            If defined (and `auto_rate_limit` is `True`), the path of a file the rate limiters'
+            recent calls are saved to when the client is closed, garbage collected, or the
+            process exits, and restored from when a client is created with the same token. A
+            restarted process then resumes with exactly the remaining quota, and
+            `rate_limit_safe_start` only applies to operations without saved state.
+        rate_limit_backend : ratelimit.RateLimitBackend, optional
+            If defined (and `auto_rate_limit` is `True`), call slots are reserved in the given
+            shared backend (e.g. a `SQLiteRateLimitBackend`) instead of in memory, so that every
+            client using the same backend and token, in any process, stays within the Patreon
+            tier's limits together. `rate_limit_safe_start` is then ignored.
+        retry : RetryPolicy, optional, default=None
+            If defined, requests that fail with one of the policy's status codes or exceptions
+            are retried (after an exponential, jittered backoff) according to the policy. Every
+            retry waits on the rate limiter like any other request, and only the final response
+            has its error printed.
+        hooks : iterable of callable, optional
+            Functions called with a `metrics.RequestEvent` (describing the operation, status
+            code, latency, bytes sent and received, time spent waiting on the rate limiter, and
+            attempt number) after every attempt at a request, e.g. a `Metrics` collector.
+            Responses served from the cache are not reported.
+        api_url : str, optional, default="https://ballchasing.com/api"
+            The root of every request's URL, e.g. to point the client at a local stand-in for
+            ballchasing.com (such as the one in `benchmarks/mock_server.py`).
+        transport : Transport, optional
+            The transport every request is sent through, e.g. a `RecordingTransport` to record
+            the client's traffic to a cassette, or a `PlaybackTransport` to serve it offline.
+            Defaults to a `SessionTransport` built from `pool_connections`, `pool_maxsize`,
+            `pool_block` and `keep_alive`, which are ignored when a transport is given.
 
         """
 
         self._token = token
+        # built once here rather than for every request
+        self._api_url = _API_URL if api_url == ... else api_url.rstrip("/")
+        self._headers = {"Authorization": token}
+        if transport == ...:
+            transport = SessionTransport(pool_connections=pool_connections,
+                                         pool_maxsize=pool_maxsize, pool_block=pool_block,
+                                         keep_alive=keep_alive)
+        self._transport = transport
+
         if isinstance(patreon_tier, str):
             try:
                 patreon_tier = enums.PatreonTier[patreon_tier]
             except KeyError as exc:
                 raise ValueError(f"{patreon_tier!r} is not a valid PatreonTier") from exc
             
+        self._patreon_tier = patreon_tier
+        self._cache_namespace = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self._rate_limiters = {}
         if auto_rate_limit:
+            limiter_type = (ratelimit.AdaptiveRateLimiter if adaptive_rate_limit
+                            else ratelimit.RateLimiter)
             for k, v in patreon_tier.value.items():
-                rlim.set_rate_limiter(getattr(self, k.name),
-                                      rlim.RateLimiter(*v, safestart=rate_limit_safe_start))
-    
+                self._rate_limiters[k] = limiter_type(
+                    *v, safestart=rate_limit_safe_start, backend=rate_limit_backend,
+                    key=f"{self._cache_namespace} {k.value}")
+        self._schedulers = {k: ratelimit.PriorityScheduler(v)
+                            for k, v in self._rate_limiters.items()}
+
+        self._save_rate_limit_state = None
+        if self._rate_limiters and rate_limit_state != ...:
+            saved = ratelimit.load_state(rate_limit_state, self._cache_namespace)
+            for operation, rate_limiter in self._rate_limiters.items():
+                if operation.value in saved:
+                    rate_limiter.restore(saved[operation.value])
+            self._save_rate_limit_state = weakref.finalize(
+                self, ratelimit.save_state, rate_limit_state, self._cache_namespace,
+                {k.value: v for k, v in self._rate_limiters.items()})
+
+        self._cache = cache
+        self._cache_ttls = {**_CACHE_TTLS, **(cache_ttls if cache_ttls != ... else {})}
+        if conditional_requests is True:
+            conditional_requests = MemoryCache()
+        self._validators = conditional_requests or None
+        self._json_decoder = _json_loads if json_decoder == ... else json_decoder
+        self._retry = retry
+        self._hooks = tuple(hooks)
+
+    def close(self) -> None:
+        """Close the client's transport (along with all of its pooled connections), and save the
+        rate limiters' state (if `rate_limit_state` was given).
+
+        """
+        self._transport.close()
+        if self._save_rate_limit_state:
+            self._save_rate_limit_state()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def priority(self, priority: Union[str, enums.Priority]) -> Iterator[None]:
+        """Make every request sent from within the `with` block (in the current thread or
+        asyncio task) at the given priority. When requests of several priorities are waiting on
+        the same rate limiter, most call slots go to the higher priority, without starving the
+        lower ones. Requests are made at `normal` priority by default, and the requests of
+        `get_replays`, `download_replays` and `upload_replays` at `bulk` priority.
+
+        Parameters
+        ----------
+        priority : Priority or str
+            The priority (`interactive`, `normal` or `bulk`).
+
+        Raises
+        ------
+        ValueError
+            If `priority` is not a valid priority.
+
+        """
+        token = _priority.set(enums.Priority(priority))
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def _cache_key(self, operation: enums.Operation, url: str = "") -> str:
+        """Get the cache key of `operation` for `url` (with its query normalized). Keys are
+        namespaced by token, so a cache shared between clients never serves one token's private
+        replays to another.
+
+        """
+        if url:
+            split_url = urllib.parse.urlsplit(url)
+            query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(split_url.query)))
+            url = urllib.parse.urlunsplit(split_url._replace(query=query))
+        return f"{self._cache_namespace} {operation.value} {url}"
+
+    def _request(self, operation: enums.Operation, method: str, url: str,
+                 headers: Dict[str, str], *, print_error: bool, **kwargs) -> requests.Response:
+        """Send a request for `operation` through the client's session (waiting on the
+        operation's rate limiter, if any), printing the error (if any) if `print_error` is
+        `True`. Cacheable requests are served from the client's cache when possible.
+
+        """
+        ttl = self._cache_ttls.get(operation) if self._cache is not None else None
+        cacheable = bool(ttl) and method == "GET" and not kwargs.get("stream")
+        conditional = (self._validators is not None and method == "GET"
+                       and not kwargs.get("stream"))
+        if cacheable or conditional:
+            key = self._cache_key(operation, url)
+        if cacheable:
+            cached = self._cache.get(key)
+            if cached is not None:
+                response = cached.to_response()
+                response.not_modified = False
+                _bind_json(response, self._json_decoder)
+                return response
+
+        validated = self._validators.get(key) if conditional else None
+        if validated is not None:
+            headers = dict(headers)
+            if "ETag" in validated.headers:
+                headers["If-None-Match"] = validated.headers["ETag"]
+            if "Last-Modified" in validated.headers:
+                headers["If-Modified-Since"] = validated.headers["Last-Modified"]
+
+        response = self._send(operation, method, url, headers, kwargs)
+        _bind_json(response, self._json_decoder)
+        if print_error:
+            _print_error(response)
+
+        response.from_cache = response.not_modified = False
+        if validated is not None and response.status_code == 304:
+            response = validated.to_response()
+            response.not_modified = True
+            _bind_json(response, self._json_decoder)
+        elif (conditional and response.status_code == 200
+              and ("ETag" in response.headers or "Last-Modified" in response.headers)):
+            self._validators.set(key, CachedResponse.from_response(response), math.inf)
+
+        if cacheable and response.status_code == 200 and _processed(operation, response):
+            self._cache.set(key, CachedResponse.from_response(response), ttl)
+        elif self._cache is not None and operation in _CACHE_INVALIDATIONS:
+            details, lists = _CACHE_INVALIDATIONS[operation]
+            for detail in details:
+                self._cache.delete(self._cache_key(detail, url))
+            for list_operation in lists:
+                self._cache.delete_prefix(self._cache_key(list_operation))
+        return response
+
+    def _send(self, operation: enums.Operation, method: str, url: str, headers: Dict[str, str],
+              kwargs: Dict[str, Any]) -> requests.Response:
+        """Send a request for `operation` through the client's transport, waiting on the
+        operation's rate limiter (if any, in the order given by the priority set through
+        `priority`) before every attempt, and retrying according to the client's retry policy
+        (if any).
+
+        """
+        rate_limiter = self._rate_limiters.get(operation)
+        scheduler = self._schedulers.get(operation)
+        priority = _priority.get() or enums.Priority.normal
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > 1 and hasattr(kwargs.get("data"), "seek"):
+                kwargs["data"].seek(0)
+            response = error = None
+            waited = 0.0
+            start = time.perf_counter()
+            try:
+                if scheduler:
+                    scheduler.acquire(priority)
+                    waited = time.perf_counter() - start
+                    start = time.perf_counter()
+                response = self._transport.request(method, url, headers, **kwargs)
+            except Exception as exc:
+                error = exc
+            if self._hooks:
+                event = _request_event(operation, method, url, attempt, response, error,
+                                       time.perf_counter() - start, waited, kwargs)
+                for hook in self._hooks:
+                    hook(event)
+            if error is not None:
+                if not (self._retry and isinstance(error, self._retry.exceptions)
+                        and self._retry.retries(method, attempt)):
+                    raise error
+                time.sleep(self._retry.backoff(attempt - 1))
+                continue
+            if rate_limiter:
+                rate_limiter.feedback(response.status_code, response.headers)
+            if not (self._retry and response.status_code in self._retry.statuses
+                    and self._retry.retries(method, attempt)):
+                return response
+            retry_after = ratelimit.seconds_until(response.headers.get("Retry-After"),
+                                                   time.time())
+            response.close()
+            time.sleep(self._retry.backoff(attempt - 1, retry_after))
+
+    def _paginate(self, list_method: Callable[..., requests.Response], limit: int,
+                  prefetch: bool, filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Walk the continuation chain of `list_method` (`list_replays` or `list_groups`),
+        yielding each listed item. If `prefetch` is `True`, the next page is requested in a
+        background thread while the current page is being consumed; at most two pages are held
+        in memory at once.
+
+        """
+        if limit != ... and limit < 1:
+            return
+        filters.setdefault("count", 200 if limit == ... else min(limit, 200))
+        # prefetched pages are requested from another thread, which does not inherit the
+        # caller's priority
+        priority = _priority.get()
+
+        def fetch(next: str) -> Dict[str, Any]:
+            token = _priority.set(priority)
+            try:
+                response = list_method(next=next, **filters)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                _priority.reset(token)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            remaining = limit
+            page = fetch(...)
+            while True:
+                next = page.get("next")
+                items = page.get("list") or []
+                if remaining != ...:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                more = bool(next and items and (remaining == ... or remaining > 0))
+                future = executor.submit(fetch, next) if more and executor else None
+                page = None
+                yield from items
+                if not more:
+                    return
+                page = future.result() if future else fetch(next)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def _default_concurrency(self, operation: enums.Operation) -> int:
+        """Get the default number of concurrent requests for `operation`, which is the number of
+        calls per second allowed by the client's Patreon tier (or 8 if the tier does not limit
+        the operation).
+
+        """
+        rates = [1 / c.rate for c in self._patreon_tier.value.get(operation, ())
+                 if isinstance(c, rlim.Rate)]
+        return max(1, math.ceil(min(rates))) if rates else 8
+
+    def _fan_out(self, method: Callable[..., Any], keys: Iterable[Any], max_concurrency: int,
+                 ordered: bool, kwargs: Dict[str, Any]) -> Iterator[Tuple[Any, Any]]:
+        """Call `method(key, **kwargs)` for every key from a pool of `max_concurrency` threads,
+        yielding `(key, result)` pairs as they complete (or in the order of `keys` if `ordered`
+        is `True`). Calls are made at `bulk` priority unless another priority was set through
+        `priority`. Exceptions raised by `method` are yielded in place of its result. At most
+        `2 * max_concurrency` calls are queued at once, so `keys` may be a lazy iterable of any
+        length.
+
+        """
+        if max_concurrency < 1:
+            raise ValueError("\"max_concurrency\" must be at least 1")
+
+        priority = _priority.get() or enums.Priority.bulk
+
+        def call(key: Any) -> Any:
+            token = _priority.set(priority)
+            try:
+                return method(key, **kwargs)
+            except Exception as exc:
+                return exc
+            finally:
+                _priority.reset(token)
+
+        keys = iter(keys)
+        backlog = 2 * max_concurrency
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+        pending = collections.OrderedDict()
+        try:
+            for key in itertools.islice(keys, backlog):
+                pending[executor.submit(call, key)] = key
+            while pending:
+                if ordered:
+                    done = [next(iter(pending))]
+                else:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    yield key, future.result()
+                for key in itertools.islice(keys, backlog - len(pending)):
+                    pending[executor.submit(call, key)] = key
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _scan(self, by: enums.ReplaySortBy, start: float, end: float, windows: int,
+              max_concurrency: int, split_threshold: int, limit: int,
+              filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Walk the continuation chains of `windows` equal date windows of `[start, end]` from a
+        pool of `max_concurrency` threads, yielding each listed replay as its page arrives.
+
+        The first page of every window is sorted oldest first, and tells how many replays the
+        window holds; if more than `split_threshold` are left after it, the rest of the window
+        (from the last replay listed) is split into as many windows as needed instead of being
+        walked page by page. Adjacent windows overlap by `_SCAN_OVERLAP` seconds, and the
+        replays listed that close to a boundary are de-duplicated.
+
+        """
+        after_key, before_key, field = _SCAN_FIELDS[by]
+        priority = _priority.get() or enums.Priority.bulk
+
+        def fetch(low: float, high: float, next: str) -> Dict[str, Any]:
+            bounds = {after_key: models._rfc3339(max(start, low - _SCAN_OVERLAP)),
+                      before_key: models._rfc3339(min(end, high + _SCAN_OVERLAP))}
+            token = _priority.set(priority)
+            try:
+                response = self.list_replays(next=next, **bounds, **filters)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                _priority.reset(token)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+        pending = {}
+
+        def split(low: float, high: float, pieces: int) -> None:
+            width = (high - low) / pieces
+            for i in range(pieces):
+                window = (low + i * width, high if i == pieces - 1 else low + (i + 1) * width)
+                pending[executor.submit(fetch, *window, ...)] = window + (True,)
+
+        # the IDs of the replays listed near a boundary (which are the only ones that can be
+        # listed twice)
+        seen = set()
+        remaining = limit
+        try:
+            split(start, end, windows)
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    low, high, first = pending.pop(future)
+                    page = future.result()
+                    items = page.get("list") or []
+                    next = page.get("next")
+                    edges = [low, high]
+                    if first and next and items and isinstance(page.get("count"), int):
+                        last = models._timestamp(items[-1].get(field)) or low
+                        pieces = min(max_concurrency,
+                                     math.ceil((page["count"] - len(items)) / split_threshold),
+                                     int((high - last) / (4 * _SCAN_OVERLAP)))
+                        if pieces > 1:
+                            split(last, high, pieces)
+                            edges.append(last)
+                            next = None
+                    if next and items:
+                        pending[executor.submit(fetch, low, high, next)] = (low, high, False)
+                    for item in items:
+                        date = models._timestamp(item.get(field))
+                        if date is None or any(abs(date - edge) <= 2 * _SCAN_OVERLAP
+                                               for edge in edges):
+                            if item.get("id") in seen:
+                                continue
+                            seen.add(item.get("id"))
+                        yield item
+                        if remaining != ...:
+                            remaining -= 1
+                            if remaining < 1:
+                                return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _crawl(self, tree: GroupTree, depth: int, include_replays: bool,
+               include_replay_details: bool, max_concurrency: int,
+               print_error: bool) -> Iterator[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """Crawl the group tree below `tree.root` breadth-first, from a pool of `max_concurrency`
+        threads, adding each group and replay to `tree` and yielding them as they arrive (see
+        `GroupCrawl`).
+
+        Every request is a task `(kind, key, argument)`: `("group", <group ID>, None)` gets the
+        root, `("groups", <group ID>, <next>)` and `("replays", <group ID>, <next>)` get a page
+        of its subgroups and replays, and `("replay", <replay ID>, <group ID>)` gets the details
+        of a replay. Tasks wait in a FIFO queue (continuation pages go first) until a thread is
+        free, so groups are visited level by level.
+
+        """
+        priority = _priority.get() or enums.Priority.bulk
+
+        def call(kind: str, key: str, argument: Any) -> Dict[str, Any]:
+            token = _priority.set(priority)
+            try:
+                if kind == "group":
+                    response = self.get_group(key, print_error=print_error)
+                elif kind == "replay":
+                    response = self.get_replay(key, print_error=print_error)
+                else:
+                    list_method = self.list_groups if kind == "groups" else self.list_replays
+                    response = list_method(next=argument, group=key, count=200,
+                                           print_error=print_error)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                _priority.reset(token)
+
+        def visit(group_id: str) -> None:
+            if depth == ... or tree.depth(group_id) < depth:
+                queue.append(("groups", group_id, ...))
+            if include_replays or include_replay_details:
+                queue.append(("replays", group_id, ...))
+
+        queue = collections.deque([("group", tree.root, None)])
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+        pending = {}
+        try:
+            while queue or pending:
+                while queue and len(pending) < max_concurrency:
+                    task = queue.popleft()
+                    pending[executor.submit(call, *task)] = task
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    kind, key, argument = pending.pop(future)
+                    data = future.result()
+                    if kind == "group":
+                        tree._add_group(data, None)
+                        yield "group", data, None
+                        visit(key)
+                        continue
+                    if kind == "replay":
+                        tree._add_replay(data)
+                        yield "replay", data, argument
+                        continue
+                    if data.get("next"):
+                        queue.appendleft((kind, key, data["next"]))
+                    for item in data.get("list") or []:
+                        if kind == "groups":
+                            if tree._add_group(item, key):
+                                yield "group", item, key
+                                visit(item["id"])
+                        elif tree._link_replay(item["id"], key):
+                            if include_replay_details:
+                                queue.append(("replay", item["id"], key))
+                            else:
+                                tree._add_replay(item)
+                                yield "replay", item, key
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
     def ping(self, *, print_error: bool = True) -> requests.Response:
         """Ping the https://ballchasing.com servers.
 
@@ -117,18 +853,11 @@ class Client:
         
         """
         # prepare URL
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api"])
+        url = self._api_url
 
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
-        
         # make request, print error, and return response
-        response = requests.get(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.ping, "GET", url,
+                             self._headers, print_error=print_error)
 
     def upload_replay(self, file: io.BufferedReader,
                       visibility: Union[str, enums.Visibility], *, group: str  = ...,
@@ -154,22 +883,106 @@ class Client:
         
         """
         # prepare URL
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "v2", "upload"])
-        prepped_url.components.queries["visibility", "group"] = [p(visibility), group]
+        url = _with_query(f"{self._api_url}/v2/upload",
+                          (("visibility", p(visibility)), ("group", group)))
+
+        # prepare body
+        body = _MultipartFile("file", file)
 
         # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        headers = {**self._headers, "Content-Type": body.content_type}
         
         # make request, print error, and return response
-        response = requests.post(prepped_url.build(query_check=...),
-                                 headers=prepped_headers.format_dict(), files={"file":file})
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.upload_replay, "POST", url, headers,
+                             print_error=print_error, data=body)
+
+    def upload_replays(self, replays: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]],
+                       visibility: Union[str, enums.Visibility], *, group: str = ...,
+                       max_concurrency: int = 2,
+                       rate_criteria: Iterable[Union[rlim.Rate, rlim.Limit]] = (rlim.Rate(2),),
+                       manifest: Union[str, os.PathLike] = ..., print_error: bool = True
+                       ) -> Dict[str, Union[str, requests.Response, Exception]]:
+        """Upload many replay files at once, keeping up to `max_concurrency` uploads in flight.
+        Each file is streamed from disk rather than loaded into memory, and replays that have
+        already been uploaded (i.e. the server responds with a duplicate replay error) are treated
+        as successfully uploaded.
+
+        Parameters
+        ----------
+        replays : str or PathLike or iterable of (str or PathLike)
+            A directory (in which case every `.replay` file in it is uploaded), a glob pattern
+            (e.g. `"event/**/*.replay"`), or the paths of the replay files.
+        visibility : str or Visibility
+            The visibility of the replays once uploaded.
+        group : str, optional
+            The group to assign the replays to once they are uploaded.
+        max_concurrency : int, optional, default=2
+            The maximum number of uploads in flight at once.
+        rate_criteria : iterable of (rlim.Rate or rlim.Limit), optional, default=(Rate(2),)
+            The rate limit criteria the uploads of this batch are held to. Ballchasing does not
+            publish upload limits per Patreon tier, so this defaults to 2 uploads per second.
+        manifest : str or PathLike, optional
+            A file in which each successful upload is recorded as soon as it completes. Files that
+            are already recorded in the manifest are not uploaded again, so an interrupted batch
+            can be resumed by calling this method again with the same manifest.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Returns
+        -------
+        dict of str to (str or requests.Response or Exception)
+            Each file path mapped to the ID of its replay if it was uploaded successfully (or was
+            recorded in `manifest`), else to the `requests.Response` object returned from the
+            failed request (or the raised exception if the request could not be made at all).
+
+        """
+        if isinstance(replays, (str, os.PathLike)):
+            replays = os.fspath(replays)
+            if os.path.isdir(replays):
+                replays = os.path.join(replays, "*.replay")
+            paths = sorted(glob.glob(replays, recursive=True))
+        else:
+            paths = [os.fspath(path) for path in replays]
+
+        recorded = {}
+        if manifest != ...:
+            manifest = os.fspath(manifest)
+            if os.path.exists(manifest):
+                with open(manifest, "r", encoding="utf-8") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        recorded[entry["path"]] = entry["id"]
+        manifest_lock = threading.Lock()
+        limiter = ratelimit.RateLimiter(*rate_criteria)
+
+        def upload(path: str) -> Union[str, requests.Response]:
+            with open(path, "rb") as file, limiter:
+                response = self.upload_replay(file, visibility, group=group, print_error=False)
+            replay_id = None
+            if response.status_code in (200, 201, 409):
+                try:
+                    replay_id = response.json()["id"]
+                except (ValueError, KeyError, TypeError):
+                    pass
+            if replay_id is None:
+                if print_error:
+                    _print_error(response)
+                return response
+            if manifest != ...:
+                with manifest_lock, open(manifest, "a", encoding="utf-8") as file:
+                    file.write(json.dumps({"path": path, "id": replay_id}) + "\n")
+            return replay_id
+
+        results = {path: recorded[path] for path in paths if path in recorded}
+        pending = [path for path in paths if path not in recorded]
+        for path, result in self._fan_out(upload, pending, max_concurrency, False, {}):
+            results[path] = result
+        return results
 
-    @rlim.placeholder
     def list_replays(self, *, next: str = ..., title: str = ..., player_names: Iterable[str] = ...,
                      player_ids: Iterable[Tuple[Union[enums.Platform, str], Union[int, str]]] = ...,
                      playlists: Iterable[Union[enums.Playlist, str]] = ...,
@@ -260,77 +1073,162 @@ class Client:
             200.
         
         """
-        if count != ... and 1 > count > 200:
-            raise ValueError("\"count\" must be between 1 and 200")
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
-
         # prepare url
-        if next != ...:
-            try:
-                next = urllib.parse.unquote(re.search(r"(?<=after=)[^\&]*", next).group())
-            except Exception:
-                raise ValueError("'next' string has an unknown structure")
-
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing",
-                                   top_level_domain="com", path_segments=["api", "replays"])
-        prepped_url.components.queries[
-            "after",
-            "title",
-            "season",
-            "match-result",
-            "min-rank",
-            "max-rank",
-            "pro",
-            "uploader",
-            "group",
-            "map",
-            "created-before",
-            "created-after",
-            "replay-date-before",
-            "replay-date-after",
-            "count",
-            "sort-by",
-            "sort-dir"
-        ] = [
-            next,
-            title,
-            p(season),
-            p(match_result),
-            p(min_rank),
-            p(max_rank),
-            str(pro).lower() if isinstance(pro, bool) else ...,
-            uploader,
-            group,
-            p(map),
-            created_before,
-            created_after,
-            replay_date_before,
-            replay_date_after,
-            count,
-            p(sort_by),
-            p(sort_dir)
-        ]
-        if player_names != ...:
-            for name in player_names:
-                prepped_url.components.queries["player-name"] = name
-        if player_ids != ...:
-            for platform, id in player_ids:
-                prepped_url.components.queries["player-id"] = (f"{p(platform)}:{id}")
-        if playlists != ...:
-            for playlist in playlists:
-                prepped_url.components.queries["playlist"] = p(playlist)
-        url = prepped_url.build(query_check=...)
+        url = _list_replays_url(self._api_url, next=next, title=title, player_names=player_names,
+                                player_ids=player_ids, playlists=playlists, season=season,
+                                match_result=match_result, min_rank=min_rank, max_rank=max_rank,
+                                pro=pro, uploader=uploader, group=group, map=map,
+                                created_before=created_before, created_after=created_after,
+                                replay_date_before=replay_date_before,
+                                replay_date_after=replay_date_after, count=count,
+                                sort_by=sort_by, sort_dir=sort_dir)
 
         # make request, print error, and return response
-        response = requests.get(url, headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.list_replays, "GET", url,
+                             self._headers, print_error=print_error)
     
-    @rlim.placeholder
+    def list_replays_page(self, *, print_error: bool = True,
+                          **filters: Any) -> models.ReplayPage:
+        """Like `list_replays`, but returns the page as a `models.ReplayPage` instead of the raw
+        response.
+
+        Parameters
+        ----------
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if the request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+        **filters : keywords
+            Any of the filters accepted by `list_replays`.
+
+        Returns
+        -------
+        models.ReplayPage
+            The page of replays.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the request resulted in an HTTP error.
+
+        """
+        return _model(models.ReplayPage, self.list_replays(print_error=print_error, **filters))
+
+    def iter_replays(self, *, limit: int = ..., prefetch: bool = True, print_error: bool = True,
+                     **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over every replay matching the given filters, following the
+        continuation chain of `list_replays` page by page.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The maximum number of replays to yield. If undefined, every matching replay is
+            yielded.
+        prefetch : bool, optional, default=True
+            If `True`, the next page is requested in the background while the current page is
+            being consumed.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+        **filters : keywords
+            Any of the filters accepted by `list_replays` (except `next`). If `count` is
+            undefined, pages of 200 replays (or `limit` replays, if fewer) are requested.
+
+        Yields
+        ------
+        dict
+            Each replay summary (an item of `<response from list_replays>.json()["list"]`).
+
+        Raises
+        ------
+        requests.HTTPError
+            If a page request resulted in an HTTP error.
+
+        """
+        return self._paginate(self.list_replays, limit, prefetch,
+                              {**filters, "print_error": print_error})
+
+    def scan_replays(self, *, by: Union[str, enums.ReplaySortBy] = enums.ReplaySortBy.upload_date,
+                     windows: int = ..., max_concurrency: int = ..., split_threshold: int = 1000,
+                     limit: int = ..., print_error: bool = True,
+                     **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Iterate over every replay matching the given filters, like `iter_replays`, but split
+        the date range of the query into disjoint windows whose continuation chains are walked
+        in parallel, so that a large scan is bounded by the rate limit rather than by the
+        round-trip time of each page.
+
+        Windows that turn out to hold more than `split_threshold` replays are split further
+        once their first page arrives. Replays are yielded as their pages arrive (so not in any
+        particular order), and each replay is yielded once, even if it lies on a window
+        boundary.
+
+        Parameters
+        ----------
+        by : str or ReplaySortBy, optional, default=ReplaySortBy.upload_date
+            The date the windows are split on: the upload date (bounded by `created_after` and
+            `created_before`) or the replay date (bounded by `replay_date_after` and
+            `replay_date_before`).
+        windows : int, optional
+            The number of windows the date range is initially split into. Defaults to
+            `max_concurrency`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight at once. Defaults to the number of
+            `list_replays` calls per second allowed by the client's Patreon tier.
+        split_threshold : int, optional, default=1000
+            The number of replays left in a window after its first page above which the rest of
+            the window is split into smaller windows.
+        limit : int, optional
+            The maximum number of replays to yield. If undefined, every matching replay is
+            yielded.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+        **filters : keywords
+            Any of the filters accepted by `list_replays` (except `next`, `sort_by` and
+            `sort_dir`). The lower bound of the date chosen with `by` (e.g. `created_after`) is
+            required; its upper bound defaults to now. If `count` is undefined, pages of 200
+            replays are requested.
+
+        Yields
+        ------
+        dict
+            Each replay summary (an item of `<response from list_replays>.json()["list"]`).
+
+        Raises
+        ------
+        ValueError
+            If the lower bound of the date is undefined, the date range is empty, a reserved
+            filter is given, or `windows`, `max_concurrency` or `split_threshold` is less than
+            1.
+        requests.HTTPError
+            If a page request resulted in an HTTP error.
+
+        """
+        by = enums.ReplaySortBy(p(by))
+        after_key, before_key, _ = _SCAN_FIELDS[by]
+        for name in ("next", "sort_by", "sort_dir"):
+            if name in filters:
+                raise ValueError(f"\"{name}\" cannot be used with scan_replays")
+        if filters.get(after_key, ...) == ...:
+            raise ValueError(f"\"{after_key}\" is required to scan by {by.value}")
+        start = models._timestamp(filters.pop(after_key))
+        before = filters.pop(before_key, ...)
+        end = time.time() if before == ... else models._timestamp(before)
+        if end <= start:
+            raise ValueError(f"\"{before_key}\" must be later than \"{after_key}\"")
+        if max_concurrency == ...:
+            max_concurrency = self._default_concurrency(enums.Operation.list_replays)
+        if windows == ...:
+            windows = max_concurrency
+        if min(windows, max_concurrency, split_threshold) < 1:
+            raise ValueError("\"windows\", \"max_concurrency\" and \"split_threshold\" must be "
+                             "at least 1")
+        if limit != ... and limit < 1:
+            return iter(())
+        filters.setdefault("count", 200)
+        filters.update(sort_by=by, sort_dir=enums.SortDirection.asc, print_error=print_error)
+        return self._scan(by, start, end, windows, max_concurrency, split_threshold, limit,
+                          filters)
+
     def get_replay(self, replay_id: str, *, print_error: bool = True) -> requests.Response:
         """Get more in-depth information for a specific replay.
 
@@ -349,20 +1247,78 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "replays", replay_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/replays/{replay_id}"
 
         # make request, print error, and return response
-        response = requests.get(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.get_replay, "GET", url,
+                             self._headers, print_error=print_error)
     
-    @rlim.placeholder
+    def get_replay_model(self, replay_id: str, *, print_error: bool = True) -> models.Replay:
+        """Like `get_replay`, but returns the replay as a `models.Replay` instead of the raw
+        response.
+
+        Parameters
+        ----------
+        replay_id : str
+            The ID of the replay that is present in ballchasing's system.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if the request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Returns
+        -------
+        models.Replay
+            The replay.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the request resulted in an HTTP error.
+
+        """
+        return _model(models.Replay, self.get_replay(replay_id, print_error=print_error))
+
+    def get_replays(self, replay_ids: Iterable[str], *, max_concurrency: int = ...,
+                    ordered: bool = False, print_error: bool = True
+                    ) -> Iterator[Tuple[str, Union[requests.Response, Exception]]]:
+        """Get more in-depth information for many replays at once, keeping up to
+        `max_concurrency` requests in flight. Rate limiting (if enabled) still applies to every
+        request, so throughput is bounded by the Patreon tier rather than by round-trip latency.
+
+        Parameters
+        ----------
+        replay_ids : iterable of str
+            The IDs of the replays. This may be a lazy iterable (e.g. a generator over
+            `iter_replays`).
+        max_concurrency : int, optional
+            The maximum number of requests in flight at once. Defaults to the number of
+            `get_replay` calls per second allowed by the client's Patreon tier. Values above the
+            client's `pool_maxsize` will open connections that are not reused.
+        ordered : bool, optional, default=False
+            If `True`, results are yielded in the order of `replay_ids` instead of as they
+            complete.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Yields
+        ------
+        tuple of str and (requests.Response or Exception)
+            Each replay ID along with the `requests.Response` object returned from its HTTP
+            request. If the request could not be made at all (e.g. due to a connection error),
+            the raised exception is yielded instead, and the remaining IDs are still requested.
+
+        Raises
+        ------
+        ValueError
+            If `max_concurrency` is less than 1.
+
+        """
+        if max_concurrency == ...:
+            max_concurrency = self._default_concurrency(enums.Operation.get_replay)
+        return self._fan_out(self.get_replay, replay_ids, max_concurrency, ordered,
+                             {"print_error": print_error})
+
     def delete_replay(self, replay_id: str, *, print_error: bool = True) -> requests.Response:
         """Delete the given replay from https://ballchasing.com, so long as the
         replay is owned by the token holder.
@@ -382,20 +1338,12 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "replays", replay_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/replays/{replay_id}"
 
         # make request, print error, and return response
-        response = requests.delete(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.delete_replay, "DELETE", url,
+                             self._headers, print_error=print_error)
     
-    @rlim.placeholder
     def patch_replay(self, replay_id: str, *, title: str = ...,
                      visibility: Union[str, enums.Visibility] = ..., group: str = ...,
                      print_error: bool = True) -> requests.Response:
@@ -425,32 +1373,29 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "replays", replay_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/replays/{replay_id}"
 
         # prepare payload
         payload = httpprep.OverloadDict()
         payload["title", "visibility", "group"] = [title, p(visibility), group]
 
         # make request, print error, and return response
-        response = requests.patch(prepped_url.build(), headers=prepped_headers.format_dict(),
-                                  json=payload.remove_values(...).to_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.patch_replay, "PATCH", url,
+                             self._headers, print_error=print_error,
+                             json=payload.remove_values(...).to_dict())
 
-    @rlim.placeholder
-    def download_replay(self, replay_id: str, *, print_error: bool = True) -> requests.Response:
+    def download_replay(self, replay_id: str, *, byte_offset: int = ...,
+                        print_error: bool = True) -> requests.Response:
         """Download a replay from https://ballchasing.com.
 
         Parameters
         ----------
         replay_id : str
             The ID of the replay that is present in ballchasing's system.
+        byte_offset : int, optional
+            If defined, only the bytes from the given offset onwards are requested (through an
+            HTTP range request). If the server does not support range requests, the whole file is
+            returned with a status code of 200 instead of 206.
         print_error : bool, optional, default=True
             Prints an error message (that contains information about the error) if the request
             resulted in an HTTP error (i.e. status codes 400 through 599).
@@ -468,21 +1413,120 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "replays", replay_id, "file"])
+        url = f"{self._api_url}/replays/{replay_id}/file"
 
         # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        headers = self._headers
+        if byte_offset != ...:
+            headers = {**headers, "Range": f"bytes={byte_offset}-"}
 
         # make request, print error, and return response
-        response = requests.get(prepped_url.build(), headers=prepped_headers.format_dict(),
-                                stream=True)
-        if print_error:
-            _print_error(response)
+        return self._request(enums.Operation.download_replay, "GET", url, headers,
+                             print_error=print_error, stream=True)
+
+    def download_replay_to(self, replay_id: str, destination: Union[str, os.PathLike, BinaryIO],
+                           *, buffer_size: int = 262144,
+                           print_error: bool = True) -> Optional[requests.Response]:
+        """Download a replay from https://ballchasing.com straight to a file, streaming it
+        through a single reusable buffer.
+
+        If `destination` is a path, the replay is first written to `<destination>.part` and then
+        atomically renamed to `destination` once complete. If `destination` already exists, the
+        download is skipped entirely (without making a request); if `<destination>.part` exists,
+        the download is resumed from where it left off (if the server supports range requests).
+
+        Parameters
+        ----------
+        replay_id : str
+            The ID of the replay that is present in ballchasing's system.
+        destination : str or PathLike or BinaryIO
+            The path to save the replay to, or a writable binary file object.
+        buffer_size : int, optional, default=262144
+            The size (in bytes) of the buffer used to stream the replay.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if the request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Returns
+        -------
+        requests.Response or None
+            The (fully consumed) `requests.Response` object returned from the HTTP request, or
+            `None` if `destination` already existed. Nothing is written if the request resulted in
+            an HTTP error.
+
+        """
+        if not isinstance(destination, (str, os.PathLike)):
+            with self.download_replay(replay_id, print_error=print_error) as response:
+                if response.ok:
+                    _stream_to(response, destination, buffer_size)
+            return response
+
+        destination = os.fspath(destination)
+        if os.path.exists(destination):
+            return None
+        partial = destination + ".part"
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        with self.download_replay(replay_id, byte_offset=offset or ...,
+                                  print_error=False) as response:
+            if offset and response.status_code == 416:
+                # the partial file already contains the whole replay
+                os.replace(partial, destination)
+                return response
+            if print_error:
+                _print_error(response)
+            if not response.ok:
+                return response
+            resume = (response.status_code == 206 and response.headers.get(
+                "Content-Range", "").startswith(f"bytes {offset}-"))
+            with open(partial, "ab" if resume else "wb") as file:
+                _stream_to(response, file, buffer_size)
+        os.replace(partial, destination)
         return response
 
-    @rlim.placeholder
+    def download_replays(self, replay_ids: Iterable[str], directory: Union[str, os.PathLike], *,
+                         max_concurrency: int = ..., ordered: bool = False,
+                         print_error: bool = True
+                         ) -> Iterator[Tuple[str, Union[requests.Response, None, Exception]]]:
+        """Download many replays at once to `<directory>/<replay_id>.replay` (see
+        `download_replay_to`), keeping up to `max_concurrency` downloads in flight. Replays that
+        have already been downloaded are skipped without making a request, and interrupted
+        downloads are resumed.
+
+        Parameters
+        ----------
+        replay_ids : iterable of str
+            The IDs of the replays. This may be a lazy iterable.
+        directory : str or PathLike
+            The directory to save the replays to. It is created if it does not exist.
+        max_concurrency : int, optional
+            The maximum number of downloads in flight at once. Defaults to the number of
+            `download_replay` calls per second allowed by the client's Patreon tier.
+        ordered : bool, optional, default=False
+            If `True`, results are yielded in the order of `replay_ids` instead of as they
+            complete.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Yields
+        ------
+        tuple of str and (requests.Response or None or Exception)
+            Each replay ID along with the result of `download_replay_to` (`None` if the replay
+            was skipped), or the raised exception if the download failed.
+
+        """
+        if max_concurrency == ...:
+            max_concurrency = self._default_concurrency(enums.Operation.download_replay)
+        directory = os.fspath(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        def download(replay_id: str) -> Optional[requests.Response]:
+            return self.download_replay_to(replay_id,
+                                           os.path.join(directory, replay_id + ".replay"),
+                                           print_error=print_error)
+
+        return self._fan_out(download, replay_ids, max_concurrency, ordered, {})
+
     def create_group(self, name: str, player_identification: Union[str, enums.PlayerIdentification],
                      team_identification: Union[str, enums.TeamIdentification], *,
                      parent: str = ..., print_error: bool = True) -> requests.Response:
@@ -512,12 +1556,7 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "groups"])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/groups"
 
         # prepare payload
         payload = httpprep.OverloadDict()
@@ -527,13 +1566,10 @@ class Client:
             name, p(player_identification), p(team_identification), parent]
 
         # make request, print error, and return response
-        response = requests.post(prepped_url.build(), headers=prepped_headers.format_dict(),
-                                 json=payload.remove_values(...).to_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.create_group, "POST", url,
+                             self._headers, print_error=print_error,
+                             json=payload.remove_values(...).to_dict())
     
-    @rlim.placeholder
     def list_groups(self, *, next: str = ..., name: str = ..., creator: Union[str, int] = ...,
                     group: str = ..., created_before: Union[models.Date, str] = ...,
                     created_after: Union[models.Date, str] = ..., count: int = ...,
@@ -586,53 +1622,74 @@ class Client:
             200.
         
         """
-        if count != ... and 1 > count > 200:
-            raise ValueError("\"count\" must be between 1 and 200")
-        
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
-
         # prepare url
-        if next != ...:
-            try:
-                next = urllib.parse.unquote(re.search(r"(?<=after=)[^\&]*", next).group())
-            except Exception:
-                raise ValueError("'next' string has an unknown structure")
-
-        # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing",
-                                    top_level_domain="com", path_segments=["api", "groups"])
-        prepped_url.components.queries[
-            "after",
-            "name",
-            "creator",
-            "group",
-            "created-before",
-            "created-after",
-            "count",
-            "sort-by",
-            "sort-dir"
-        ] = [
-            next,
-            name,
-            creator,
-            group,
-            created_before,
-            created_after,
-            count, 
-            p(sort_by),
-            p(sort_dir)
-        ]
-        url = prepped_url.build(query_check=...)
+        url = _list_groups_url(self._api_url, next=next, name=name, creator=creator, group=group,
+                               created_before=created_before, created_after=created_after,
+                               count=count, sort_by=sort_by, sort_dir=sort_dir)
 
         # make request, print error, and return response
-        response = requests.get(url, headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.list_groups, "GET", url,
+                             self._headers, print_error=print_error)
+
+    def list_groups_page(self, *, print_error: bool = True,
+                         **filters: Any) -> models.GroupPage:
+        """Like `list_groups`, but returns the page as a `models.GroupPage` instead of the raw
+        response.
+
+        Parameters
+        ----------
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if the request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+        **filters : keywords
+            Any of the filters accepted by `list_groups`.
+
+        Returns
+        -------
+        models.GroupPage
+            The page of groups.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the request resulted in an HTTP error.
+
+        """
+        return _model(models.GroupPage, self.list_groups(print_error=print_error, **filters))
+
+    def iter_groups(self, *, limit: int = ..., prefetch: bool = True, print_error: bool = True,
+                    **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over every group matching the given filters, following the
+        continuation chain of `list_groups` page by page.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The maximum number of groups to yield. If undefined, every matching group is yielded.
+        prefetch : bool, optional, default=True
+            If `True`, the next page is requested in the background while the current page is
+            being consumed.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+        **filters : keywords
+            Any of the filters accepted by `list_groups` (except `next`). If `count` is
+            undefined, pages of 200 groups (or `limit` groups, if fewer) are requested.
+
+        Yields
+        ------
+        dict
+            Each group summary (an item of `<response from list_groups>.json()["list"]`).
+
+        Raises
+        ------
+        requests.HTTPError
+            If a page request resulted in an HTTP error.
+
+        """
+        return self._paginate(self.list_groups, limit, prefetch,
+                              {**filters, "print_error": print_error})
 
-    @rlim.placeholder
     def get_group(self, group_id: str, *, print_error: bool = True) -> requests.Response:
         """Get information on a specific replay group from
         https://ballchasing.com.
@@ -652,19 +1709,97 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "groups", group_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/groups/{group_id}"
 
         # make request, print error, and return response
-        response = requests.get(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.get_group, "GET", url,
+                             self._headers, print_error=print_error)
     
+    def get_group_model(self, group_id: str, *, print_error: bool = True) -> models.Group:
+        """Like `get_group`, but returns the group as a `models.Group` instead of the raw
+        response.
+
+        Parameters
+        ----------
+        group_id : str
+            The ID of the group present in ballchasing's systems.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if the request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Returns
+        -------
+        models.Group
+            The group.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the request resulted in an HTTP error.
+
+        """
+        return _model(models.Group, self.get_group(group_id, print_error=print_error))
+
+    def crawl_group(self, group_id: str, *, depth: int = ..., include_replays: bool = False,
+                    include_replay_details: bool = False, max_concurrency: int = ...,
+                    print_error: bool = True) -> GroupCrawl:
+        """Crawl a group and its subgroups (and optionally their replays) breadth-first, keeping
+        up to `max_concurrency` requests in flight. Each group and replay is requested once,
+        even if it is found more than once.
+
+        The crawl runs as the returned `GroupCrawl` is iterated over, yielding
+        `("group", <group data>, <parent ID>)` and `("replay", <replay data>, <group ID>)`
+        tuples as they arrive, and filling in its `tree`, an in-memory `GroupTree` index with
+        parent and child lookups. `GroupCrawl.result()` runs the whole crawl and returns the
+        tree. For example:
+        ```py
+        tree = client.crawl_group(league_id, include_replays=True).result()
+        for division in tree.children(league_id):
+            print(tree.group(division)["name"], len(tree.replays(division, recursive=True)))
+        ```
+
+        Parameters
+        ----------
+        group_id : str
+            The ID of the group to crawl.
+        depth : int, optional
+            The number of levels of subgroups to crawl (`0` crawls the group alone, `1` its
+            direct subgroups as well, and so on). If undefined, subgroups are crawled at any
+            depth.
+        include_replays : bool, optional, default=False
+            If `True`, the replays of every crawled group are listed as well.
+        include_replay_details : bool, optional, default=False
+            If `True`, the details of every replay are requested through `get_replay`, and
+            replace its `list_replays` item. Implies `include_replays`.
+        max_concurrency : int, optional
+            The maximum number of requests in flight at once. Defaults to the number of
+            `list_groups` calls per second allowed by the client's Patreon tier.
+        print_error : bool, optional, default=True
+            Prints an error message (that contains information about the error) if a request
+            resulted in an HTTP error (i.e. status codes 400 through 599).
+
+        Returns
+        -------
+        GroupCrawl
+            The crawl, whose iteration raises `requests.HTTPError` if a request resulted in an
+            HTTP error.
+
+        Raises
+        ------
+        ValueError
+            If `depth` is negative or `max_concurrency` is less than 1.
+
+        """
+        if depth != ... and depth < 0:
+            raise ValueError("\"depth\" cannot be negative")
+        if max_concurrency == ...:
+            max_concurrency = self._default_concurrency(enums.Operation.list_groups)
+        if max_concurrency < 1:
+            raise ValueError("\"max_concurrency\" must be at least 1")
+        tree = GroupTree(group_id)
+        return GroupCrawl(self._crawl(tree, depth, include_replays, include_replay_details,
+                                      max_concurrency, print_error), tree)
+
     def delete_group(self, group_id: str, *, print_error: bool = True) -> requests.Response:
         """Delete a specific group (and all children groups) from
         https://ballchasing.com, so long as it is owned by the token holder.
@@ -684,20 +1819,12 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "groups", group_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/groups/{group_id}"
 
         # make request, print error, and return response
-        response = requests.delete(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.delete_group, "DELETE", url,
+                             self._headers, print_error=print_error)
     
-    @rlim.placeholder
     def patch_group(self, group_id: str, *,
                     player_identification: Union[str, enums.PlayerIdentification] = ...,
                     team_identification: Union[str, enums.TeamIdentification] = ...,
@@ -734,12 +1861,7 @@ class Client:
         
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "groups", group_id])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/groups/{group_id}"
 
         # prepare payload
         payload = httpprep.OverloadDict()
@@ -749,11 +1871,9 @@ class Client:
             p(player_identification), p(team_identification), parent, shared]
 
         # make request, print error, and return response
-        response = requests.patch(prepped_url.build(), headers=prepped_headers.format_dict(),
-                                  json=payload.remove_values(...).to_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.patch_group, "PATCH", url,
+                             self._headers, print_error=print_error,
+                             json=payload.remove_values(...).to_dict())
     
     def maps(self, *, print_error: bool = True) -> requests.Response:
         """Get a list of current maps.
@@ -771,15 +1891,8 @@ class Client:
 
         """
         # prepare url
-        prepped_url = httpprep.URL(protocol="https", domain="ballchasing", top_level_domain="com",
-                                   path_segments=["api", "maps"])
-
-        # prepare headers
-        prepped_headers = httpprep.Headers()
-        prepped_headers.Authorization = self._token
+        url = f"{self._api_url}/maps"
 
         # make request, print error, and return response
-        response = requests.get(prepped_url.build(), headers=prepped_headers.format_dict())
-        if print_error:
-            _print_error(response)
-        return response
+        return self._request(enums.Operation.maps, "GET", url,
+                             self._headers, print_error=print_error)
@@ -0,0 +1,248 @@
+"""The in-memory index of a group tree crawled by ``Client.crawl_group``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import collections
+
+from typing import (
+    Optional,
+    Iterator,
+    Tuple,
+    Dict,
+    List,
+    Any
+)
+
+
+class GroupTree:
+    """An in-memory index of a crawled group and its subgroups (and, if they were crawled, their
+    replays), with constant-time parent and child lookups.
+
+    Group data is the response of `get_group` for the root, and the item of `list_groups` for
+    every subgroup. Replay data is the item of `list_replays`, or the response of `get_replay`
+    if replay details were crawled. A replay found in several groups is stored once, and linked
+    to each of them.
+
+    """
+    def __init__(self, root: str) -> None:
+        """
+        Arguments
+        ---------
+        root : str
+            The ID of the crawled group.
+
+        """
+        self.root = root
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, List[str]] = collections.defaultdict(list)
+        self._depths: Dict[str, int] = {}
+        self._replays: Dict[str, Dict[str, Any]] = {}
+        self._group_replays: Dict[str, List[str]] = collections.defaultdict(list)
+        self._replay_groups: Dict[str, List[str]] = collections.defaultdict(list)
+
+    def _add_group(self, group: Dict[str, Any], parent: Optional[str]) -> bool:
+        """Add a group under `parent`, returning `False` (and changing nothing) if it is already
+        in the tree.
+
+        """
+        group_id = group["id"]
+        if group_id in self._groups:
+            return False
+        self._groups[group_id] = group
+        self._parents[group_id] = parent
+        self._depths[group_id] = 0 if parent is None else self._depths[parent] + 1
+        if parent is not None:
+            self._children[parent].append(group_id)
+        return True
+
+    def _link_replay(self, replay_id: str, group_id: str) -> bool:
+        """Link a replay to a group, returning `True` if the replay was not linked to any group
+        before.
+
+        """
+        first = replay_id not in self._replay_groups
+        if group_id not in self._replay_groups[replay_id]:
+            self._replay_groups[replay_id].append(group_id)
+            self._group_replays[group_id].append(replay_id)
+        return first
+
+    def _add_replay(self, replay: Dict[str, Any]) -> None:
+        self._replays[replay["id"]] = replay
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._groups
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups)
+
+    def group(self, group_id: str) -> Dict[str, Any]:
+        """Get the data of a group.
+
+        Raises
+        ------
+        KeyError
+            If the group is not in the tree.
+
+        """
+        return self._groups[group_id]
+
+    def parent(self, group_id: str) -> Optional[str]:
+        """Get the ID of the parent of a group (`None` for the root).
+
+        Raises
+        ------
+        KeyError
+            If the group is not in the tree.
+
+        """
+        return self._parents[group_id]
+
+    def children(self, group_id: str) -> List[str]:
+        """Get the IDs of the subgroups of a group, in the order they were listed.
+
+        """
+        return list(self._children.get(group_id, ()))
+
+    def depth(self, group_id: str) -> int:
+        """Get the depth of a group (`0` for the root).
+
+        Raises
+        ------
+        KeyError
+            If the group is not in the tree.
+
+        """
+        return self._depths[group_id]
+
+    def ancestors(self, group_id: str) -> List[str]:
+        """Get the IDs of the ancestors of a group, from its parent up to the root.
+
+        Raises
+        ------
+        KeyError
+            If the group is not in the tree.
+
+        """
+        ancestors = []
+        parent = self._parents[group_id]
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self._parents[parent]
+        return ancestors
+
+    def descendants(self, group_id: str) -> Iterator[str]:
+        """Iterate over the IDs of the subgroups of a group at any depth, breadth-first.
+
+        """
+        queue = collections.deque(self._children.get(group_id, ()))
+        while queue:
+            child = queue.popleft()
+            yield child
+            queue.extend(self._children.get(child, ()))
+
+    def path(self, group_id: str) -> List[str]:
+        """Get the IDs of the groups from the root down to (and including) a group.
+
+        Raises
+        ------
+        KeyError
+            If the group is not in the tree.
+
+        """
+        return [*reversed(self.ancestors(group_id)), group_id]
+
+    def replays(self, group_id: str, *, recursive: bool = False) -> List[str]:
+        """Get the IDs of the replays of a group.
+
+        Parameters
+        ----------
+        group_id : str
+            The ID of the group.
+        recursive : bool, optional, default=False
+            If `True`, the replays of its subgroups (at any depth) are included as well, each
+            only once.
+
+        """
+        if not recursive:
+            return list(self._group_replays.get(group_id, ()))
+        replays = dict.fromkeys(self._group_replays.get(group_id, ()))
+        for child in self.descendants(group_id):
+            replays.update(dict.fromkeys(self._group_replays.get(child, ())))
+        return list(replays)
+
+    def replay(self, replay_id: str) -> Dict[str, Any]:
+        """Get the data of a replay.
+
+        Raises
+        ------
+        KeyError
+            If the replay is not in the tree.
+
+        """
+        return self._replays[replay_id]
+
+    def groups_of(self, replay_id: str) -> List[str]:
+        """Get the IDs of the groups a replay was found in.
+
+        """
+        return list(self._replay_groups.get(replay_id, ()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(root={self.root!r}, groups={len(self._groups)}, " \
+               f"replays={len(self._replays)})"
+
+
+class GroupCrawl:
+    """A running `Client.crawl_group` crawl. Iterating over it drives the crawl, yielding
+    `(kind, data, parent)` tuples as results arrive: `("group", <group data>, <parent ID>)`
+    for every group (the root first, with a parent of `None`), and
+    `("replay", <replay data>, <group ID>)` for every replay the first time it is found. Its
+    `tree` holds everything crawled so far.
+
+    """
+    def __init__(self, items: Iterator[Tuple[str, Dict[str, Any], Optional[str]]],
+                 tree: GroupTree) -> None:
+        self.tree = tree
+        self._items = items
+
+    def __iter__(self) -> "GroupCrawl":
+        return self
+
+    def __next__(self) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        return next(self._items)
+
+    def result(self) -> GroupTree:
+        """Run the rest of the crawl, and return the complete tree.
+
+        Raises
+        ------
+        requests.HTTPError
+            If a request resulted in an HTTP error.
+
+        """
+        for _ in self._items:
+            pass
+        return self.tree
+
+    def close(self) -> None:
+        """Stop the crawl, waiting for the requests in flight to finish.
+
+        """
+        self._items.close()
+
+    def __enter__(self) -> "GroupCrawl":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
@@ -8,8 +8,14 @@ __author__ = "Tanner B. Corcoran"
 __license__ = "MIT License"
 __copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
 
+import collections.abc
 import enum
-import rlim
+
+from typing import (
+    Iterator,
+    Tuple,
+    Dict
+)
 
 
 class Operation(enum.Enum):
@@ -30,69 +36,147 @@ class Operation(enum.Enum):
     get_timeline="get_timeline"
     export_csv="export_csv"
 
+
+def _rate(calls: float) -> Tuple[str, float]:
+    return ("Rate", calls)
+
+
+def _limit(calls: int, period: float) -> Tuple[str, int, float]:
+    return ("Limit", calls, period)
+
+
+class _TierTable(collections.abc.Mapping):
+    """The rate limit criteria (`rlim.Rate` and `rlim.Limit` objects) of each operation of a
+    Patreon tier. The criteria are only built (and `rlim` imported) when the table is first
+    read, which keeps importing the enumerations cheap.
+
+    """
+    # compared by identity, so that building the `PatreonTier` enum does not build its tables
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __init__(self, criteria: Dict["Operation", Tuple[tuple, ...]]) -> None:
+        self._criteria = criteria
+        self._table = None
+
+    def _build(self) -> Dict["Operation", tuple]:
+        if self._table is None:
+            import rlim
+            self._table = {operation: tuple(getattr(rlim, kind)(*args) for kind, *args in criteria)
+                           for operation, criteria in self._criteria.items()}
+        return self._table
+
+    def __getitem__(self, operation: "Operation") -> tuple:
+        return self._build()[operation]
+
+    def __iter__(self) -> Iterator["Operation"]:
+        return iter(self._criteria)
+
+    def __len__(self) -> int:
+        return len(self._criteria)
+
+    def __repr__(self) -> str:
+        return repr(self._criteria)
+
+
 class PatreonTier(enum.Enum):
-    grand_champion={
-        Operation.list_replays: (rlim.Rate(16),),
-        Operation.get_replay: (rlim.Rate(16),),
-        Operation.delete_replay: (rlim.Rate(16),),
-        Operation.patch_replay: (rlim.Rate(16),),
-        Operation.download_replay: (rlim.Rate(2),),
-        Operation.create_group: (rlim.Rate(16),),
-        Operation.list_groups: (rlim.Rate(16),),
-        Operation.get_group: (rlim.Rate(16),),
-        Operation.delete_group: (rlim.Rate(16),),
-        Operation.patch_group: (rlim.Rate(16),)
-    }
-    champion={
-        Operation.list_replays: (rlim.Rate(8),),
-        Operation.get_replay: (rlim.Rate(8),),
-        Operation.delete_replay: (rlim.Rate(8),),
-        Operation.patch_replay: (rlim.Rate(8),),
-        Operation.download_replay: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.create_group: (rlim.Rate(8),),
-        Operation.list_groups: (rlim.Rate(8),),
-        Operation.get_group: (rlim.Rate(8),),
-        Operation.delete_group: (rlim.Rate(8),),
-        Operation.patch_group: (rlim.Rate(8),)
-    }
-    diamond={
-        Operation.list_replays: (rlim.Rate(4), rlim.Limit(2000, 3600)),
-        Operation.get_replay: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.delete_replay: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.patch_replay: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.download_replay: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.create_group: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.list_groups: (rlim.Rate(4), rlim.Limit(2000, 3600)),
-        Operation.get_group: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.delete_group: (rlim.Rate(4), rlim.Limit(5000, 3600)),
-        Operation.patch_group: (rlim.Rate(4), rlim.Limit(5000, 3600))
-    }
-    gold={
-        Operation.list_replays: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.get_replay: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.delete_replay: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.patch_replay: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.download_replay: (rlim.Rate(2), rlim.Limit(400, 3600)),
-        Operation.create_group: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.list_groups: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.get_group: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.delete_group: (rlim.Rate(2), rlim.Limit(2000, 3600)),
-        Operation.patch_group: (rlim.Rate(2), rlim.Limit(2000, 3600))
-    }
-    regular={
-        Operation.list_replays: (rlim.Rate(2), rlim.Limit(500, 3600)),
-        Operation.get_replay: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.delete_replay: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.patch_replay: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.download_replay: (rlim.Rate(2), rlim.Limit(200, 3600)),
-        Operation.create_group: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.list_groups: (rlim.Rate(2), rlim.Limit(500, 3600)),
-        Operation.get_group: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.delete_group: (rlim.Rate(2), rlim.Limit(1000, 3600)),
-        Operation.patch_group: (rlim.Rate(2), rlim.Limit(1000, 3600))
-    }
+    grand_champion=_TierTable({
+        Operation.ping: (_rate(16),),
+        Operation.upload_replay: (_rate(2),),
+        Operation.list_replays: (_rate(16),),
+        Operation.get_replay: (_rate(16),),
+        Operation.delete_replay: (_rate(16),),
+        Operation.patch_replay: (_rate(16),),
+        Operation.download_replay: (_rate(2),),
+        Operation.create_group: (_rate(16),),
+        Operation.list_groups: (_rate(16),),
+        Operation.get_group: (_rate(16),),
+        Operation.delete_group: (_rate(16),),
+        Operation.patch_group: (_rate(16),),
+        Operation.maps: (_rate(16),),
+        Operation.get_threejs: (_rate(16),),
+        Operation.get_timeline: (_rate(16),),
+        Operation.export_csv: (_rate(16),)
+    })
+    champion=_TierTable({
+        Operation.ping: (_rate(8),),
+        Operation.upload_replay: (_rate(2),),
+        Operation.list_replays: (_rate(8),),
+        Operation.get_replay: (_rate(8),),
+        Operation.delete_replay: (_rate(8),),
+        Operation.patch_replay: (_rate(8),),
+        Operation.download_replay: (_rate(2), _limit(2000, 3600)),
+        Operation.create_group: (_rate(8),),
+        Operation.list_groups: (_rate(8),),
+        Operation.get_group: (_rate(8),),
+        Operation.delete_group: (_rate(8),),
+        Operation.patch_group: (_rate(8),),
+        Operation.maps: (_rate(8),),
+        Operation.get_threejs: (_rate(8),),
+        Operation.get_timeline: (_rate(8),),
+        Operation.export_csv: (_rate(8),)
+    })
+    diamond=_TierTable({
+        Operation.ping: (_rate(4),),
+        Operation.upload_replay: (_rate(2),),
+        Operation.list_replays: (_rate(4), _limit(2000, 3600)),
+        Operation.get_replay: (_rate(4), _limit(5000, 3600)),
+        Operation.delete_replay: (_rate(4), _limit(5000, 3600)),
+        Operation.patch_replay: (_rate(4), _limit(5000, 3600)),
+        Operation.download_replay: (_rate(2), _limit(1000, 3600)),
+        Operation.create_group: (_rate(4), _limit(5000, 3600)),
+        Operation.list_groups: (_rate(4), _limit(2000, 3600)),
+        Operation.get_group: (_rate(4), _limit(5000, 3600)),
+        Operation.delete_group: (_rate(4), _limit(5000, 3600)),
+        Operation.patch_group: (_rate(4), _limit(5000, 3600)),
+        Operation.maps: (_rate(4),),
+        Operation.get_threejs: (_rate(4),),
+        Operation.get_timeline: (_rate(4),),
+        Operation.export_csv: (_rate(4),)
+    })
+    gold=_TierTable({
+        Operation.ping: (_rate(2),),
+        Operation.upload_replay: (_rate(2),),
+        Operation.list_replays: (_rate(2), _limit(1000, 3600)),
+        Operation.get_replay: (_rate(2), _limit(2000, 3600)),
+        Operation.delete_replay: (_rate(2), _limit(2000, 3600)),
+        Operation.patch_replay: (_rate(2), _limit(2000, 3600)),
+        Operation.download_replay: (_rate(2), _limit(400, 3600)),
+        Operation.create_group: (_rate(2), _limit(2000, 3600)),
+        Operation.list_groups: (_rate(2), _limit(1000, 3600)),
+        Operation.get_group: (_rate(2), _limit(2000, 3600)),
+        Operation.delete_group: (_rate(2), _limit(2000, 3600)),
+        Operation.patch_group: (_rate(2), _limit(2000, 3600)),
+        Operation.maps: (_rate(2),),
+        Operation.get_threejs: (_rate(2),),
+        Operation.get_timeline: (_rate(2),),
+        Operation.export_csv: (_rate(2),)
+    })
+    regular=_TierTable({
+        Operation.ping: (_rate(2),),
+        Operation.upload_replay: (_rate(2),),
+        Operation.list_replays: (_rate(2), _limit(500, 3600)),
+        Operation.get_replay: (_rate(2), _limit(1000, 3600)),
+        Operation.delete_replay: (_rate(2), _limit(1000, 3600)),
+        Operation.patch_replay: (_rate(2), _limit(1000, 3600)),
+        Operation.download_replay: (_rate(2), _limit(200, 3600)),
+        Operation.create_group: (_rate(2), _limit(1000, 3600)),
+        Operation.list_groups: (_rate(2), _limit(500, 3600)),
+        Operation.get_group: (_rate(2), _limit(1000, 3600)),
+        Operation.delete_group: (_rate(2), _limit(1000, 3600)),
+        Operation.patch_group: (_rate(2), _limit(1000, 3600)),
+        Operation.maps: (_rate(2),),
+        Operation.get_threejs: (_rate(2),),
+        Operation.get_timeline: (_rate(2),),
+        Operation.export_csv: (_rate(2),)
+    })
     none=regular
 
+class Priority(enum.Enum):
+    interactive="interactive"
+    normal="normal"
+    bulk="bulk"
+
 class Rank(enum.Enum):
     unranked="unranked"
     bronze_1="bronze-1"
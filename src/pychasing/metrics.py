@@ -0,0 +1,205 @@
+"""Request events and metrics used by ``client``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+from . import enums
+import collections
+import threading
+import math
+
+from typing import (
+    NamedTuple,
+    Optional,
+    Dict,
+    Any
+)
+
+
+class RequestEvent(NamedTuple):
+    """A single attempt at a request, as passed to the `hooks` of `Client`.
+
+    """
+    operation: enums.Operation
+    method: str
+    url: str
+    attempt: int
+    """The number of the attempt (starting at 1, so anything above 1 is a retry)."""
+    status_code: Optional[int]
+    """The status code of the response, or `None` if no response was received."""
+    exception: Optional[BaseException]
+    """The exception raised while sending the request, if any."""
+    latency: float
+    """The number of seconds between sending the request and receiving the response headers."""
+    rate_limit_wait: float
+    """The number of seconds spent waiting on the rate limiter before sending the request."""
+    bytes_sent: int
+    """The size of the request body."""
+    bytes_received: int
+    """The size of the response body (its `Content-Length` for streamed responses)."""
+
+
+class _OperationMetrics:
+    __slots__ = ("requests", "statuses", "exceptions", "retries", "latencies", "latency_sum",
+                 "bytes_sent", "bytes_received", "rate_limit_wait")
+
+    def __init__(self, window: int) -> None:
+        self.requests = 0
+        self.statuses = collections.Counter()
+        self.exceptions = 0
+        self.retries = 0
+        self.latencies = collections.deque(maxlen=window)
+        self.latency_sum = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rate_limit_wait = 0.0
+
+
+def _percentile(ordered: list, percentile: float) -> float:
+    """Get the (nearest-rank) percentile of the sorted values `ordered`.
+
+    """
+    if not ordered:
+        return math.nan
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+class Metrics:
+    """Collects per-operation metrics from the requests of one or more clients. Pass an instance
+    in the `hooks` of a `Client`, then read the metrics with `snapshot` or `prometheus`.
+
+    Latency percentiles are computed over the most recent `window` requests of each operation;
+    every other metric is a running total.
+
+    """
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, window: int = 10000) -> None:
+        """
+        Arguments
+        ---------
+        window : int, optional, default=10000
+            The number of most recent latencies kept per operation.
+
+        """
+        self._window = window
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self._operations.get(event.operation)
+            if metrics is None:
+                metrics = self._operations[event.operation] = _OperationMetrics(self._window)
+            metrics.requests += 1
+            if event.status_code is not None:
+                metrics.statuses[event.status_code] += 1
+            if event.exception is not None:
+                metrics.exceptions += 1
+            if event.attempt > 1:
+                metrics.retries += 1
+            metrics.latencies.append(event.latency)
+            metrics.latency_sum += event.latency
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.rate_limit_wait += event.rate_limit_wait
+
+    def reset(self) -> None:
+        """Discard every collected metric.
+
+        """
+        with self._lock:
+            self._operations.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get the collected metrics.
+
+        Returns
+        -------
+        dict of str to dict
+            The metrics of each operation (by operation value): `requests`, `statuses` (a dict
+            of status code to count), `exceptions`, `retries`, `latency` (a dict with the
+            `p50`, `p90` and `p99` percentiles, `mean` and `max`, in seconds), `bytes_sent`,
+            `bytes_received` and `rate_limit_wait` (in seconds).
+
+        """
+        snapshot = {}
+        with self._lock:
+            for operation, metrics in self._operations.items():
+                latencies = sorted(metrics.latencies)
+                latency = {f"p{round(q * 100)}": _percentile(latencies, q * 100)
+                           for q in self.QUANTILES}
+                latency["mean"] = metrics.latency_sum / metrics.requests
+                latency["max"] = latencies[-1] if latencies else math.nan
+                snapshot[operation.value] = {
+                    "requests": metrics.requests,
+                    "statuses": dict(metrics.statuses),
+                    "exceptions": metrics.exceptions,
+                    "retries": metrics.retries,
+                    "latency": latency,
+                    "bytes_sent": metrics.bytes_sent,
+                    "bytes_received": metrics.bytes_received,
+                    "rate_limit_wait": metrics.rate_limit_wait
+                }
+        return snapshot
+
+    def prometheus(self, prefix: str = "pychasing") -> str:
+        """Get the collected metrics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str, optional, default="pychasing"
+            The prefix of every metric name.
+
+        Returns
+        -------
+        str
+            The metrics.
+
+        """
+        families = collections.OrderedDict([
+            ("requests_total", ("counter", "Requests sent, by status code.", [])),
+            ("request_exceptions_total", ("counter", "Requests that raised an exception.", [])),
+            ("request_retries_total", ("counter", "Requests that were retries.", [])),
+            ("request_duration_seconds", ("summary", "Request latency.", [])),
+            ("request_bytes_sent_total", ("counter", "Request body bytes sent.", [])),
+            ("request_bytes_received_total", ("counter", "Response body bytes received.", [])),
+            ("rate_limit_wait_seconds_total",
+             ("counter", "Time spent waiting on the rate limiter.", []))
+        ])
+        with self._lock:
+            for operation, metrics in self._operations.items():
+                label = f'operation="{operation.value}"'
+                for status, count in sorted(metrics.statuses.items()):
+                    families["requests_total"][2].append(
+                        ("", f'{{{label},status="{status}"}}', count))
+                families["request_exceptions_total"][2].append(
+                    ("", f"{{{label}}}", metrics.exceptions))
+                families["request_retries_total"][2].append(("", f"{{{label}}}", metrics.retries))
+                latencies = sorted(metrics.latencies)
+                for q in self.QUANTILES:
+                    families["request_duration_seconds"][2].append(
+                        ("", f'{{{label},quantile="{q}"}}', _percentile(latencies, q * 100)))
+                families["request_duration_seconds"][2].append(
+                    ("_sum", f"{{{label}}}", metrics.latency_sum))
+                families["request_duration_seconds"][2].append(
+                    ("_count", f"{{{label}}}", metrics.requests))
+                families["request_bytes_sent_total"][2].append(
+                    ("", f"{{{label}}}", metrics.bytes_sent))
+                families["request_bytes_received_total"][2].append(
+                    ("", f"{{{label}}}", metrics.bytes_received))
+                families["rate_limit_wait_seconds_total"][2].append(
+                    ("", f"{{{label}}}", metrics.rate_limit_wait))
+        lines = []
+        for name, (kind, description, samples) in families.items():
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{prefix}_{name}{suffix}{labels} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,381 @@
+"""A local SQLite mirror of replay summaries, which is kept up to date incrementally and can be
+queried without using the API.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+from . import models
+from . import enums
+from .urls import p
+from .models import _timestamp
+from .client import Client
+from .client import _json_loads
+import threading
+import sqlite3
+import json
+import os
+
+from typing import (
+    Optional,
+    Iterable,
+    Union,
+    Tuple,
+    Dict,
+    List,
+    Any
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS replays (id TEXT PRIMARY KEY, title TEXT, created REAL,"
+    " date REAL, uploader TEXT, playlist TEXT, season TEXT, map TEXT, min_rank INTEGER,"
+    " max_rank INTEGER, data TEXT)",
+    "CREATE INDEX IF NOT EXISTS replays_created ON replays (created)",
+    "CREATE INDEX IF NOT EXISTS replays_date ON replays (date)",
+    "CREATE INDEX IF NOT EXISTS replays_uploader ON replays (uploader, created)",
+    "CREATE INDEX IF NOT EXISTS replays_playlist ON replays (playlist, created)",
+    "CREATE INDEX IF NOT EXISTS replays_season ON replays (season, created)",
+    "CREATE INDEX IF NOT EXISTS replays_map ON replays (map, created)",
+    "CREATE INDEX IF NOT EXISTS replays_min_rank ON replays (min_rank)",
+    "CREATE INDEX IF NOT EXISTS replays_max_rank ON replays (max_rank)",
+    "CREATE TABLE IF NOT EXISTS replay_players (replay_id TEXT, platform TEXT, player_id TEXT,"
+    " name TEXT)",
+    "CREATE INDEX IF NOT EXISTS replay_players_replay ON replay_players (replay_id)",
+    "CREATE INDEX IF NOT EXISTS replay_players_id ON replay_players (platform, player_id)",
+    "CREATE INDEX IF NOT EXISTS replay_players_name ON replay_players (name)",
+    "CREATE TABLE IF NOT EXISTS replay_groups (replay_id TEXT, group_id TEXT)",
+    "CREATE INDEX IF NOT EXISTS replay_groups_replay ON replay_groups (replay_id)",
+    "CREATE INDEX IF NOT EXISTS replay_groups_group ON replay_groups (group_id)",
+    "CREATE TABLE IF NOT EXISTS watermarks (query TEXT PRIMARY KEY, created TEXT,"
+    " timestamp REAL)"
+)
+
+# the filters of `list_replays` that `ReplayMirror.sync` controls itself
+_RESERVED = ("next", "count", "sort_by", "sort_dir", "print_error")
+
+
+def _tier(rank: Union[str, enums.Rank, Dict[str, Any], None]) -> Optional[int]:
+    """Get the tier (the position in `enums.Rank`, from `0` for unranked to `22` for
+    supersonic legend) of a rank, given as a `Rank`, its value, or a rank object of a replay.
+
+    """
+    if isinstance(rank, dict):
+        if isinstance(rank.get("tier"), int):
+            return rank["tier"]
+        rank = rank.get("id")
+    if not rank:
+        return None
+    return list(enums.Rank).index(enums.Rank(p(rank)))
+
+
+def _season(replay: Dict[str, Any]) -> Optional[str]:
+    """Get the season of a replay as the value of its `enums.Season` (e.g. `"f8"`).
+
+    """
+    season = replay.get("season")
+    if season is None:
+        return None
+    return f"f{season}" if replay.get("season_type") == "free2play" else str(season)
+
+
+def _plain(value: Any) -> Any:
+    """Convert a `list_replays` filter value into a JSON-serializable value.
+
+    """
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return p(value)
+
+
+class ReplayMirror:
+    """A local SQLite mirror of the replay summaries returned by `list_replays`, indexed on the
+    fields `list_replays` filters on.
+
+    `sync` only requests the replays uploaded since the newest replay stored by the previous
+    sync of the same filters (a `created_after` watermark), and `query` answers filter queries
+    from the mirror alone, without using the API (or its rate limits).
+
+    """
+    def __init__(self, path: Union[str, os.PathLike], client: Client = None) -> None:
+        """
+        Arguments
+        ---------
+        path : str or PathLike
+            The path of the database file (created if it does not exist).
+        client : Client, optional
+            The client used by `sync` (and to resolve `uploader="me"` in `query`).
+
+        """
+        self._client = client
+        self._me = None
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+
+    def close(self) -> None:
+        """Close the connection to the database.
+
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "ReplayMirror":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM replays").fetchone()[0]
+
+    def watermark(self, **filters: Any) -> Optional[str]:
+        """Get the `created` date of the newest replay stored by a sync of the given filters (or
+        `None` if they were never synced).
+
+        """
+        key = self._query_key({k: v for k, v in filters.items() if k != "created_after"})
+        with self._lock:
+            row = self._connection.execute("SELECT created FROM watermarks WHERE query = ?",
+                                           (key,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, *, limit: int = ..., batch_size: int = 200, **filters: Any) -> int:
+        """Store (or update) every replay matching the given filters that was uploaded since the
+        last sync of the same filters. Replays are requested oldest first and committed in
+        batches (each advancing the watermark), so an interrupted sync resumes where it stopped.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The maximum number of replays requested.
+        batch_size : int, optional, default=200
+            The number of replays committed to the database at once.
+        **filters : keywords
+            Any of the filters accepted by `list_replays` (except `next`, `count`, `sort_by` and
+            `sort_dir`). The first sync of the filters starts from their `created_after` (if
+            given); later syncs start from the watermark.
+
+        Returns
+        -------
+        int
+            The number of replays stored.
+
+        Raises
+        ------
+        ValueError
+            If the mirror has no client, or a reserved filter is given.
+
+        """
+        if self._client is None:
+            raise ValueError("a client is required to sync")
+        reserved = [name for name in _RESERVED if name in filters]
+        if reserved:
+            raise ValueError(f"{', '.join(reserved)} cannot be used as sync filters")
+        key = self._query_key({k: v for k, v in filters.items() if k != "created_after"})
+        with self._lock:
+            row = self._connection.execute("SELECT created FROM watermarks WHERE query = ?",
+                                           (key,)).fetchone()
+        if row:
+            filters["created_after"] = row[0]
+
+        stored = 0
+        batch = []
+        for replay in self._client.iter_replays(limit=limit, sort_by="upload-date",
+                                                sort_dir="asc", **filters):
+            batch.append(replay)
+            if len(batch) >= batch_size:
+                stored += self._store(batch, key)
+                batch = []
+        if batch:
+            stored += self._store(batch, key)
+        return stored
+
+    def add(self, replays: Iterable[Dict[str, Any]]) -> int:
+        """Store (or update) the given replay summaries (e.g. the `list` of a `list_replays`
+        response), without changing any watermark.
+
+        Returns
+        -------
+        int
+            The number of replays stored.
+
+        """
+        return self._store(list(replays), None)
+
+    def get(self, replay_id: str) -> Optional[models.ReplaySummary]:
+        """Get a stored replay by its ID (or `None` if it is not stored).
+
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM replays WHERE id = ?",
+                                           (replay_id,)).fetchone()
+        return models.ReplaySummary(_json_loads(row[0])) if row else None
+
+    def query(self, *, title: str = ..., player_names: Iterable[str] = ...,
+              player_ids: Iterable[Tuple[Union[enums.Platform, str], Union[int, str]]] = ...,
+              playlists: Iterable[Union[enums.Playlist, str]] = ...,
+              season: Union[str, enums.Season] = ..., min_rank: Union[str, enums.Rank] = ...,
+              max_rank: Union[str, enums.Rank] = ..., uploader: Union[str, int] = ...,
+              group: str = ..., map: Union[str, enums.Map] = ...,
+              created_before: Union[models.Date, str] = ...,
+              created_after: Union[models.Date, str] = ...,
+              replay_date_before: Union[models.Date, str] = ...,
+              replay_date_after: Union[models.Date, str] = ...,
+              sort_by: Union[str, enums.ReplaySortBy] = ...,
+              sort_dir: Union[str, enums.SortDirection] = ...,
+              limit: int = ...) -> List[models.ReplaySummary]:
+        """Get the stored replays matching the given filters, which behave like those of
+        `list_replays` (see `Client.list_replays`), without using the API.
+
+        Parameters
+        ----------
+        title : str, optional
+            Only include replays whose title contains the given string (case-insensitive).
+        player_names, player_ids, playlists, season, uploader, group, map : optional
+            See `Client.list_replays`. `uploader="me"` is resolved through the client's `ping`
+            (once per mirror).
+        min_rank : str or Rank, optional
+            Only include replays whose lowest ranked player is at least the given rank.
+        max_rank : str or Rank, optional
+            Only include replays whose highest ranked player is at most the given rank.
+        created_before, created_after, replay_date_before, replay_date_after : optional
+            See `Client.list_replays`.
+        sort_by : str or ReplaySortBy, optional, default=ReplaySortBy.upload_date
+            The date the replays are sorted by.
+        sort_dir : str or SortDirection, optional, default=SortDirection.desc
+            The direction the replays are sorted in.
+        limit : int, optional
+            The maximum number of replays returned.
+
+        Returns
+        -------
+        list of ReplaySummary
+            The matching replays.
+
+        """
+        conditions = []
+        parameters = []
+
+        def where(condition: str, *values: Any) -> None:
+            conditions.append(condition)
+            parameters.extend(values)
+
+        if title != ...:
+            where("title LIKE ? ESCAPE '\\'", "%" + title.replace("\\", "\\\\")
+                  .replace("%", "\\%").replace("_", "\\_") + "%")
+        for name in (player_names if player_names != ... else ()):
+            where("id IN (SELECT replay_id FROM replay_players WHERE name = ?)", name)
+        for platform, player_id in (player_ids if player_ids != ... else ()):
+            where("id IN (SELECT replay_id FROM replay_players WHERE platform = ? AND"
+                  " player_id = ?)", p(platform), str(player_id))
+        if playlists != ...:
+            playlists = [p(playlist) for playlist in playlists]
+            where(f"playlist IN ({', '.join('?' * len(playlists))})", *playlists)
+        if season != ...:
+            where("season = ?", p(season))
+        if min_rank != ...:
+            where("min_rank >= ?", _tier(min_rank))
+        if max_rank != ...:
+            where("max_rank <= ?", _tier(max_rank))
+        if uploader != ...:
+            where("uploader = ?", self._uploader(uploader))
+        if group != ...:
+            where("id IN (SELECT replay_id FROM replay_groups WHERE group_id = ?)", group)
+        if map != ...:
+            where("map = ?", p(map))
+        for value, condition in ((created_before, "created < ?"),
+                                 (created_after, "created > ?"),
+                                 (replay_date_before, "date < ?"),
+                                 (replay_date_after, "date > ?")):
+            if value != ...:
+                where(condition, _timestamp(value))
+
+        order = "date" if p(sort_by) == enums.ReplaySortBy.replay_date.value else "created"
+        direction = "ASC" if p(sort_dir) == enums.SortDirection.asc.value else "DESC"
+        statement = (f"SELECT data FROM replays"
+                     f"{' WHERE ' + ' AND '.join(conditions) if conditions else ''}"
+                     f" ORDER BY {order} {direction}")
+        if limit != ...:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(statement, parameters).fetchall()
+        return [models.ReplaySummary(_json_loads(data)) for data, in rows]
+
+    def _uploader(self, uploader: Union[str, int]) -> str:
+        if uploader != "me":
+            return str(uploader)
+        if self._me is None:
+            if self._client is None:
+                raise ValueError("a client is required to resolve uploader=\"me\"")
+            response = self._client.ping()
+            response.raise_for_status()
+            self._me = response.json()["steam_id"]
+        return self._me
+
+    @staticmethod
+    def _query_key(filters: Dict[str, Any]) -> str:
+        return json.dumps({name: _plain(value) for name, value in filters.items()},
+                          sort_keys=True)
+
+    def _store(self, replays: List[Dict[str, Any]], key: Optional[str]) -> int:
+        """Store `replays` (and advance the watermark of the filters `key` to the newest of them)
+        in a single transaction.
+
+        """
+        rows = []
+        players = []
+        groups = []
+        newest = None
+        for replay in replays:
+            created = _timestamp(replay.get("created"))
+            if created is not None and (newest is None or created > newest[1]):
+                newest = (replay["created"], created)
+            rows.append((
+                replay["id"], replay.get("replay_title", replay.get("title")), created,
+                _timestamp(replay.get("date")), (replay.get("uploader") or {}).get("steam_id"),
+                replay.get("playlist_id"), _season(replay), replay.get("map_code"),
+                _tier(replay.get("min_rank")), _tier(replay.get("max_rank")),
+                json.dumps(replay)
+            ))
+            for color in ("blue", "orange"):
+                for player in (replay.get(color) or {}).get("players") or ():
+                    player_id = player.get("id") or {}
+                    players.append((replay["id"], player_id.get("platform"),
+                                    player_id.get("id"), player.get("name")))
+            groups.extend((replay["id"], group["id"]) for group in replay.get("groups") or ())
+
+        ids = [(row[0],) for row in rows]
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany("DELETE FROM replay_players WHERE replay_id = ?",
+                                             ids)
+                self._connection.executemany("DELETE FROM replay_groups WHERE replay_id = ?",
+                                             ids)
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO replays VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows)
+                self._connection.executemany("INSERT INTO replay_players VALUES (?, ?, ?, ?)",
+                                             players)
+                self._connection.executemany("INSERT INTO replay_groups VALUES (?, ?)", groups)
+                if key is not None and newest is not None:
+                    self._connection.execute(
+                        "INSERT OR IGNORE INTO watermarks VALUES (?, ?, ?)", (key, *newest))
+                    self._connection.execute(
+                        "UPDATE watermarks SET created = ?, timestamp = ? WHERE query = ? AND"
+                        " timestamp < ?", (*newest, key, newest[1]))
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return len(rows)
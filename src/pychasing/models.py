@@ -9,7 +9,40 @@ __license__ = "MIT License"
 __copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
 
 
+import datetime
 import io
+import re
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Iterator,
+    Optional,
+    Tuple
+)
+
+
+_fraction = re.compile(r"\.(\d+)")
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Convert an RFC3339 datetime string into a Unix timestamp (`None` if undefined).
+
+    """
+    if not value:
+        return None
+    value = _fraction.sub(lambda match: "." + match.group(1)[:6].ljust(6, "0"),
+                          value.replace("Z", "+00:00").replace("z", "+00:00"), count=1)
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def _rfc3339(timestamp: float) -> str:
+    """Convert a Unix timestamp into an RFC3339 datetime string (in UTC, with microseconds).
+
+    """
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S.%fZ")
 
 
 class Date(str):
@@ -54,3 +87,360 @@ class ReplayBuffer(io.BufferedReader):
     @property
     def name(self) -> str:
         return self._name
+
+
+class _Nested:
+    """A descriptor for a field holding a nested model (or a tuple of nested models). The raw JSON
+    is kept in the slot named `_<field>` until the field is first accessed, at which point the
+    model is built and the raw JSON is released.
+
+    """
+    def __init__(self, model: type, many: bool = False) -> None:
+        self._model = model
+        self._many = many
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = "_" + name
+
+    def __get__(self, instance: object, owner: type) -> Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self._slot)
+        if self._many and isinstance(value, list):
+            value = tuple(self._model(item) for item in value)
+            setattr(instance, self._slot, value)
+        elif not self._many and isinstance(value, dict):
+            value = self._model(value)
+            setattr(instance, self._slot, value)
+        return value
+
+
+class _Model:
+    """The base class of the result models. Each model copies the fields it knows about from the
+    decoded JSON into `__slots__` (fields missing from the JSON are set to `None`), and nothing
+    else is kept alive.
+
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in ("id", "name", "title")
+                           if name in dir(self.__class__))
+        return f"{self.__class__.__name__}({fields})"
+
+
+class _Fields(_Model):
+    """A model whose fields are all copied as they are from the decoded JSON object of the same
+    name.
+
+    """
+    __slots__ = ()
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        for name in self.__slots__:
+            setattr(self, name, data.get(name))
+
+
+def _build(model: type, data: Optional[Dict[str, Any]]) -> Any:
+    """Build `model` from `data` (`None` if undefined).
+
+    """
+    return None if data is None else model(data)
+
+
+class CoreStats(_Fields):
+    """The core statistics of a player or team (see `Stats.core`).
+
+    """
+    __slots__ = ("shots", "shots_against", "goals", "goals_against", "saves", "assists", "score",
+                 "mvp", "shooting_percentage")
+
+
+class BoostStats(_Fields):
+    """The boost statistics of a player or team (see `Stats.boost`).
+
+    """
+    __slots__ = ("bpm", "bcpm", "avg_amount", "amount_collected", "amount_stolen",
+                 "amount_collected_big", "amount_stolen_big", "amount_collected_small",
+                 "amount_stolen_small", "count_collected_big", "count_stolen_big",
+                 "count_collected_small", "count_stolen_small", "amount_overfill",
+                 "amount_overfill_stolen", "amount_used_while_supersonic", "time_zero_boost",
+                 "percent_zero_boost", "time_full_boost", "percent_full_boost",
+                 "time_boost_0_25", "time_boost_25_50", "time_boost_50_75", "time_boost_75_100",
+                 "percent_boost_0_25", "percent_boost_25_50", "percent_boost_50_75",
+                 "percent_boost_75_100")
+
+
+class MovementStats(_Fields):
+    """The movement statistics of a player or team (see `Stats.movement`).
+
+    """
+    __slots__ = ("avg_speed", "total_distance", "time_supersonic_speed", "time_boost_speed",
+                 "time_slow_speed", "time_ground", "time_low_air", "time_high_air",
+                 "time_powerslide", "count_powerslide", "avg_powerslide_duration",
+                 "avg_speed_percentage", "percent_slow_speed", "percent_boost_speed",
+                 "percent_supersonic_speed", "percent_ground", "percent_low_air",
+                 "percent_high_air")
+
+
+class PositioningStats(_Fields):
+    """The positioning statistics of a player or team (see `Stats.positioning`).
+
+    """
+    __slots__ = ("avg_distance_to_ball", "avg_distance_to_ball_possession",
+                 "avg_distance_to_ball_no_possession", "avg_distance_to_mates",
+                 "time_defensive_third", "time_neutral_third", "time_offensive_third",
+                 "time_defensive_half", "time_offensive_half", "time_behind_ball",
+                 "time_infront_ball", "time_most_back", "time_most_forward",
+                 "goals_against_while_last_defender", "time_closest_to_ball",
+                 "time_farthest_from_ball", "percent_defensive_third", "percent_offensive_third",
+                 "percent_neutral_third", "percent_defensive_half", "percent_offensive_half",
+                 "percent_behind_ball", "percent_infront_ball", "percent_most_back",
+                 "percent_most_forward", "percent_closest_to_ball", "percent_farthest_from_ball")
+
+
+class DemoStats(_Fields):
+    """The demolition statistics of a player or team (see `Stats.demo`).
+
+    """
+    __slots__ = ("inflicted", "taken")
+
+
+class BallStats(_Fields):
+    """The ball statistics of a team (see `Stats.ball`).
+
+    """
+    __slots__ = ("possession_time", "time_in_side")
+
+
+class Stats(_Model):
+    """The statistics of a player or team, by category (categories missing from the JSON are set
+    to `None`).
+
+    """
+    __slots__ = ("core", "boost", "movement", "positioning", "demo", "ball")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.core: Optional[CoreStats] = _build(CoreStats, data.get("core"))
+        self.boost: Optional[BoostStats] = _build(BoostStats, data.get("boost"))
+        self.movement: Optional[MovementStats] = _build(MovementStats, data.get("movement"))
+        self.positioning: Optional[PositioningStats] = _build(PositioningStats,
+                                                              data.get("positioning"))
+        self.demo: Optional[DemoStats] = _build(DemoStats, data.get("demo"))
+        self.ball: Optional[BallStats] = _build(BallStats, data.get("ball"))
+
+
+class AggregateStats(Stats):
+    """The cumulative (or per game average) statistics of a player or team of a group (see
+    `GroupPlayer.cumulative` and `GroupPlayer.game_average`).
+
+    """
+    __slots__ = ("games", "wins", "win_percentage", "play_duration")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self.games: Optional[int] = data.get("games")
+        self.wins: Optional[int] = data.get("wins")
+        self.win_percentage: Optional[float] = data.get("win_percentage")
+        self.play_duration: Optional[float] = data.get("play_duration")
+
+
+class Player(_Model):
+    """A player of a replay (see `Team.players`).
+
+    """
+    __slots__ = ("name", "platform", "player_id", "start_time", "end_time", "score", "mvp",
+                 "car_id", "car_name", "camera", "steering_sensitivity", "rank", "stats")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        player_id = data.get("id") or {}
+        self.name: Optional[str] = data.get("name")
+        self.platform: Optional[str] = player_id.get("platform")
+        self.player_id: Optional[str] = player_id.get("id")
+        self.start_time: Optional[float] = data.get("start_time")
+        self.end_time: Optional[float] = data.get("end_time")
+        self.score: Optional[int] = data.get("score")
+        self.mvp: Optional[bool] = data.get("mvp")
+        self.car_id: Optional[int] = data.get("car_id")
+        self.car_name: Optional[str] = data.get("car_name")
+        self.camera: Optional[Dict[str, Any]] = data.get("camera")
+        self.steering_sensitivity: Optional[float] = data.get("steering_sensitivity")
+        self.rank: Optional[Dict[str, Any]] = data.get("rank")
+        self.stats: Optional[Stats] = _build(Stats, data.get("stats"))
+
+
+class Team(_Model):
+    """One of the two teams (`blue` or `orange`) of a replay.
+
+    """
+    __slots__ = ("name", "color", "goals", "stats", "_players")
+    players = _Nested(Player, many=True)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.name: Optional[str] = data.get("name")
+        self.color: Optional[str] = data.get("color")
+        self.goals: Optional[int] = data.get("goals")
+        self.stats: Optional[Stats] = _build(Stats, data.get("stats"))
+        self._players = data.get("players") or []
+
+
+class ReplaySummary(_Model):
+    """A replay as listed by `list_replays`.
+
+    """
+    __slots__ = ("id", "link", "title", "created", "uploader", "status", "rocket_league_id",
+                 "map_code", "map_name", "playlist_id", "playlist_name", "duration", "overtime",
+                 "overtime_seconds", "season", "season_type", "date", "visibility", "min_rank",
+                 "max_rank", "groups", "_blue", "_orange")
+    blue = _Nested(Team)
+    orange = _Nested(Team)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.id: Optional[str] = data.get("id")
+        self.link: Optional[str] = data.get("link")
+        self.title: Optional[str] = data.get("title", data.get("replay_title"))
+        self.created: Optional[str] = data.get("created")
+        self.uploader: Optional[Dict[str, Any]] = data.get("uploader")
+        self.status: Optional[str] = data.get("status")
+        self.rocket_league_id: Optional[str] = data.get("rocket_league_id")
+        self.map_code: Optional[str] = data.get("map_code")
+        self.map_name: Optional[str] = data.get("map_name")
+        self.playlist_id: Optional[str] = data.get("playlist_id")
+        self.playlist_name: Optional[str] = data.get("playlist_name")
+        self.duration: Optional[int] = data.get("duration")
+        self.overtime: Optional[bool] = data.get("overtime")
+        self.overtime_seconds: Optional[int] = data.get("overtime_seconds")
+        self.season: Optional[int] = data.get("season")
+        self.season_type: Optional[str] = data.get("season_type")
+        self.date: Optional[str] = data.get("date")
+        self.visibility: Optional[str] = data.get("visibility")
+        self.min_rank: Optional[Dict[str, Any]] = data.get("min_rank")
+        self.max_rank: Optional[Dict[str, Any]] = data.get("max_rank")
+        self.groups: Optional[List[Dict[str, Any]]] = data.get("groups")
+        self._blue = data.get("blue")
+        self._orange = data.get("orange")
+
+
+class Replay(ReplaySummary):
+    """A replay as returned by `get_replay`, including its teams' players and statistics.
+    Unlike a `ReplaySummary`, the teams and players are built right away, so none of the
+    decoded JSON is kept alive.
+
+    """
+    __slots__ = ("match_guid", "match_type", "team_size", "date_has_timezone")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self.match_guid: Optional[str] = data.get("match_guid")
+        self.match_type: Optional[str] = data.get("match_type")
+        self.team_size: Optional[int] = data.get("team_size")
+        self.date_has_timezone: Optional[bool] = data.get("date_has_timezone")
+        for team in (self.blue, self.orange):
+            if team is not None:
+                team.players
+
+
+class GroupSummary(_Model):
+    """A group as listed by `list_groups`.
+
+    """
+    __slots__ = ("id", "link", "name", "created", "creator", "player_identification",
+                 "team_identification", "shared", "direct_replays", "indirect_replays")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.id: Optional[str] = data.get("id")
+        self.link: Optional[str] = data.get("link")
+        self.name: Optional[str] = data.get("name")
+        self.created: Optional[str] = data.get("created")
+        self.creator: Optional[Dict[str, Any]] = data.get("creator")
+        self.player_identification: Optional[str] = data.get("player_identification")
+        self.team_identification: Optional[str] = data.get("team_identification")
+        self.shared: Optional[bool] = data.get("shared")
+        self.direct_replays: Optional[int] = data.get("direct_replays")
+        self.indirect_replays: Optional[int] = data.get("indirect_replays")
+
+
+class GroupPlayer(_Model):
+    """A player of a group along with their statistics over the group's replays (see
+    `Group.players`).
+
+    """
+    __slots__ = ("name", "platform", "player_id", "team", "cumulative", "game_average")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.name: Optional[str] = data.get("name")
+        self.platform: Optional[str] = data.get("platform")
+        self.player_id: Optional[str] = data.get("id")
+        self.team: Optional[str] = data.get("team")
+        self.cumulative: Optional[AggregateStats] = _build(AggregateStats, data.get("cumulative"))
+        self.game_average: Optional[AggregateStats] = _build(AggregateStats, data.get("game_average"))
+
+
+class GroupTeam(_Model):
+    """A team of a group along with its statistics over the group's replays (see
+    `Group.teams`).
+
+    """
+    __slots__ = ("name", "players", "cumulative", "game_average")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.name: Optional[str] = data.get("name")
+        self.players: Tuple[GroupPlayer, ...] = tuple(
+            GroupPlayer(player) for player in data.get("players") or ())
+        self.cumulative: Optional[AggregateStats] = _build(AggregateStats, data.get("cumulative"))
+        self.game_average: Optional[AggregateStats] = _build(AggregateStats, data.get("game_average"))
+
+
+class Group(GroupSummary):
+    """A group as returned by `get_group`, including its cumulative player and team
+    statistics.
+
+    """
+    __slots__ = ("status", "players", "teams")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self.status: Optional[str] = data.get("status")
+        self.players: Tuple[GroupPlayer, ...] = tuple(
+            GroupPlayer(player) for player in data.get("players") or ())
+        self.teams: Tuple[GroupTeam, ...] = tuple(
+            GroupTeam(team) for team in data.get("teams") or ())
+
+
+class ReplayPage(_Model):
+    """A page of replays as returned by `list_replays`. Iterating over the page yields its
+    `ReplaySummary` items, which are only built once they are accessed.
+
+    """
+    __slots__ = ("count", "next", "_items")
+    items = _Nested(ReplaySummary, many=True)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.count: Optional[int] = data.get("count")
+        self.next: Optional[str] = data.get("next")
+        self._items = data.get("list") or []
+
+    def __iter__(self) -> Iterator[ReplaySummary]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class GroupPage(_Model):
+    """A page of groups as returned by `list_groups`. Iterating over the page yields its
+    `GroupSummary` items, which are only built once they are accessed.
+
+    """
+    __slots__ = ("next", "_items")
+    items = _Nested(GroupSummary, many=True)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.next: Optional[str] = data.get("next")
+        self._items = data.get("list") or []
+
+    def __iter__(self) -> Iterator[GroupSummary]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,204 @@
+"""A client that spreads requests over several tokens.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+from . import enums
+from .client import Client
+import requests
+import urllib.parse
+import collections
+import threading
+import math
+
+from typing import (
+    Union,
+    Tuple,
+    Iterable,
+    Dict,
+    Any,
+    Optional
+)
+
+
+# the write operations that act on an existing replay or group, which must be made with the
+# token that owns it
+_OWNED_WRITES = {
+    enums.Operation.delete_replay: "replays",
+    enums.Operation.patch_replay: "replays",
+    enums.Operation.delete_group: "groups",
+    enums.Operation.patch_group: "groups"
+}
+
+# the write operations that create a replay or group (which is then owned by the token used)
+_CREATING_WRITES = {
+    enums.Operation.upload_replay: "replays",
+    enums.Operation.create_group: "groups"
+}
+
+
+class ClientPool(Client):
+    """A `Client` that spreads its requests over several tokens (each with its own Patreon tier
+    and rate limiters), so that their combined quota can be used. It has every method of
+    `Client`.
+
+    Read requests are sent with the token that has the most budget left for the operation
+    (the one whose rate limiter would let the request through the soonest, counting the requests
+    already waiting on it, then the one with the most calls left in its hourly quota). Uploads and group creations are made with the first
+    token, and deletions and edits of a replay or group are made with the token that owns it.
+    Ownership is remembered for replays and groups created through the pool, and is otherwise
+    looked up by matching the uploader (or creator) against each token's `ping` response.
+
+    """
+    def __init__(self, tokens: Iterable[Tuple[str, Union[str, enums.PatreonTier]]],
+                 **kwargs: Any) -> None:
+        """
+        Arguments
+        ---------
+        tokens : iterable of tuple of str and (enums.PatreonTier or str)
+            The ballchasing API keys along with their holder's Patreon tier. The first token is
+            used for uploads and group creations.
+        **kwargs : keywords
+            Any other argument accepted by `Client` (e.g. `cache` or `retry`), which is used for
+            every token.
+
+        Raises
+        ------
+        ValueError
+            If no tokens are given, or if a Patreon tier is not valid.
+
+        """
+        self._clients = collections.OrderedDict(
+            (token, Client(token, patreon_tier=patreon_tier, **kwargs))
+            for token, patreon_tier in tokens)
+        if not self._clients:
+            raise ValueError("at least one token must be provided")
+        first = next(iter(self._clients.values()))
+        # the pool's own state is that of a client of the first token, without rate limiters, a
+        # cache or hooks (requests are sent through the client of each token, which has them)
+        super().__init__(first._token, False, first._patreon_tier, api_url=first._api_url,
+                         transport=first._transport, json_decoder=first._json_decoder)
+        self._owners = collections.OrderedDict()
+        self._steam_ids = {}
+        self._usage = collections.Counter()
+        # the number of requests routed to each token (by operation) that have not completed
+        self._pending = collections.Counter()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the client of every token.
+
+        """
+        for client in self._clients.values():
+            client.close()
+
+    def usage(self) -> Dict[str, Dict[enums.Operation, int]]:
+        """Get the number of requests made with each token.
+
+        Returns
+        -------
+        dict of str to dict of Operation to int
+            The number of requests made for each operation, by token.
+
+        """
+        usage = {token: {} for token in self._clients}
+        with self._lock:
+            for (token, operation), count in self._usage.items():
+                usage[token][operation] = count
+        return usage
+
+    def _default_concurrency(self, operation: enums.Operation) -> int:
+        return sum(client._default_concurrency(operation) for client in self._clients.values())
+
+    def _least_busy(self, operation: enums.Operation) -> str:
+        """Get the token with the most budget left for `operation`, counting the requests that
+        were already routed to each token but have not completed (the lock must be held).
+
+        """
+        def budget(token: str) -> Tuple[float, float]:
+            client = self._clients[token]
+            pending = self._pending[token, operation]
+            rate_limiter = client._rate_limiters.get(operation)
+            if rate_limiter is None:
+                return pending, -math.inf
+            remaining = rate_limiter.remaining()
+            # the pending requests take up the next call slots of the token
+            wait = rate_limiter.peek() + pending / client._default_concurrency(operation)
+            return wait, -(math.inf if remaining is None else remaining)
+
+        return min(self._clients, key=budget)
+
+    def _steam_id(self, token: str) -> Optional[str]:
+        """Get (and remember) the Steam ID of the holder of `token`.
+
+        """
+        if token not in self._steam_ids:
+            response = self._clients[token].ping(print_error=False)
+            if not response.ok:
+                return None
+            self._steam_ids[token] = response.json().get("steam_id")
+        return self._steam_ids[token]
+
+    def _owner(self, kind: str, id: str) -> str:
+        """Get the token that owns the replay or group (`kind`) with the given ID, falling back
+        to the first token if the owner cannot be found.
+
+        """
+        with self._lock:
+            if (kind, id) in self._owners:
+                return self._owners[kind, id]
+        get = self.get_replay if kind == "replays" else self.get_group
+        response = get(id, print_error=False)
+        if response.ok:
+            owner = response.json().get("uploader" if kind == "replays" else "creator") or {}
+            for token in self._clients:
+                if owner.get("steam_id") and self._steam_id(token) == owner["steam_id"]:
+                    self._remember(kind, id, token)
+                    return token
+        return self._token
+
+    def _remember(self, kind: str, id: str, token: str) -> None:
+        with self._lock:
+            self._owners[kind, id] = token
+            self._owners.move_to_end((kind, id))
+            while len(self._owners) > 65536:
+                self._owners.popitem(last=False)
+
+    def _request(self, operation: enums.Operation, method: str, url: str,
+                 headers: Dict[str, str], *, print_error: bool, **kwargs) -> requests.Response:
+        """Send the request through the client of the token chosen for it.
+
+        """
+        if operation in _OWNED_WRITES:
+            path = urllib.parse.urlsplit(url).path.rstrip("/")
+            token = self._owner(_OWNED_WRITES[operation], path.rsplit("/", 1)[-1])
+        elif operation in _CREATING_WRITES:
+            token = self._token
+        else:
+            token = None
+        with self._lock:
+            if token is None:
+                token = self._least_busy(operation)
+            self._usage[token, operation] += 1
+            self._pending[token, operation] += 1
+        try:
+            response = self._clients[token]._request(
+                operation, method, url, {**headers, "Authorization": token},
+                print_error=print_error, **kwargs)
+        finally:
+            with self._lock:
+                self._pending[token, operation] -= 1
+        if operation in _CREATING_WRITES and response.status_code in (201, 409):
+            try:
+                id = response.json().get("id")
+            except ValueError:
+                id = None
+            if id:
+                self._remember(_CREATING_WRITES[operation], id, token)
+        return response
@@ -0,0 +1,616 @@
+"""Rate limiters used by ``client`` and ``aioclient``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import email.utils
+import collections
+import threading
+import asyncio
+import sqlite3
+import json
+import time
+import os
+import rlim
+
+from . import enums
+
+from typing import (
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    Dict,
+    List
+)
+
+
+Criteria = Tuple[Union[rlim.Rate, rlim.Limit], ...]
+
+
+def _next_slot(criteria: Criteria, slots: Sequence[float], earliest: float,
+               scale: float) -> float:
+    """Get the first slot (no earlier than `earliest`) at which a call can be made without
+    breaking `criteria`, given the (ascending) slots of the previous calls. The spacing of the
+    `rlim.Rate` criteria is divided by `scale`.
+
+    """
+    slot = earliest
+    if slots:
+        slot = max(slot, slots[-1])
+    for c in criteria:
+        if isinstance(c, rlim.Rate):
+            if slots:
+                slot = max(slot, slots[-1] + c.rate / scale)
+        elif len(slots) >= c.calls:
+            slot = max(slot, slots[-c.calls] + c.seconds)
+    return slot
+
+
+class RateLimitBackend:
+    """The interface implemented by every shared rate limiter backend, which keeps the call
+    slots of rate limiters in a store shared by many processes (or hosts) so that together they
+    stay within the criteria. Slots are `time.time()` timestamps. Backends must be safe to use
+    from multiple threads.
+
+    """
+    def reserve(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        """Atomically reserve the next available call slot of `key`.
+
+        Parameters
+        ----------
+        key : str
+            The key of the shared rate limiter (e.g. one per token and operation).
+        criteria : tuple of rlim.Rate or rlim.Limit
+            The rate limit criteria.
+        scale : float
+            The fraction of the `rlim.Rate` criteria calls are let through at.
+        earliest : float
+            The earliest slot that may be reserved.
+
+        Returns
+        -------
+        float
+            The number of seconds the caller must wait before making its call.
+
+        """
+        raise NotImplementedError
+
+    def peek(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        """Get the number of seconds a call of `key` reserved now would have to wait, without
+        reserving it. Takes the same arguments as `reserve`.
+
+        """
+        raise NotImplementedError
+
+    def block(self, key: str, until: float) -> None:
+        """Prevent any slot of `key` earlier than `until` from being reserved.
+
+        """
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """A shared rate limiter backend kept in memory, which coordinates the rate limiters of the
+    current process that use it (e.g. several clients using the same token).
+
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._blocks = {}
+
+    def reserve(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        maxlen = max([c.calls for c in criteria if isinstance(c, rlim.Limit)] or [1])
+        with self._lock:
+            current = time.time()
+            slots = self._slots.get(key)
+            if slots is None or slots.maxlen != maxlen:
+                slots = self._slots[key] = collections.deque(slots or (), maxlen=maxlen)
+            slot = _next_slot(criteria, slots, max(current, earliest,
+                                                   self._blocks.get(key, 0)), scale)
+            slots.append(slot)
+        return slot - current
+
+    def peek(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        with self._lock:
+            current = time.time()
+            slot = _next_slot(criteria, self._slots.get(key, ()), max(
+                current, earliest, self._blocks.get(key, 0)), scale)
+        return slot - current
+
+    def block(self, key: str, until: float) -> None:
+        with self._lock:
+            self._blocks[key] = max(self._blocks.get(key, 0), until)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """A shared rate limiter backend stored in a SQLite database, which coordinates every
+    process that opens the same file (each reservation is a write transaction). Since the state
+    lives on disk, it also persists across restarts.
+
+    The database uses SQLite's default rollback journal, which relies on the file locking of
+    the filesystem. Network filesystems often implement that locking poorly, so sharing the file
+    between hosts (which would also need their clocks to be in sync) is not reliable.
+
+    """
+    def __init__(self, path: Union[str, os.PathLike], timeout: float = 30,
+                 wal: bool = False) -> None:
+        """
+        Arguments
+        ---------
+        path : str or PathLike
+            The path of the database file (created if it does not exist).
+        timeout : float, optional, default=30
+            The number of seconds to wait for another process to release the database.
+        wal : bool, optional, default=False
+            If `True`, the database is switched to SQLite's write-ahead log, which lets readers
+            and the writer proceed concurrently. It relies on shared memory, so every process
+            must run on the same host as the file (not on a network filesystem). The mode is
+            stored in the file, so it applies to every process once set.
+
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), timeout=timeout,
+                                           check_same_thread=False, isolation_level=None)
+        if wal:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS slots (key TEXT, slot REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS slots_key ON slots (key, slot)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS blocks (key TEXT PRIMARY KEY, until REAL)")
+
+    def reserve(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        count = max([c.calls for c in criteria if isinstance(c, rlim.Limit)] or [1])
+        horizon = max(c.seconds if isinstance(c, rlim.Limit) else c.rate / scale
+                      for c in criteria)
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                current = time.time()
+                self._connection.execute("DELETE FROM slots WHERE key = ? AND slot < ?",
+                                         (key, current - horizon))
+                block = self._connection.execute("SELECT until FROM blocks WHERE key = ?",
+                                                 (key,)).fetchone()
+                slots = [row[0] for row in self._connection.execute(
+                    "SELECT slot FROM slots WHERE key = ? ORDER BY slot DESC LIMIT ?",
+                    (key, count))]
+                slots.reverse()
+                slot = _next_slot(criteria, slots, max(current, earliest, block[0] if block
+                                                       else 0), scale)
+                self._connection.execute("INSERT INTO slots VALUES (?, ?)", (key, slot))
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return slot - current
+
+    def peek(self, key: str, criteria: Criteria, scale: float, earliest: float) -> float:
+        count = max([c.calls for c in criteria if isinstance(c, rlim.Limit)] or [1])
+        with self._lock:
+            current = time.time()
+            block = self._connection.execute("SELECT until FROM blocks WHERE key = ?",
+                                             (key,)).fetchone()
+            slots = [row[0] for row in self._connection.execute(
+                "SELECT slot FROM slots WHERE key = ? ORDER BY slot DESC LIMIT ?", (key, count))]
+        slots.reverse()
+        slot = _next_slot(criteria, slots, max(current, earliest, block[0] if block else 0),
+                          scale)
+        return slot - current
+
+    def block(self, key: str, until: float) -> None:
+        with self._lock:
+            self._connection.execute("INSERT OR IGNORE INTO blocks VALUES (?, ?)", (key, until))
+            self._connection.execute("UPDATE blocks SET until = MAX(until, ?) WHERE key = ?",
+                                     (until, key))
+
+    def close(self) -> None:
+        """Close the connection to the database.
+
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class RateLimiter:
+    """A rate limiter that reserves a call slot as soon as it is entered, so that concurrent
+    callers (threads or asyncio tasks) are spaced out according to the given criteria instead of
+    all being let through at once.
+
+    Instances can be used as both synchronous and asynchronous context managers, and can therefore
+    be attached to functions wrapped with `rlim.placeholder`. When used asynchronously, the
+    required wait is awaited (`asyncio.sleep`) instead of blocking the event loop.
+
+    """
+    def __init__(self, *criteria: Union[rlim.Rate, rlim.Limit], safestart: bool = False,
+                 backend: RateLimitBackend = ..., key: str = ...) -> None:
+        """
+        Arguments
+        ---------
+        *criteria : rlim.Rate or rlim.Limit
+            The rate limit criteria (e.g. the values of a `PatreonTier`).
+        safestart : bool, optional, default=False
+            If `True`, the rate limiter will start out as fully maxed out on calls. This is
+            ignored if `backend` is defined.
+        backend : RateLimitBackend, optional
+            If defined, call slots are reserved in the given shared backend (under `key`)
+            instead of in memory, so that every rate limiter using the same backend and key
+            (possibly in other processes) is limited together.
+        key : str, optional
+            The key of the rate limiter in `backend`. Required if `backend` is defined.
+
+        Raises
+        ------
+        ValueError
+            If no criteria are given, or if `backend` is defined without `key`.
+
+        """
+        if not criteria:
+            raise ValueError("at least one criteria must be provided")
+        if backend != ... and key == ...:
+            raise ValueError("\"key\" must be provided along with \"backend\"")
+        self._criteria = criteria
+        self._backend = None if backend == ... else backend
+        self._key = key
+        maxlen = max([c.calls for c in criteria if isinstance(c, rlim.Limit)] or [1])
+        self._stack = collections.deque([time.monotonic()] * maxlen if safestart else [],
+                                        maxlen=maxlen)
+        self._lock = threading.Lock()
+        # the fraction of the `Rate` criteria calls are let through at, and the (monotonic) time
+        # before which no call is let through (both only changed by `AdaptiveRateLimiter`)
+        self._scale = 1.0
+        self._blocked_until = 0.0
+
+    def reserve(self) -> float:
+        """Reserve the next available call slot.
+
+        Returns
+        -------
+        float
+            The number of seconds the caller must wait before making its call.
+
+        """
+        with self._lock:
+            current = time.monotonic()
+            if self._backend:
+                earliest = self._blocked_until + time.time() - current
+                return self._backend.reserve(self._key, self._criteria, self._scale, earliest)
+            slot = _next_slot(self._criteria, self._stack, max(current, self._blocked_until),
+                              self._scale)
+            self._stack.append(slot)
+            return slot - current
+
+    def peek(self) -> float:
+        """Get the number of seconds a call reserved now would have to wait, without reserving
+        it. When a shared backend is used, the backend is asked for its next free slot.
+
+        """
+        with self._lock:
+            current = time.monotonic()
+            if self._backend:
+                earliest = self._blocked_until + time.time() - current
+                return self._backend.peek(self._key, self._criteria, self._scale, earliest)
+            return _next_slot(self._criteria, self._stack, max(current, self._blocked_until),
+                              self._scale) - current
+
+    def remaining(self) -> Optional[int]:
+        """Get the number of calls left in the tightest `rlim.Limit` window, or `None` if the
+        rate limiter has no `rlim.Limit` criteria (or uses a shared backend).
+
+        """
+        with self._lock:
+            current = time.monotonic()
+            if self._backend:
+                return None
+            remaining = [c.calls - sum(1 for slot in self._stack if slot > current - c.seconds)
+                         for c in self._criteria if isinstance(c, rlim.Limit)]
+            return max(0, min(remaining)) if remaining else None
+
+    def history(self) -> List[float]:
+        """Get the reserved call slots that still count against the rate limiter's criteria, as
+        `time.time()` timestamps (which, unlike the monotonic times used internally, remain
+        meaningful in another process).
+
+        """
+        with self._lock:
+            offset = time.time() - time.monotonic()
+            return [slot + offset for slot in self._stack]
+
+    def restore(self, history: Iterable[float]) -> None:
+        """Replace the rate limiter's call slots with `history` (as returned by `history`), so
+        that calls made before a restart keep counting against the criteria.
+
+        Parameters
+        ----------
+        history : iterable of float
+            The `time.time()` timestamps of the calls.
+
+        """
+        with self._lock:
+            offset = time.monotonic() - time.time()
+            self._stack.clear()
+            self._stack.extend(sorted(slot + offset for slot in history))
+
+    def hold(self) -> float:
+        """Get the number of seconds callers must still wait after their reserved slot, in case
+        the rate limiter was blocked (see `AdaptiveRateLimiter`) after the slot was reserved.
+
+        """
+        with self._lock:
+            return self._blocked_until - time.monotonic()
+
+    def feedback(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Report the response of a call made through the rate limiter. This does nothing for a
+        plain `RateLimiter`.
+
+        Parameters
+        ----------
+        status_code : int
+            The status code of the response.
+        headers : mapping of str to str
+            The (case-insensitive) headers of the response.
+
+        """
+        return
+
+    def acquire(self) -> None:
+        """Reserve the next available call slot and sleep until it is reached.
+
+        """
+        duration = self.reserve()
+        while duration > 0:
+            time.sleep(duration)
+            duration = self.hold()
+
+    async def acquire_async(self) -> None:
+        """Reserve the next available call slot and wait (without blocking the event loop)
+        until it is reached.
+
+        """
+        duration = self.reserve()
+        while duration > 0:
+            await asyncio.sleep(duration)
+            duration = self.hold()
+
+    def __enter__(self) -> None:
+        self.acquire()
+
+    def __exit__(self, *_) -> None:
+        return
+
+    async def __aenter__(self) -> None:
+        await self.acquire_async()
+
+    async def __aexit__(self, *_) -> None:
+        return
+
+
+class PriorityScheduler:
+    """Lets callers through a `RateLimiter` one call slot at a time, handing each free slot to a
+    waiting caller chosen by priority. Rather than reserving a slot as soon as they arrive
+    (which puts a late, urgent call behind every call already queued), callers wait in a queue
+    per `enums.Priority`, and the queue served next is chosen by (smooth) weighted round robin.
+    Higher priorities therefore get most slots while lower priorities are never starved.
+
+    """
+    def __init__(self, rate_limiter: RateLimiter,
+                 weights: Mapping[enums.Priority, int] = ...) -> None:
+        """
+        Arguments
+        ---------
+        rate_limiter : RateLimiter
+            The rate limiter slots are reserved from.
+        weights : dict of Priority to int, optional
+            The share of slots given to each priority while callers of several priorities are
+            waiting. Defaults to 16 for `interactive`, 4 for `normal` and 1 for `bulk`.
+
+        """
+        if weights == ...:
+            weights = {enums.Priority.interactive: 16, enums.Priority.normal: 4,
+                       enums.Priority.bulk: 1}
+        self._rate_limiter = rate_limiter
+        self._weights = dict(weights)
+        self._queues = {priority: collections.deque() for priority in self._weights}
+        self._credits = dict.fromkeys(self._weights, 0)
+        self._granted = {}
+        self._condition = threading.Condition()
+
+    def _next(self) -> object:
+        """Pop the waiting caller that gets the next slot.
+
+        """
+        active = [priority for priority, queue in self._queues.items() if queue]
+        total = sum(self._weights[priority] for priority in active)
+        for priority in self._queues:
+            if priority in active:
+                self._credits[priority] += self._weights[priority]
+            else:
+                self._credits[priority] = 0
+        chosen = max(active, key=self._credits.__getitem__)
+        self._credits[chosen] -= total
+        return self._queues[chosen].popleft()
+
+    def acquire(self, priority: enums.Priority = enums.Priority.normal) -> None:
+        """Wait (blocking) until the caller's call may be made.
+
+        Parameters
+        ----------
+        priority : Priority, optional, default=Priority.normal
+            The priority of the call.
+
+        """
+        ticket = object()
+        with self._condition:
+            self._queues[priority].append(ticket)
+            self._condition.notify_all()
+            while ticket not in self._granted:
+                if self._granted:
+                    # the last slot has not been picked up yet
+                    self._condition.wait()
+                    continue
+                wait = self._rate_limiter.peek()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                self._granted[self._next()] = self._rate_limiter.reserve()
+                self._condition.notify_all()
+            duration = self._granted.pop(ticket)
+            self._condition.notify_all()
+        while duration > 0:
+            time.sleep(duration)
+            duration = self._rate_limiter.hold()
+
+
+def load_state(path: Union[str, os.PathLike], namespace: str) -> Dict[str, List[float]]:
+    """Load the rate limiter histories saved under `namespace` by `save_state`.
+
+    Parameters
+    ----------
+    path : str or PathLike
+        The path of the state file.
+    namespace : str
+        The namespace the histories were saved under (e.g. one per token).
+
+    Returns
+    -------
+    dict of str to list of float
+        The history of each saved rate limiter, by name. This is empty if the file does not
+        exist or cannot be read.
+
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file).get(namespace, {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_state(path: Union[str, os.PathLike], namespace: str,
+               rate_limiters: Mapping[str, RateLimiter]) -> None:
+    """Save the history of each rate limiter in `rate_limiters` under `namespace`, keeping the
+    histories saved under other namespaces. The file is replaced atomically.
+
+    Parameters
+    ----------
+    path : str or PathLike
+        The path of the state file.
+    namespace : str
+        The namespace to save the histories under (e.g. one per token).
+    rate_limiters : mapping of str to RateLimiter
+        The rate limiters, by name.
+
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        state = {}
+    if not isinstance(state, dict):
+        state = {}
+    state[namespace] = {name: rate_limiter.history()
+                        for name, rate_limiter in rate_limiters.items()}
+    temporary_path = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+    os.replace(temporary_path, path)
+
+
+def seconds_until(value: Optional[str], now: float) -> Optional[float]:
+    """Parse a `Retry-After` or rate limit reset header, which may be a number of seconds, a Unix
+    timestamp or an HTTP date, into a number of seconds from `now` (a `time.time()` value).
+
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            return email.utils.parsedate_to_datetime(value).timestamp() - now
+        except (TypeError, ValueError):
+            return None
+    # values past a year are timestamps rather than durations
+    return seconds - now if seconds > 31536000 else seconds
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """A `RateLimiter` that also adapts to the server's feedback (see `feedback`). When a call
+    is rejected with `429 Too Many Requests` (or `503 Service Unavailable`), every caller waits
+    out the `Retry-After` period (or the reset of an exhausted `X-RateLimit-Remaining` quota),
+    and the effective rate of the `rlim.Rate` criteria is multiplied by `decrease`. Each
+    successful call then adds `increase` back to it, until the given criteria are reached again
+    (additive-increase/multiplicative-decrease).
+
+    """
+    def __init__(self, *criteria: Union[rlim.Rate, rlim.Limit], safestart: bool = False,
+                 decrease: float = 0.5, increase: float = 0.05, minimum: float = 0.05,
+                 retry_after: float = 1, backend: RateLimitBackend = ...,
+                 key: str = ...) -> None:
+        """
+        Arguments
+        ---------
+        *criteria : rlim.Rate or rlim.Limit
+            The rate limit criteria (e.g. the values of a `PatreonTier`).
+        safestart : bool, optional, default=False
+            If `True`, the rate limiter will start out as fully maxed out on calls. This is
+            ignored if `backend` is defined.
+        decrease : float, optional, default=0.5
+            The factor the effective rate is multiplied by after a rejected call.
+        increase : float, optional, default=0.05
+            The fraction of the full rate added back to the effective rate after each successful
+            call.
+        minimum : float, optional, default=0.05
+            The lowest fraction of the full rate the effective rate is lowered to.
+        retry_after : float, optional, default=1
+            The number of seconds callers wait after a rejected call that did not say how long
+            to wait for.
+        backend : RateLimitBackend, optional
+            See `RateLimiter`. Waits caused by rejected calls are shared through the backend as
+            well.
+        key : str, optional
+            See `RateLimiter`.
+
+        Raises
+        ------
+        ValueError
+            If no criteria are given, or if `backend` is defined without `key`.
+
+        """
+        super().__init__(*criteria, safestart=safestart, backend=backend, key=key)
+        self._decrease = decrease
+        self._increase = increase
+        self._minimum = minimum
+        self._retry_after = retry_after
+
+    @property
+    def scale(self) -> float:
+        """The current fraction of the full rate that calls are let through at.
+
+        """
+        return self._scale
+
+    def feedback(self, status_code: int, headers: Mapping[str, str]) -> None:
+        now = time.time()
+        wait = None
+        if headers.get("X-RateLimit-Remaining") == "0":
+            wait = seconds_until(headers.get("X-RateLimit-Reset"), now)
+        with self._lock:
+            if status_code in (429, 503):
+                self._scale = max(self._minimum, self._scale * self._decrease)
+                retry_after = seconds_until(headers.get("Retry-After"), now)
+                wait = max(wait or 0, retry_after if retry_after is not None
+                           else self._retry_after)
+            elif 200 <= status_code < 400:
+                self._scale = min(1.0, self._scale + self._increase)
+            if wait and wait > 0:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+        if wait and wait > 0 and self._backend:
+            self._backend.block(self._key, time.time() + wait)
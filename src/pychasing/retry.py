@@ -0,0 +1,101 @@
+"""Retry policies used by ``client``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import random
+import requests
+
+from typing import (
+    Iterable,
+    Optional,
+    Tuple,
+    Type
+)
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried, and how long to wait before each retry.
+
+    The wait before retry `n` (starting at 0) is `backoff_factor * 2 ** n` seconds, capped at
+    `backoff_max`. With `jitter`, a random wait between zero and that value is used instead
+    ("full jitter"), so that many clients failing at once do not retry in lockstep. A
+    `Retry-After` header on the failed response is always respected.
+
+    """
+    def __init__(self, max_attempts: int = 4, backoff_factor: float = 0.5,
+                 backoff_max: float = 60, jitter: bool = True,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 exceptions: Tuple[Type[BaseException], ...] = (requests.ConnectionError,
+                                                                requests.Timeout),
+                 methods: Iterable[str] = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")) -> None:
+        """
+        Arguments
+        ---------
+        max_attempts : int, optional, default=4
+            The maximum number of attempts (including the first) made for a single request.
+        backoff_factor : float, optional, default=0.5
+            The number of seconds waited before the first retry, which doubles on every retry.
+        backoff_max : float, optional, default=60
+            The maximum number of seconds waited before a retry.
+        jitter : bool, optional, default=True
+            If `True`, a random wait of up to the backoff is used.
+        statuses : iterable of int, optional
+            The response status codes that are retried. Defaults to 429, 500, 502, 503 and 504.
+        exceptions : tuple of exception types, optional
+            The exceptions that are retried. Defaults to connection errors and timeouts.
+        methods : iterable of str, optional
+            The HTTP methods that are retried. Defaults to the idempotent methods, so that (for
+            example) replay uploads and group creations are not sent twice. `POST` can safely
+            be added for `upload_replay`, since ballchasing rejects duplicate replays.
+
+        Raises
+        ------
+        ValueError
+            If `max_attempts` is less than 1.
+
+        """
+        if max_attempts < 1:
+            raise ValueError("\"max_attempts\" must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def retries(self, method: str, attempt: int) -> bool:
+        """Return `True` if a request with the given method may be retried after its `attempt`th
+        attempt (starting at 1) failed.
+
+        """
+        return attempt < self.max_attempts and method.upper() in self.methods
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """Get the number of seconds to wait before retry `retry` (starting at 0).
+
+        Parameters
+        ----------
+        retry : int
+            The number of retries already made.
+        retry_after : float, optional
+            The number of seconds the server asked to wait for (if any), which the wait is never
+            shorter than.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait.
+
+        """
+        backoff = min(self.backoff_max, self.backoff_factor * 2 ** retry)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return max(backoff, retry_after or 0)
@@ -0,0 +1,272 @@
+"""Transports used by ``client`` to send requests, including ones that record requests to (and
+play them back from) an on-disk cassette.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import requests
+import requests.adapters
+import collections
+import threading
+import datetime
+import base64
+import gzip
+import json
+import time
+import io
+import os
+
+from typing import (
+    Optional,
+    Iterator,
+    Union,
+    Tuple,
+    Dict,
+    List,
+    Any
+)
+
+
+class Transport:
+    """The interface implemented by every transport. Transports must be safe to use from
+    multiple threads.
+
+    """
+    def request(self, method: str, url: str, headers: Dict[str, str],
+                **kwargs: Any) -> requests.Response:
+        """Send a request, taking the same keyword arguments as `requests.Session.request`.
+
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the transport's resources (e.g. pooled connections). Closing a transport more
+        than once has no effect.
+
+        """
+
+
+class SessionTransport(Transport):
+    """The default transport, which sends every request through a single pooled
+    `requests.Session`, so connections are reused between requests.
+
+    """
+    def __init__(self, *, pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False, keep_alive: bool = True) -> None:
+        """
+        Arguments
+        ---------
+        pool_connections : int, optional, default=10
+            The number of per-host connection pools kept by the session.
+        pool_maxsize : int, optional, default=10
+            The maximum number of connections kept open to a single host.
+        pool_block : bool, optional, default=False
+            If `True`, requests will block until a pooled connection is free instead of opening
+            a new (non-pooled) connection once `pool_maxsize` connections are in use.
+        keep_alive : bool, optional, default=True
+            If `False`, every request is sent with `Connection: close`, so connections are not
+            reused between requests.
+
+        """
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections,
+                                                pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    def request(self, method: str, url: str, headers: Dict[str, str],
+                **kwargs: Any) -> requests.Response:
+        return self._session.request(method, url, headers=headers, **kwargs)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def _open(path: Union[str, os.PathLike], mode: str) -> Any:
+    """Open a cassette, which is gzip compressed if its name ends with `.gz`.
+
+    """
+    path = os.fspath(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _key(method: str, url: str, headers: Dict[str, str]) -> Tuple[str, str, Optional[str]]:
+    """Get the key a request is matched on during playback. The `Authorization` header is
+    deliberately not part of it (and never recorded).
+
+    """
+    return method.upper(), url, headers.get("Range")
+
+
+class RecordingTransport(Transport):
+    """A transport that sends requests through another transport, and appends every request and
+    response pair to a cassette, which can then be served by a `PlaybackTransport`.
+
+    The cassette holds one JSON object per line (gzip compressed if `path` ends with `.gz`),
+    with the request's method, URL and `Range` header, and the response's status, headers, body
+    and response time. Request bodies and the `Authorization` header are not recorded. Bodies of
+    streamed responses (e.g. `download_replay`) are read in full before being returned, and can
+    then still be read from the response's `raw`, as with the responses of a
+    `PlaybackTransport`.
+
+    """
+    def __init__(self, path: Union[str, os.PathLike], transport: Transport = ..., *,
+                 append: bool = False) -> None:
+        """
+        Arguments
+        ---------
+        path : str or PathLike
+            The path of the cassette.
+        transport : Transport, optional
+            The transport requests are sent through. Defaults to a `SessionTransport`.
+        append : bool, optional, default=False
+            If `True`, requests are added to an existing cassette instead of replacing it.
+
+        """
+        self._transport = SessionTransport() if transport == ... else transport
+        self._file = _open(path, "a" if append else "w")
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Dict[str, str],
+                **kwargs: Any) -> requests.Response:
+        start = time.perf_counter()
+        response = self._transport.request(method, url, headers, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - start
+        # the body can still be read from `raw` (e.g. by `Client.download_replay_to`)
+        response.raw = io.BytesIO(content)
+        method, url, byte_range = _key(method, url, headers)
+        record = {"method": method, "url": url, "range": byte_range,
+                  "status": response.status_code, "reason": response.reason,
+                  "headers": dict(response.headers), "elapsed": round(elapsed, 6)}
+        try:
+            record["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            record["base64"] = base64.b64encode(content).decode("ascii")
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self._transport.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def load_cassette(path: Union[str, os.PathLike]) -> Iterator[Dict[str, Any]]:
+    """Lazily load the records of a cassette written by a `RecordingTransport`.
+
+    Parameters
+    ----------
+    path : str or PathLike
+        The path of the cassette.
+
+    Yields
+    ------
+    dict
+        Each record, in the order the requests were made.
+
+    """
+    with _open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class PlaybackTransport(Transport):
+    """A transport that serves the responses of a cassette written by a `RecordingTransport`,
+    without making any network requests.
+
+    Requests are matched on their method, URL and `Range` header. When a request was recorded
+    several times, its responses are served in the recorded order.
+
+    """
+    def __init__(self, path: Union[str, os.PathLike], *, speed: Optional[float] = None,
+                 loop: bool = True) -> None:
+        """
+        Arguments
+        ---------
+        path : str or PathLike
+            The path of the cassette.
+        speed : float, optional, default=None
+            If defined, every response is delayed by its recorded response time divided by
+            `speed` (so `1` plays back at the recorded speed, and `10` ten times faster).
+            Otherwise, responses are served immediately.
+        loop : bool, optional, default=True
+            If `True`, a request made more often than it was recorded is served its recorded
+            responses again from the start. Otherwise, a `LookupError` is raised.
+
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("\"speed\" must be positive")
+        records = collections.defaultdict(list)
+        for record in load_cassette(path):
+            records[record["method"], record["url"], record.get("range")].append(record)
+        self._records = dict(records)
+        self._positions = collections.Counter()
+        self._speed = speed
+        self._loop = loop
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Dict[str, str],
+                **kwargs: Any) -> requests.Response:
+        key = _key(method, url, headers)
+        with self._lock:
+            records = self._records.get(key)
+            position = self._positions[key]
+            if records and position >= len(records) and self._loop:
+                position = 0
+            if not records or position >= len(records):
+                raise LookupError(f"no recorded response for {method.upper()} {url}")
+            self._positions[key] = position + 1
+        record = records[position]
+        if self._speed:
+            time.sleep(record["elapsed"] / self._speed)
+        return _response(record, url)
+
+    def unplayed(self) -> List[Tuple[str, str]]:
+        """Get the `(method, url)` of every recorded request that has not been played back.
+
+        """
+        with self._lock:
+            return [key[:2] for key, records in self._records.items()
+                    for _ in records[self._positions[key]:]]
+
+
+def _response(record: Dict[str, Any], url: str) -> requests.Response:
+    """Build a `requests.Response` from a cassette record.
+
+    """
+    response = requests.Response()
+    response.status_code = record["status"]
+    response.reason = record["reason"]
+    response.url = url
+    response.headers = requests.structures.CaseInsensitiveDict(record["headers"])
+    if "base64" in record:
+        response._content = base64.b64decode(record["base64"])
+    else:
+        response._content = record["text"].encode("utf-8")
+    response._content_consumed = True
+    response.raw = io.BytesIO(response._content)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.elapsed = datetime.timedelta(seconds=record["elapsed"])
+    return response
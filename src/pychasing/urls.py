@@ -0,0 +1,117 @@
+"""URL building shared by ``client`` and ``aioclient``.
+
+:copyright: (c) 2022-present Tanner B. Corcoran
+:license: MIT, see LICENSE for more details.
+"""
+
+__author__ = "Tanner B. Corcoran"
+__license__ = "MIT License"
+__copyright__ = "Copyright (c) 2022-present Tanner B. Corcoran"
+
+
+import urllib.parse
+import functools
+import re
+
+from typing import (
+    Iterable,
+    Tuple,
+    Any
+)
+
+
+# the root of every API URL
+_API_URL = "https://ballchasing.com/api"
+
+_after_pattern = re.compile(r"(?<=after=)[^\&]*")
+# query values are mostly enum values and ids that repeat between calls
+_quote = functools.lru_cache(maxsize=4096)(urllib.parse.quote)
+
+
+def p(v):
+    """Return `v` if `v` is `...` or a `str`, else return the value of the enum `v` (read from
+    `_value_`, which skips the slower `value` property).
+    
+    """
+    return v if v is ... or isinstance(v, str) else v._value_
+
+
+def _with_query(url: str, queries: Iterable[Tuple[str, Any]]) -> str:
+    """Append `queries` (`(name, value)` pairs, skipping undefined values) to `url`, quoting the
+    values the same way `httpprep.URL` does.
+
+    """
+    query = "&".join(f"{name}={_quote(str(value))}" for name, value in queries
+                     if value is not ...)
+    return f"{url}?{query}" if query else url
+
+
+def _continuation(next: str) -> str:
+    """Get the (unquoted) `after` value of a continuation URL.
+
+    """
+    match = _after_pattern.search(next)
+    if match is None:
+        raise ValueError("'next' string has an unknown structure")
+    return urllib.parse.unquote(match.group())
+
+
+def _list_replays_url(api_url: str, *, next, title, player_names, player_ids, playlists, season,
+                      match_result, min_rank, max_rank, pro, uploader, group, map,
+                      created_before, created_after, replay_date_before, replay_date_after,
+                      count, sort_by, sort_dir) -> str:
+    """Build the URL used by `list_replays` (see `Client.list_replays` for a description of each
+    parameter).
+    
+    """
+    if count != ... and not 1 <= count <= 200:
+        raise ValueError("\"count\" must be between 1 and 200")
+
+    queries = [
+        ("after", next if next is ... else _continuation(next)),
+        ("title", title),
+        ("season", p(season)),
+        ("match-result", p(match_result)),
+        ("min-rank", p(min_rank)),
+        ("max-rank", p(max_rank)),
+        ("pro", str(pro).lower() if isinstance(pro, bool) else ...),
+        ("uploader", uploader),
+        ("group", group),
+        ("map", p(map)),
+        ("created-before", created_before),
+        ("created-after", created_after),
+        ("replay-date-before", replay_date_before),
+        ("replay-date-after", replay_date_after),
+        ("count", count),
+        ("sort-by", p(sort_by)),
+        ("sort-dir", p(sort_dir))
+    ]
+    if player_names != ...:
+        queries.extend(("player-name", name) for name in player_names)
+    if player_ids != ...:
+        queries.extend(("player-id", f"{p(platform)}:{id}") for platform, id in player_ids)
+    if playlists != ...:
+        queries.extend(("playlist", p(playlist)) for playlist in playlists)
+    return _with_query(f"{api_url}/replays", queries)
+
+
+def _list_groups_url(api_url: str, *, next, name, creator, group, created_before, created_after,
+                     count, sort_by, sort_dir) -> str:
+    """Build the URL used by `list_groups` (see `Client.list_groups` for a description of each
+    parameter).
+    
+    """
+    if count != ... and not 1 <= count <= 200:
+        raise ValueError("\"count\" must be between 1 and 200")
+
+    return _with_query(f"{api_url}/groups", (
+        ("after", next if next is ... else _continuation(next)),
+        ("name", name),
+        ("creator", creator),
+        ("group", group),
+        ("created-before", created_before),
+        ("created-after", created_after),
+        ("count", count),
+        ("sort-by", p(sort_by)),
+        ("sort-dir", p(sort_dir))
+    ))
@@ -1,4 +1,5 @@
 import sys
+import asyncio
 sys.path.append(".")
 from src import pychasing
 
@@ -49,6 +50,14 @@ def test_list_groups() -> None:
     print("\033[96mpychasing.client.Client.list_groups \033[90m: \033[92mGOOD\033[0m")
 
 
+def test_iter_replays() -> None:
+    res0 = list(pychasing_client.iter_replays(limit=5, pro=True, count=2))
+    print(res0)
+    assert len(res0) == 5
+    assert len({replay["id"] for replay in res0}) == 5
+    print("\033[96mpychasing.client.Client.iter_replays \033[90m: \033[92mGOOD\033[0m")
+
+
 def test_maps() -> None:
     res0 = pychasing_client.maps()
     print(res0.json())
@@ -147,6 +156,19 @@ def test_delete_group() -> None:
     print("\033[96mpychasing.client.Client.delete_group \033[90m: \033[92mGOOD\033[0m")
 
 
+def test_async_client() -> None:
+    async def main() -> None:
+        async with pychasing.AsyncClient(TOKEN, True, pychasing.PatreonTier.none, True) as client:
+            res0 = await client.ping()
+            print(await res0.json())
+            assert (await res0.json())["chaser"] is True
+            res1 = await client.maps()
+            print(await res1.json())
+            assert (await res1.json())["arc_standard_p"] == "Starbase ARC (Standard)"
+    asyncio.run(main())
+    print("\033[96mpychasing.aioclient.AsyncClient \033[90m: \033[92mGOOD\033[0m")
+
+
 if __name__ == "__main__":
     step = 0
     if step == 0: test_ping()
@@ -163,4 +185,6 @@ if __name__ == "__main__":
     if step == 11: test_experimentals()
     if step == 12: test_delete_replay()
     if step == 13: test_delete_group()
-    if step == 14: print("DONE!")
+    if step == 14: test_async_client()
+    if step == 15: test_iter_replays()
+    if step == 16: print("DONE!")
@@ -0,0 +1,67 @@
+import sys
+import asyncio
+import time
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_async_client() -> None:
+    async def run(url: str, replay_ids: list):
+        async with pychasing.AsyncClient(TOKEN, False, api_url=url) as client:
+            res0 = await client.ping()
+            assert res0.status == 200
+            assert (await res0.json())["chaser"] is True
+
+            res1 = await client.maps()
+            assert res1.status == 200
+
+            res2 = await asyncio.gather(*(client.get_replay(replay_id, print_error=False)
+                                          for replay_id in replay_ids[:5]))
+            assert [(await response.json())["id"] for response in res2] == replay_ids[:5]
+
+            res3 = await client.get_replay("missing", print_error=False)
+            assert res3.status == 404
+
+            res4 = [replay["id"] async for replay in client.iter_replays(count=7)]
+            assert res4 == replay_ids
+
+            res5 = [replay["id"] async for replay in client.iter_replays(limit=3)]
+            assert res5 == replay_ids[:3]
+
+    with MockServer(replays=20, groups=4) as server:
+        asyncio.run(run(server.url, list(server.data.replays)))
+        # 3 pages of 7 for the full walk, 1 page for the limited one
+        assert server.counts()[("replays", 200)] == 4
+
+
+def test_async_rate_limiters() -> None:
+    tier = pychasing.PatreonTier.champion
+
+    async def run(url: str, group_ids: list):
+        async with pychasing.AsyncClient(TOKEN, patreon_tier=tier, api_url=url) as client, \
+                pychasing.AsyncClient("other-token", patreon_tier=tier, api_url=url) as other:
+            # every operation of the tier is limited, by limiters of the client's own
+            assert set(client._rate_limiters) == set(tier.value)
+            assert not ({id(limiter) for limiter in client._rate_limiters.values()}
+                        & {id(limiter) for limiter in other._rate_limiters.values()})
+
+            # deletions are limited to the tier's 8 calls per second too
+            start = time.perf_counter()
+            res0 = await asyncio.gather(*(client.delete_group(group_id)
+                                          for group_id in group_ids[:4]))
+            assert [response.status for response in res0] == [204] * 4
+            assert time.perf_counter() - start >= 3 * 0.125 - 0.01
+
+            # the two clients do not share their limiters, so each makes its 4 calls in the
+            # time of 4 (rather than 8)
+            start = time.perf_counter()
+            await asyncio.gather(*(c.ping() for c in (client, other) for _ in range(4)))
+            assert time.perf_counter() - start < 7 * 0.125 - 0.1
+
+    with MockServer(replays=20, groups=8) as server:
+        asyncio.run(run(server.url, list(server.data.groups)[4:]))
+        assert server.counts()[("ping", 200)] == 8
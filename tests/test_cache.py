@@ -0,0 +1,70 @@
+import sys
+import time
+import pytest
+sys.path.append(".")
+from src import pychasing
+from src.pychasing.cache import CachedResponse
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache(backend, tmp_path) -> None:
+    cache = (pychasing.MemoryCache() if backend == "memory"
+             else pychasing.SQLiteCache(tmp_path / "cache.db"))
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        group_id = next(iter(server.data.groups))
+        with pychasing.Client(TOKEN, False, api_url=server.url, cache=cache, cache_ttls={
+                pychasing.enums.Operation.get_group: 0.2}) as client:
+            res0 = client.get_replay(replay_id)
+            res1 = client.get_replay(replay_id)
+            assert not res0.from_cache and res1.from_cache
+            assert res1.json() == res0.json()
+            assert server.counts()[("replay", 200)] == 1
+            # writes invalidate the affected entries
+            client.patch_replay(replay_id, title="patched")
+            res2 = client.get_replay(replay_id)
+            assert not res2.from_cache and res2.json()["title"] == "patched"
+            assert client.get_replay(replay_id).from_cache
+            # entries expire after their operation's TTL
+            assert not client.get_group(group_id).from_cache
+            assert client.get_group(group_id).from_cache
+            time.sleep(0.25)
+            assert not client.get_group(group_id).from_cache
+    if backend == "sqlite":
+        cache.close()
+
+
+def test_sqlite_cache_eviction(tmp_path) -> None:
+    path = tmp_path / "cache.db"
+    cache = pychasing.SQLiteCache(path, maxsize=3, access_batch=3)
+    value = CachedResponse(200, "OK", "https://ballchasing.com/api", {}, b"{}")
+    for key in "abc":
+        cache.set(key, value, 60)
+        time.sleep(0.01)
+
+    # hits do not write to the database until the access times of 3 entries are pending
+    changes = cache._connection.total_changes
+    for key in "baa":
+        assert cache.get(key) == value
+        time.sleep(0.01)
+    assert cache._connection.total_changes == changes
+    assert cache.get("c") == value
+    assert cache._connection.total_changes == changes + 3
+
+    # "b" is now the least recently used entry
+    cache.set("d", value, 60)
+    assert [cache.get(key) is not None for key in "abcd"] == [True, False, True, True]
+
+    # pending access times are written on close, and the size is recounted on open, so "c"
+    # is the next to be evicted
+    time.sleep(0.01)
+    assert cache.get("a") == value
+    cache.close()
+    cache = pychasing.SQLiteCache(path, maxsize=3)
+    cache.set("e", value, 60)
+    assert [cache.get(key) is not None for key in "acde"] == [True, False, True, True]
+    cache.close()
@@ -0,0 +1,258 @@
+import sys
+import concurrent.futures
+import subprocess
+import requests
+import json
+import time
+import pytest
+import rlim
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_session_reuse() -> None:
+    with MockServer(replays=10, groups=4) as server:
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            for _ in range(5):
+                assert client.ping().status_code == 200
+        assert server.connections == 1
+        with pychasing.Client(TOKEN, False, api_url=server.url, keep_alive=False) as client:
+            for _ in range(5):
+                assert client.ping().status_code == 200
+        assert server.connections == 6
+
+
+def test_session_pool_size() -> None:
+    with MockServer(replays=10, groups=4, latency=0.02) as server:
+        with pychasing.Client(TOKEN, False, api_url=server.url, pool_maxsize=2,
+                              pool_block=True) as client:
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                res0 = list(executor.map(lambda _: client.ping(), range(16)))
+        assert [response.status_code for response in res0] == [200] * 16
+        # blocked requests wait for one of the two pooled connections instead of opening more
+        assert server.connections == 2
+
+
+def test_count_bounds() -> None:
+    # the page size is checked before any request is sent
+    client = pychasing.Client(TOKEN, False, api_url="http://127.0.0.1:9/api")
+    for count in (0, 201):
+        with pytest.raises(ValueError):
+            client.list_replays(count=count)
+        with pytest.raises(ValueError):
+            client.list_groups(count=count)
+
+
+def test_get_replays() -> None:
+    with MockServer(replays=20, groups=4, latency=0.05) as server:
+        replay_ids = list(server.data.replays) + ["missing"]
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            start = time.perf_counter()
+            res0 = list(client.get_replays(replay_ids, max_concurrency=7, ordered=True,
+                                           print_error=False))
+            elapsed = time.perf_counter() - start
+        assert [replay_id for replay_id, _ in res0] == replay_ids
+        assert [response.json()["id"] for _, response in res0[:-1]] == replay_ids[:-1]
+        assert res0[-1][1].status_code == 404
+        # 21 requests of 50 ms each, 7 at a time (about 0.15 s rather than about 1 s one by one)
+        assert elapsed < 0.5
+        assert server.counts()[("replay", 200)] == 20
+
+
+def test_download_replay_to(tmp_path) -> None:
+    with MockServer(replays=6, groups=2, replay_size=50000) as server:
+        replay_ids = list(server.data.replays)
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            destination = tmp_path / "0.replay"
+            res0 = client.download_replay_to(replay_ids[0], destination, buffer_size=4096)
+            assert res0.status_code == 200
+            assert destination.read_bytes() == server.replay_file(replay_ids[0])
+            # written to the .part file and renamed once complete
+            assert not (tmp_path / "0.replay.part").exists()
+
+            # an existing destination is skipped without a request
+            assert client.download_replay_to(replay_ids[0], destination) is None
+            assert server.counts(reset=True) == {("replay_file", 200): 1}
+
+            # an interrupted download is resumed from the end of the .part file
+            content = server.replay_file(replay_ids[1])
+            (tmp_path / "1.replay.part").write_bytes(content[:20000])
+            res1 = client.download_replay_to(replay_ids[1], tmp_path / "1.replay")
+            assert res1.status_code == 206
+            assert res1.headers["Content-Range"].startswith("bytes 20000-")
+            assert (tmp_path / "1.replay").read_bytes() == content
+            assert not (tmp_path / "1.replay.part").exists()
+
+            # a .part file that already holds the whole replay is only renamed
+            content = server.replay_file(replay_ids[2])
+            (tmp_path / "2.replay.part").write_bytes(content)
+            res2 = client.download_replay_to(replay_ids[2], tmp_path / "2.replay")
+            assert res2.status_code == 416
+            assert (tmp_path / "2.replay").read_bytes() == content
+            assert server.counts(reset=True) == {("replay_file", 206): 1,
+                                                 ("replay_file", 416): 1}
+
+            res3 = dict(client.download_replays(replay_ids, tmp_path / "all",
+                                                max_concurrency=3))
+            assert all(res3[replay_id].status_code == 200 for replay_id in replay_ids)
+            for replay_id in replay_ids:
+                content = (tmp_path / "all" / f"{replay_id}.replay").read_bytes()
+                assert content == server.replay_file(replay_id)
+            res4 = dict(client.download_replays(replay_ids, tmp_path / "all"))
+            assert res4 == dict.fromkeys(replay_ids)
+            assert server.counts() == {("replay_file", 200): 6}
+
+
+def test_upload_replays(tmp_path) -> None:
+    replays = tmp_path / "replays"
+    replays.mkdir()
+    for i in range(6):
+        (replays / f"{i}.replay").write_bytes(bytes([i]) * 1000)
+    # a copy of 0.replay, which the server answers with a duplicate replay error
+    (replays / "6.replay").write_bytes(bytes([0]) * 1000)
+    (replays / "notes.txt").write_text("not a replay")
+    manifest = tmp_path / "manifest.jsonl"
+    with MockServer(replays=2, groups=1) as server:
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            res0 = client.upload_replays(replays, pychasing.Visibility.private,
+                                         rate_criteria=(rlim.Rate(100),), manifest=manifest)
+            assert sorted(res0) == [str(replays / f"{i}.replay") for i in range(7)]
+            assert all(isinstance(replay_id, str) for replay_id in res0.values())
+            assert res0[str(replays / "6.replay")] == res0[str(replays / "0.replay")]
+            assert server.counts(reset=True) == {("upload_replay", 201): 6,
+                                                 ("upload_replay", 409): 1}
+            assert len(manifest.read_text().splitlines()) == 7
+
+            # every file is recorded in the manifest, so nothing is uploaded again
+            (replays / "7.replay").write_bytes(bytes([7]) * 1000)
+            res1 = client.upload_replays(replays, pychasing.Visibility.private,
+                                         rate_criteria=(rlim.Rate(100),), manifest=manifest)
+            assert {path: res1[path] for path in res0} == res0
+            assert server.counts() == {("upload_replay", 201): 1}
+
+
+class _HeaderLog(pychasing.SessionTransport):
+    """A transport that records the headers of every request it sends.
+
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.headers = []
+
+    def request(self, method, url, headers, **kwargs):
+        self.headers.append(dict(headers))
+        return super().request(method, url, headers, **kwargs)
+
+
+def test_conditional_requests() -> None:
+    transport = _HeaderLog()
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        with pychasing.Client(TOKEN, False, api_url=server.url, conditional_requests=True,
+                              transport=transport) as client:
+            res0 = client.get_replay(replay_id)
+            assert res0.status_code == 200 and not res0.not_modified
+            assert "If-None-Match" not in transport.headers[0]
+
+            res1 = client.get_replay(replay_id)
+            assert transport.headers[1]["If-None-Match"] == res0.headers["ETag"]
+            assert transport.headers[1]["If-Modified-Since"] == res0.headers["Last-Modified"]
+            assert res1.status_code == 200 and res1.not_modified
+            assert res1.json() == res0.json()
+            assert server.counts(reset=True) == {("replay", 200): 1, ("replay", 304): 1}
+
+            # a changed replay has a new ETag, so it is sent in full again
+            client.patch_replay(replay_id, title="patched")
+            res2 = client.get_replay(replay_id)
+            assert res2.status_code == 200 and not res2.not_modified
+            assert res2.json()["title"] == "patched"
+            res3 = client.get_replay(replay_id)
+            assert res3.not_modified and res3.json()["title"] == "patched"
+            assert server.counts() == {("replay", 204): 1, ("replay", 200): 1,
+                                       ("replay", 304): 1}
+
+
+def test_json_decoder() -> None:
+    decoded = []
+
+    def decoder(content: bytes):
+        decoded.append(content)
+        return json.loads(content)
+
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        with pychasing.Client(TOKEN, False, api_url=server.url, json_decoder=decoder,
+                              cache=pychasing.MemoryCache()) as client:
+            res0 = client.get_replay(replay_id)
+            # the body is decoded once, however often `json` is called
+            assert res0.json() is res0.json()
+            assert res0.json()["id"] == replay_id and len(decoded) == 1
+            # responses served from the cache are decoded by the same decoder
+            res1 = client.get_replay(replay_id)
+            assert res1.from_cache and res1.json() == res0.json() and len(decoded) == 2
+            res2 = client.download_replay(replay_id)
+            with pytest.raises(requests.JSONDecodeError):
+                res2.json()
+
+
+@pytest.mark.parametrize("blocked, expected", [
+    ((), "orjson.loads"), (("orjson",), "ujson.loads"), (("orjson", "ujson"), "json.loads")])
+def test_default_json_decoder(blocked, expected) -> None:
+    # the fastest installed decoder is picked when the client module is imported
+    module = expected.split(".")[0]
+    if module != "json":
+        pytest.importorskip(module)
+    code = (f"import sys\nsys.modules.update(dict.fromkeys({blocked!r}))\n"
+            f"import {module}\nfrom src.pychasing import client\n"
+            f"assert client._json_loads is {expected}\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_iter_replays_priority() -> None:
+    with MockServer(replays=10, groups=4) as server:
+        with pychasing.Client(TOKEN, api_url=server.url,
+                              patreon_tier=pychasing.PatreonTier.grand_champion) as client:
+            scheduler = client._schedulers[pychasing.enums.Operation.list_replays]
+            acquire = scheduler.acquire
+            priorities = []
+
+            def record(priority: pychasing.Priority) -> None:
+                priorities.append(priority)
+                acquire(priority)
+
+            scheduler.acquire = record
+            with client.priority("interactive"):
+                res0 = list(client.iter_replays(limit=6, count=2))
+            assert len(res0) == 6
+            # the second and third pages are prefetched from another thread, at the priority of
+            # the caller
+            assert priorities == [pychasing.Priority.interactive] * 3
+            list(client.iter_replays(limit=2, count=2))
+            assert priorities[3:] == [pychasing.Priority.normal]
+
+
+@pytest.mark.parametrize("by, after, before", [
+    ("upload-date", "created_after", "created_before"),
+    ("replay-date", "replay_date_after", "replay_date_before")
+])
+def test_scan_replays(by, after, before) -> None:
+    with MockServer(replays=300, groups=4) as server:
+        expected = set(server.data.replays)
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            # with 75 replays per window, every window is split after its first page
+            res0 = list(client.scan_replays(by=by, windows=4, max_concurrency=4,
+                                            split_threshold=30, count=20,
+                                            **{after: "2023-05-01T00:00:00Z",
+                                               before: "2023-06-02T00:00:00Z"}))
+            # every replay is yielded exactly once, even on window boundaries
+            assert len(res0) == len(expected)
+            assert {replay["id"] for replay in res0} == expected
+            # the split windows take more pages than the 18 of the 4 windows left unsplit
+            assert server.counts(reset=True)[("replays", 200)] > 18
+            res1 = list(client.scan_replays(by=by, limit=25, windows=4, max_concurrency=4,
+                                            count=20, **{after: "2023-05-01T00:00:00Z"}))
+            assert len(res1) == 25 and len({replay["id"] for replay in res1}) == 25
@@ -0,0 +1,42 @@
+import sys
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_crawl_group() -> None:
+    with MockServer(replays=48, groups=24) as server:
+        groups = server.data.groups
+        root = next(iter(groups))
+        expected = [root]
+        for group_id in expected:
+            expected.extend(child for child, group in groups.items()
+                            if group["parent"] == group_id)
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            res0 = client.crawl_group(root, include_replays=True, max_concurrency=4).result()
+            assert set(res0) == set(expected)
+            for group_id in expected:
+                assert res0.parent(group_id) == (groups[group_id]["parent"]
+                                                 if group_id != root else None)
+                assert sorted(res0.replays(group_id)) == sorted(
+                    replay["id"] for replay in server.data.replays.values()
+                    if replay["groups"][0]["id"] == group_id)
+            assert len(res0.replays(root, recursive=True)) == 2 * len(expected)
+            # the children and the replays of every group are listed once
+            assert server.counts(reset=True) == {("group", 200): 1,
+                                                 ("groups", 200): len(expected),
+                                                 ("replays", 200): len(expected)}
+
+            res1 = client.crawl_group(root, depth=1).result()
+            assert set(res1) == {root, *res0.children(root)}
+            # the children of the groups past `depth` are not listed
+            assert server.counts(reset=True) == {("group", 200): 1, ("groups", 200): 1}
+
+            with client.crawl_group(root, include_replay_details=True) as crawl:
+                res2 = [item for item in crawl if item[0] == "replay"]
+            # every replay is requested once, and its details replace its summary
+            assert len(res2) == server.counts()[("replay", 200)] == 2 * len(expected)
+            assert all("team_size" in replay for _, replay, _ in res2)
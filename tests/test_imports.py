@@ -0,0 +1,43 @@
+import sys
+import subprocess
+import pytest
+
+
+def _modules(code: str) -> set:
+    """Get the modules imported by `import pychasing` and `code` in a fresh interpreter."""
+    probe = f"import sys\nimport pychasing\n{code}\nprint(' '.join(sorted(sys.modules)))\n"
+    output = subprocess.run([sys.executable, "-c", probe], cwd="src", check=True,
+                            capture_output=True, text=True).stdout
+    return set(output.split())
+
+
+def test_lazy_import() -> None:
+    modules = _modules("")
+    for name in ("requests", "aiohttp", "rlim", "httpprep", "sqlite3", "pychasing.enums",
+                 "pychasing.client", "pychasing.aioclient"):
+        assert name not in modules
+
+
+@pytest.mark.parametrize("code, imported, deferred", [
+    # enums do not need `rlim` until a rate limit table is read
+    ("pychasing.Map", {"pychasing.enums"}, {"rlim", "requests", "pychasing.client"}),
+    ("pychasing.PatreonTier.gold.value", {"pychasing.enums"}, {"rlim", "requests"}),
+    ("list(pychasing.PatreonTier.gold.value.values())", {"rlim"},
+     {"requests", "pychasing.client"}),
+    ("pychasing.Replay", {"pychasing.models"}, {"requests", "rlim", "pychasing.client"}),
+    ("pychasing.Client", {"requests", "pychasing.client"}, {"aiohttp", "pychasing.aioclient"}),
+    ("pychasing.AsyncClient", {"aiohttp", "pychasing.aioclient"}, {"requests"})
+])
+def test_first_use(code, imported, deferred) -> None:
+    modules = _modules(code)
+    assert imported <= modules
+    assert not deferred & modules
+
+
+def test_exports() -> None:
+    # every exported name resolves, and `dir` lists the names not imported yet
+    output = subprocess.run(
+        [sys.executable, "-c", "import pychasing\nassert set(pychasing.__all__) <= "
+         "set(dir(pychasing))\nfor name in pychasing.__all__:\n    getattr(pychasing, name)\n"],
+        cwd="src", capture_output=True, text=True)
+    assert output.returncode == 0, output.stderr
@@ -0,0 +1,62 @@
+import sys
+import pytest
+import requests
+sys.path.append(".")
+from src import pychasing
+from src.pychasing import enums
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_hooks() -> None:
+    events = []
+    metrics = pychasing.Metrics()
+    with MockServer(replays=10, groups=4, latency=0.02) as server:
+        replay_id = next(iter(server.data.replays))
+        with pychasing.Client(TOKEN, api_url=server.url, hooks=[events.append, metrics],
+                              patreon_tier=pychasing.PatreonTier.champion,
+                              cache=pychasing.MemoryCache()) as client:
+            res0 = [client.get_replay(replay_id) for _ in range(2)]
+            res1 = [client.get_replay(f"missing-{i}", print_error=False) for i in range(2)]
+            with open("tests/test_replay.replay", "rb") as replay_file:
+                res2 = client.upload_replay(replay_file, pychasing.Visibility.private)
+    assert res0[1].from_cache and res2.status_code == 201
+
+    # responses served from the cache are not reported
+    assert [(event.operation, event.status_code) for event in events] == [
+        (enums.Operation.get_replay, 200), (enums.Operation.get_replay, 404),
+        (enums.Operation.get_replay, 404), (enums.Operation.upload_replay, 201)]
+    assert all(event.latency >= 0.02 and event.attempt == 1 and event.exception is None
+               for event in events)
+    assert events[0].bytes_received == len(res0[0].content)
+    assert events[3].bytes_sent > 0
+    # the tier allows 8 get_replay calls per second, so the two calls after the first wait
+    # for what is left of their slot once the previous call's 0.02 s round trip is over
+    assert events[0].rate_limit_wait < 0.05
+    assert sum(event.rate_limit_wait for event in events[:3]) >= 2 * (0.125 - 0.02) - 0.05
+
+    snapshot = metrics.snapshot()
+    assert set(snapshot) == {"get_replay", "upload_replay"}
+    get_replay = snapshot["get_replay"]
+    assert get_replay["requests"] == 3 and get_replay["statuses"] == {200: 1, 404: 2}
+    assert get_replay["exceptions"] == get_replay["retries"] == 0
+    assert get_replay["bytes_received"] == sum(event.bytes_received for event in events[:3])
+    assert 0.02 <= get_replay["latency"]["p50"] <= get_replay["latency"]["max"]
+    text = metrics.prometheus()
+    assert 'pychasing_requests_total{operation="get_replay",status="404"} 2' in text
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_hooks_exception() -> None:
+    events = []
+    # nothing listens on the discard port
+    with pychasing.Client(TOKEN, False, api_url="http://127.0.0.1:9/api",
+                          hooks=[events.append]) as client:
+        with pytest.raises(requests.ConnectionError):
+            client.ping()
+    assert len(events) == 1
+    assert events[0].status_code is None
+    assert isinstance(events[0].exception, requests.ConnectionError)
@@ -0,0 +1,39 @@
+import sys
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_replay_mirror(tmp_path) -> None:
+    path = tmp_path / "mirror.db"
+    with MockServer(replays=30, groups=4) as server:
+        replays = list(server.data.replays.values())
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            with pychasing.ReplayMirror(path, client) as mirror:
+                assert mirror.sync(batch_size=8) == 30 and len(mirror) == 30
+                server.counts(reset=True)
+                assert mirror.watermark() == max(replay["created"] for replay in replays)
+                # the next sync only asks for replays uploaded after the watermark
+                assert mirror.sync() == 0
+                assert server.counts(reset=True) == {("replays", 200): 1}
+                with open("tests/test_replay.replay", "rb") as replay_file:
+                    res0 = client.upload_replay(replay_file, pychasing.Visibility.public)
+                assert mirror.sync() == 1 and len(mirror) == 31
+                assert mirror.get(res0.json()["id"]) is not None
+                watermark = mirror.watermark()
+                assert watermark > max(replay["created"] for replay in replays)
+                res1 = mirror.query(playlists=[pychasing.Playlist.ranked_doubles],
+                                    sort_dir="asc")
+                assert [replay.id for replay in res1] == [
+                    replay["id"] for replay in reversed(replays)
+                    if replay["playlist_id"] == "ranked-doubles"]
+
+            # the replays and the watermark persist, so a reopened mirror picks up where it was
+            server.counts(reset=True)
+            with pychasing.ReplayMirror(path, client) as mirror:
+                assert len(mirror) == 31 and mirror.watermark() == watermark
+                assert mirror.sync() == 0
+            assert server.counts() == {("replays", 200): 1}
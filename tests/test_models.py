@@ -0,0 +1,112 @@
+import sys
+import json
+import pytest
+import requests
+import tracemalloc
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def _stats(model: type, value: float) -> dict:
+    return {name: value for name in model.__slots__}
+
+
+def _full_stats(value: float) -> dict:
+    return {"core": _stats(pychasing.CoreStats, value),
+            "boost": _stats(pychasing.BoostStats, value),
+            "movement": _stats(pychasing.MovementStats, value),
+            "positioning": _stats(pychasing.PositioningStats, value),
+            "demo": _stats(pychasing.DemoStats, value)}
+
+
+def _replay() -> dict:
+    """A replay with every statistic ballchasing.com reports."""
+    def team(color: str) -> dict:
+        return {"color": color, "name": color.upper(), "goals": 3,
+                "stats": {**_full_stats(2.5), "ball": _stats(pychasing.BallStats, 100.5)},
+                "players": [{"name": f"{color}{i}", "id": {"platform": "steam", "id": str(i)},
+                             "score": 100 * i, "stats": _full_stats(i + 0.5)}
+                            for i in range(3)]}
+    return {"id": "replay", "title": "Replay", "match_guid": "guid", "team_size": 3,
+            "blue": team("blue"), "orange": team("orange")}
+
+
+def test_replay_model() -> None:
+    replay = pychasing.Replay(_replay())
+    assert replay.team_size == 3 and replay.match_guid == "guid"
+    assert replay.blue.stats.ball.possession_time == 100.5
+    assert replay.orange.stats.boost.percent_boost_75_100 == 2.5
+    player = replay.blue.players[2]
+    assert (player.name, player.platform, player.player_id) == ("blue2", "steam", "2")
+    assert player.stats.core.goals == 2.5 and player.stats.demo.taken == 2.5
+    # categories missing from the JSON are None
+    assert player.stats.ball is None
+
+    # the models keep none of the decoded JSON alive
+    text = json.dumps(_replay())
+    tracemalloc.start()
+    data = json.loads(text)
+    raw = tracemalloc.get_traced_memory()[0]
+    del data
+    start = tracemalloc.get_traced_memory()[0]
+    replay = pychasing.Replay(json.loads(text))
+    model = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    assert model < 0.75 * raw
+
+
+def test_group_model() -> None:
+    player = {"platform": "steam", "id": "1", "name": "player", "team": "team",
+              "cumulative": {"games": 4, "wins": 3, "win_percentage": 75.0, **_full_stats(8.0)},
+              "game_average": _full_stats(2.0)}
+    group = pychasing.Group({"id": "group", "name": "Group", "status": "ok",
+                             "players": [player],
+                             "teams": [{"name": "team", "players": [player],
+                                        "cumulative": {"games": 4, **_full_stats(16.0)}}]})
+    assert group.players[0].player_id == "1" and group.players[0].cumulative.wins == 3
+    assert group.players[0].cumulative.core.goals == 8.0
+    assert group.players[0].game_average.movement.avg_speed == 2.0
+    assert group.teams[0].players[0].name == "player"
+    assert group.teams[0].cumulative.games == 4 and group.teams[0].game_average is None
+
+
+def test_typed_variants() -> None:
+    with MockServer(replays=30, groups=8) as server:
+        replay_ids = list(server.data.replays)
+        group_ids = list(server.data.groups)
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            replay = client.get_replay_model(replay_ids[0])
+            expected = server.data.replays[replay_ids[0]]
+            assert isinstance(replay, pychasing.Replay)
+            assert (replay.id, replay.title, replay.team_size) == (
+                expected["id"], expected["title"], expected["team_size"])
+            assert [player.name for player in replay.blue.players] == [
+                player["name"] for player in expected["blue"]["players"]]
+            assert replay.orange.players[0].stats.core.goals == (
+                expected["orange"]["players"][0]["stats"]["core"]["goals"])
+            with pytest.raises(requests.HTTPError):
+                client.get_replay_model("missing", print_error=False)
+
+            group = client.get_group_model(group_ids[1])
+            assert isinstance(group, pychasing.Group)
+            assert (group.id, group.name, group.direct_replays) == (
+                group_ids[1], "Group 1", server.data.groups[group_ids[1]]["direct_replays"])
+
+            page = client.list_replays_page(count=20)
+            assert isinstance(page, pychasing.ReplayPage)
+            assert page.count == 30 and page.next and len(page) == 20
+            summaries = list(page)
+            assert all(isinstance(summary, pychasing.ReplaySummary) for summary in summaries)
+            assert [summary.id for summary in summaries] == replay_ids[:20]
+            assert summaries[0].title == expected["title"]
+            assert summaries[0].blue.players[0].name == expected["blue"]["players"][0]["name"]
+            page = client.list_replays_page(next=page.next)
+            assert page.next is None and len(page) == 10
+
+            page = client.list_groups_page(count=5)
+            assert isinstance(page, pychasing.GroupPage)
+            assert page.next and [group.id for group in page] == group_ids[:5]
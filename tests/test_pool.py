@@ -0,0 +1,46 @@
+import sys
+import time
+sys.path.append(".")
+from src import pychasing
+from src.pychasing import enums
+from benchmarks.mock_server import MockServer
+
+
+def test_balanced_split() -> None:
+    operation = enums.Operation.get_replay
+    with MockServer(replays=100, groups=4) as server:
+        replay_ids = list(server.data.replays)[:80]
+        with pychasing.ClientPool([("token-a", pychasing.PatreonTier.grand_champion),
+                                   ("token-b", pychasing.PatreonTier.grand_champion)],
+                                  api_url=server.url) as pool:
+            start = time.perf_counter()
+            res0 = dict(pool.get_replays(replay_ids, max_concurrency=32))
+            elapsed = time.perf_counter() - start
+            usage = pool.usage()
+    assert all(response.status_code == 200 for response in res0.values())
+    # the calls queued on each token count against it, so each token gets half of them, and
+    # the 80 calls take about 2.5 s at the tokens' combined 32 calls per second
+    assert usage["token-a"][operation] == usage["token-b"][operation] == 40
+    assert elapsed < 3.0
+
+
+def test_pool() -> None:
+    with MockServer(replays=20, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        with pychasing.ClientPool([("token-a", "none"), ("token-b", "none")],
+                                  auto_rate_limit=False, api_url=server.url) as pool:
+            # the pool has the state of a client, which the methods inherited from `Client` use
+            with pychasing.Client("token-c", api_url=server.url) as client:
+                assert all(hasattr(pool, name) for name in vars(client))
+            with pool.priority(pychasing.Priority.interactive):
+                assert pool.get_replay(replay_id).status_code == 200
+            assert len(list(pool.iter_replays(count=7))) == 20
+            # uploads are made with the first token, and edits with the token that owns them
+            with open("tests/test_replay.replay", "rb") as replay_file:
+                res0 = pool.upload_replay(replay_file, pychasing.Visibility.private)
+            assert res0.status_code == 201
+            assert pool.patch_replay(res0.json()["id"], title="patched").status_code == 204
+            usage = pool.usage()
+    assert usage["token-a"][enums.Operation.upload_replay] == 1
+    assert usage["token-a"][enums.Operation.patch_replay] == 1
+    assert enums.Operation.upload_replay not in usage["token-b"]
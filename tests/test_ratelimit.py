@@ -0,0 +1,140 @@
+import sys
+import time
+import threading
+import rlim
+import pytest
+sys.path.append(".")
+from src import pychasing
+from src.pychasing import ratelimit
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_adaptive_feedback() -> None:
+    limiter = ratelimit.AdaptiveRateLimiter(rlim.Rate(100), decrease=0.5, increase=0.1)
+    assert limiter.scale == 1.0 and limiter.peek() == 0
+    # a rejected call halves the effective rate and holds every caller for `Retry-After`
+    limiter.feedback(429, {"Retry-After": "0.3"})
+    assert limiter.scale == 0.5
+    assert 0.2 < limiter.peek() <= 0.3
+    start = time.perf_counter()
+    with limiter:
+        pass
+    assert time.perf_counter() - start >= 0.25
+    # successful calls add the rate back, up to the full rate
+    limiter.feedback(200, {})
+    assert limiter.scale == pytest.approx(0.6)
+    for _ in range(10):
+        limiter.feedback(200, {})
+    assert limiter.scale == 1.0
+    # an exhausted quota holds callers until it resets, without lowering the rate
+    limiter.feedback(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.2"})
+    assert limiter.scale == 1.0 and 0.1 < limiter.peek() <= 0.2
+    # the rate never drops below `minimum`
+    for _ in range(10):
+        limiter.feedback(503, {"Retry-After": "0"})
+    assert limiter.scale == 0.05
+
+
+def test_adaptive_client() -> None:
+    operation = pychasing.enums.Operation.get_replay
+    # the server allows half of the tier's 8 calls per second, and asks for a one second wait
+    # once a call is rejected
+    for adaptive in (True, False):
+        with MockServer(replays=10, groups=4, rate=4) as server:
+            replay_id = next(iter(server.data.replays))
+            with pychasing.Client(TOKEN, api_url=server.url, adaptive_rate_limit=adaptive,
+                                  patreon_tier=pychasing.PatreonTier.champion) as client:
+                times = []
+                statuses = []
+                start = time.perf_counter()
+                for _ in range(6):
+                    statuses.append(client.get_replay(replay_id, print_error=False).status_code)
+                    times.append(time.perf_counter() - start)
+                limiter = client._rate_limiters[operation]
+        if adaptive:
+            # the call after the rejected one waits out `Retry-After` and goes through
+            assert statuses == [200, 200, 200, 200, 429, 200]
+            assert times[5] - times[4] >= 0.9
+            assert limiter.scale == pytest.approx(0.55)
+        else:
+            assert statuses == [200, 200, 200, 200, 429, 429]
+
+
+def test_rate_limit_state(tmp_path) -> None:
+    state = tmp_path / "rate_limits.json"
+    operation = pychasing.enums.Operation.get_replay
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        with pychasing.Client(TOKEN, api_url=server.url, rate_limit_state=state) as client:
+            client.get_replay(replay_id)
+            client.get_replay(replay_id)
+        assert state.exists()
+        # a restarted client with the same token resumes with the remaining quota
+        with pychasing.Client(TOKEN, api_url=server.url, rate_limit_state=state) as client:
+            assert client._rate_limiters[operation].remaining() == 998
+            assert client._rate_limiters[operation].peek() > 0
+        with pychasing.Client("other-token", api_url=server.url,
+                              rate_limit_state=state) as client:
+            assert client._rate_limiters[operation].remaining() == 1000
+            assert client._rate_limiters[operation].peek() == 0
+
+
+@pytest.mark.parametrize("wal", [False, True])
+def test_sqlite_rate_limit_backend(wal, tmp_path) -> None:
+    path = tmp_path / "rate_limits.db"
+    # each client has its own connection to the database, like separate processes would
+    backends = [pychasing.SQLiteRateLimitBackend(path, wal=wal) for _ in range(2)]
+    mode = backends[0]._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == ("wal" if wal else "delete")
+    # the server allows a little more than the tier's 16 calls per second, so that request
+    # timing jitter alone does not get calls rejected
+    with MockServer(replays=10, groups=4, rate=20) as server:
+        replay_id = next(iter(server.data.replays))
+        clients = [pychasing.Client(TOKEN, api_url=server.url, rate_limit_backend=backend,
+                                    patreon_tier=pychasing.PatreonTier.grand_champion)
+                   for backend in backends]
+        threads = [threading.Thread(target=lambda client=client: [
+            client.get_replay(replay_id) for _ in range(12)]) for client in clients]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # together the clients stay within the tier's 16 calls per second
+        assert time.perf_counter() - start > 23 / 16 - 0.05
+        assert server.counts() == {("replay", 200): 24}
+        for client in clients:
+            client.close()
+    for backend in backends:
+        backend.close()
+
+
+def test_priority_scheduler_backend() -> None:
+    backend = pychasing.MemoryRateLimitBackend()
+    other = ratelimit.RateLimiter(rlim.Rate(20), backend=backend, key="shared")
+    rate_limiter = ratelimit.RateLimiter(rlim.Rate(20), backend=backend, key="shared")
+    for _ in range(3):
+        other.reserve()
+    # the slots reserved by the other rate limiter are seen through the backend
+    assert 0.1 < rate_limiter.peek() <= 0.15
+    scheduler = ratelimit.PriorityScheduler(rate_limiter)
+    order = []
+
+    def call(priority: pychasing.Priority) -> None:
+        scheduler.acquire(priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=call, args=(pychasing.Priority.bulk,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.01)
+    threads.append(threading.Thread(target=call, args=(pychasing.Priority.interactive,)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+    # the interactive call, queued last, is let through ahead of the queued bulk calls
+    assert order[0] is pychasing.Priority.interactive
+    assert order[1:] == [pychasing.Priority.bulk] * 4
@@ -0,0 +1,40 @@
+import sys
+import time
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_backoff() -> None:
+    policy = pychasing.RetryPolicy(backoff_factor=0.5, backoff_max=3, jitter=False)
+    assert [policy.backoff(retry) for retry in range(4)] == [0.5, 1, 2, 3]
+    # the server's `Retry-After` takes precedence
+    assert policy.backoff(0, retry_after=2) == 2
+    policy = pychasing.RetryPolicy(backoff_factor=0.5, backoff_max=3)
+    assert all(0 <= policy.backoff(retry) <= min(3, 0.5 * 2 ** retry) for retry in range(8))
+
+
+def test_retry() -> None:
+    events = []
+    with MockServer(replays=10, groups=4, rate=1) as server:
+        replay_id = next(iter(server.data.replays))
+        group_id = next(iter(server.data.groups))
+        with pychasing.Client(TOKEN, False, api_url=server.url, hooks=[events.append],
+                              retry=pychasing.RetryPolicy(backoff_factor=0.01)) as client:
+            res0 = client.get_replay(replay_id)
+            start = time.perf_counter()
+            res1 = client.get_replay(replay_id, print_error=False)
+            # the rejected call is retried once the server's `Retry-After` (1 s) is over
+            assert time.perf_counter() - start >= 0.9
+            assert res0.status_code == res1.status_code == 200
+            # PATCH is not retried by default
+            res2 = client.patch_group(group_id, shared=True, print_error=False)
+            res3 = client.patch_group(group_id, shared=True, print_error=False)
+            assert res2.status_code == 204 and res3.status_code == 429
+    assert [(event.status_code, event.attempt) for event in events] == [
+        (200, 1), (429, 1), (200, 2), (204, 1), (429, 1)]
+    assert server.counts() == {("replay", 200): 2, ("replay", 429): 1, ("group", 204): 1,
+                               ("group", 429): 1}
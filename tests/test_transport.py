@@ -0,0 +1,55 @@
+import sys
+import io
+import pytest
+sys.path.append(".")
+from src import pychasing
+from benchmarks.mock_server import MockServer
+
+
+TOKEN = "offline-token"
+
+
+def test_cassette_download(tmp_path) -> None:
+    cassette = tmp_path / "cassette.jsonl.gz"
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        expected = server.replay_file(replay_id)
+        with pychasing.Client(TOKEN, False, api_url=server.url) as client:
+            res0 = client.download_replay_to(replay_id, tmp_path / "plain.replay")
+            assert res0.status_code == 200
+        with pychasing.Client(TOKEN, False, api_url=server.url,
+                              transport=pychasing.RecordingTransport(cassette)) as client:
+            # the recorded body is streamed through the download buffer like any other
+            res1 = client.download_replay_to(replay_id, tmp_path / "recorded.replay",
+                                             buffer_size=4096)
+            assert res1.status_code == 200
+            maps = client.maps().json()
+        assert server.counts() == {("replay_file", 200): 2, ("maps", 200): 1}
+
+    transport = pychasing.PlaybackTransport(cassette, loop=False)
+    with pychasing.Client(TOKEN, False, api_url=server.url, transport=transport) as client:
+        res2 = client.download_replay_to(replay_id, tmp_path / "played.replay")
+        assert res2.status_code == 200
+        assert client.maps().json() == maps
+        assert transport.unplayed() == []
+        # without `loop`, a request is only served as often as it was recorded
+        with pytest.raises(LookupError):
+            client.maps()
+    for name in ("plain.replay", "recorded.replay", "played.replay"):
+        assert (tmp_path / name).read_bytes() == expected
+
+
+def test_playback_file_object(tmp_path) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    with MockServer(replays=10, groups=4) as server:
+        replay_id = next(iter(server.data.replays))
+        expected = server.replay_file(replay_id)
+        with pychasing.Client(TOKEN, False, api_url=server.url,
+                              transport=pychasing.RecordingTransport(cassette)) as client:
+            client.download_replay_to(replay_id, io.BytesIO())
+    file = io.BytesIO()
+    with pychasing.Client(TOKEN, False, api_url=server.url,
+                          transport=pychasing.PlaybackTransport(cassette)) as client:
+        res0 = client.download_replay_to(replay_id, file, buffer_size=1000)
+        assert res0.status_code == 200
+    assert file.getvalue() == expected